@@ -0,0 +1,425 @@
+import gzip
+import hashlib
+from datetime import date, datetime
+
+from flask import Blueprint, Response, request, g, jsonify, abort, current_app, stream_with_context
+from common.auth import current_user
+from common.utils import get_db_connection, get_pool, get_backend
+from common.user_data import FORMATS, KINDS, IMPORT_STATEMENTS, pooled_export, export_filename, read_records, import_records
+from diary.summary import invalidate_month_summary
+from common.pagination import keyset_clause, finalize_page, decode_cursor, clamp_page_size
+from common.calendar_service import month_range, is_valid_month
+from common.view_counts import popular_posts
+from common.todo_summary import todo_summary
+
+# 'api_bp'라는 이름의 블루프린트 인스턴스 생성 (app.py에서 /api/v1 로 등록)
+api_bp = Blueprint('api', __name__)
+
+# 리소스별로 ?fields= 로 선택 가능한 필드와 SQL 컬럼 매핑.
+# 본문(content)은 요청한 경우에만 읽습니다.
+POST_FIELDS = {
+    'id': 'b.id',
+    'title': 'b.title',
+    'content': 'b.content',
+    'excerpt': 'SUBSTR(b.content, 1, 200)',
+    'user_id': 'b.user_id',
+    'username': 'u.username',
+    'created_at': 'b.created_at',
+    'updated_at': 'b.updated_at',
+    'comment_count': 'b.comment_count',
+    'views': 'b.views',
+}
+POST_DEFAULT_FIELDS = ('id', 'title', 'excerpt', 'username', 'created_at', 'updated_at')
+
+COMMENT_FIELDS = {
+    'id': 'c.id',
+    'board_id': 'c.board_id',
+    'content': 'c.content',
+    'user_id': 'c.user_id',
+    'username': 'u.username',
+    'created_at': 'c.created_at',
+}
+COMMENT_DEFAULT_FIELDS = tuple(COMMENT_FIELDS)
+
+TODO_FIELDS = {
+    'id': 'id',
+    'task': 'task',
+    'due_date': 'due_date',
+    'status': 'status',
+    'created_at': 'created_at',
+}
+TODO_DEFAULT_FIELDS = tuple(TODO_FIELDS)
+
+DIARY_FIELDS = {
+    'id': 'id',
+    'entry_date': 'entry_date',
+    'title': 'title',
+    'content': 'content',
+}
+DIARY_DEFAULT_FIELDS = ('id', 'entry_date', 'title')
+
+
+# --- 공통 헬퍼 ---
+
+@api_bp.before_request
+def require_login():
+    """모든 API는 로그인 세션이 필요합니다. HTML 라우트와 달리 리디렉션 대신 401을 반환합니다."""
+    if current_user() is None:
+        return jsonify(error='login required'), 401
+
+
+@api_bp.errorhandler(400)
+@api_bp.errorhandler(404)
+def json_error(e):
+    return jsonify(error=e.description), e.code
+
+
+@api_bp.errorhandler(500)
+def json_server_error(e):
+    """처리되지 않은 예외(DB 오류, 연결 풀 대기 시간 초과 등)도 HTML 오류 페이지 대신 JSON으로 반환합니다.
+    예외 내용은 Flask가 이미 로그에 남기므로 응답에는 넣지 않습니다."""
+    return jsonify(error='internal server error'), 500
+
+
+def _serialize(row):
+    """datetime/date를 ISO 8601 문자열로 바꿉니다. (Flask 기본 JSON은 RFC 822 형식)"""
+    return {k: v.isoformat() if isinstance(v, (datetime, date)) else v for k, v in row.items()}
+
+
+def _selected_fields(allowed, default, required=()):
+    """?fields=a,b 를 해석해 요청된 필드 목록을 반환합니다. 알 수 없는 필드는 400."""
+    raw = request.args.get('fields')
+    if not raw:
+        fields = list(default)
+    else:
+        fields = [f.strip() for f in raw.split(',') if f.strip()]
+        unknown = [f for f in fields if f not in allowed]
+        if unknown:
+            abort(400, description=f"unknown fields: {', '.join(unknown)}")
+    # 커서 계산 등에 필요한 필드는 항상 포함합니다.
+    for f in required:
+        if f not in fields:
+            fields.append(f)
+    return fields
+
+
+def _columns(mapping, fields):
+    return ', '.join(f"{mapping[f]} AS {f}" for f in fields)
+
+
+def _page_args():
+    """(page_size, page_cursor, direction)을 쿼리 파라미터에서 읽습니다."""
+    page_size = clamp_page_size(request.args.get('size'),
+                                current_app.config.get('API_PAGE_SIZE', 20),
+                                current_app.config.get('API_MAX_PAGE_SIZE', 100))
+    direction = 'prev' if request.args.get('after') else 'next'
+    page_cursor = decode_cursor(request.args.get('after') or request.args.get('before'))
+    return page_size, page_cursor, direction
+
+
+def _make_etag(*parts):
+    return hashlib.sha1('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+
+
+def _is_not_modified(etag, last_modified):
+    """If-None-Match가 있으면 그것만, 없으면 If-Modified-Since로 판단합니다."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        # HTTP 날짜는 초 단위이므로 마이크로초를 버리고 비교합니다.
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def _finish(payload_or_none, etag, last_modified=None):
+    """검증자 헤더를 붙인 200 응답 또는 본문 없는 304 응답을 만듭니다."""
+    if payload_or_none is None:
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(payload_or_none)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = current_app.config.get('API_CACHE_CONTROL', 'private, no-cache')
+    return response
+
+
+def _body_etag_response(payload):
+    """갱신 시각 컬럼이 없는 리소스는 응답 본문 해시를 ETag로 사용합니다."""
+    response = jsonify(payload)
+    response.headers['Cache-Control'] = current_app.config.get('API_CACHE_CONTROL', 'private, no-cache')
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def _fetch_by_ids(cursor, sql_prefix, ids, order_ids):
+    """id 목록으로 본문을 읽고 order_ids 순서대로 정렬해 반환합니다."""
+    if not ids:
+        return []
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"{sql_prefix} IN ({placeholders})", ids)
+    by_id = {row['id']: row for row in cursor.fetchall()}
+    return [by_id[i] for i in order_ids if i in by_id]
+
+
+# --- 게시글 ---
+
+@api_bp.route('/posts') # 실제 경로는 /api/v1/posts
+def list_posts():
+    """게시글 목록. 먼저 (id, 시각)만 읽어 ETag를 비교하고, 바뀐 경우에만 본문 컬럼을 읽습니다."""
+    fields = _selected_fields(POST_FIELDS, POST_DEFAULT_FIELDS, required=('id',))
+    page_size, page_cursor, direction = _page_args()
+
+    conn = get_db_connection()
+    with conn.cursor() as cursor:
+        keyset_sql, params, order_sql = keyset_clause('created_at', 'id', page_cursor, direction)
+        sql = "SELECT id, created_at, updated_at, comment_count, views FROM board"
+        if keyset_sql:
+            sql += " WHERE " + keyset_sql
+        cursor.execute(f"{sql} {order_sql} LIMIT %s", params + [page_size + 1])
+        keys, prev_cursor, next_cursor = finalize_page(cursor.fetchall(), page_size, page_cursor, direction)
+
+        with_views = 'views' in fields
+        etag = _make_etag('posts', ','.join(fields),
+                          *(f"{k['id']}:{k['updated_at']}:{k['comment_count']}" + (f":{k['views']}" if with_views else '')
+                            for k in keys))
+        # 조회수 반영은 updated_at을 바꾸지 않으므로 views를 요청하면 Last-Modified 없이 ETag로만 검증합니다.
+        last_modified = None if with_views else max((k['updated_at'] for k in keys), default=None)
+        if _is_not_modified(etag, last_modified):
+            return _finish(None, etag, last_modified)
+
+        ids = [k['id'] for k in keys]
+        rows = _fetch_by_ids(cursor,
+                             f"SELECT {_columns(POST_FIELDS, fields)} FROM board b JOIN users u ON b.user_id = u.id WHERE b.id",
+                             ids, ids)
+
+    return _finish({
+        'items': [_serialize(r) for r in rows],
+        'prev_cursor': prev_cursor,
+        'next_cursor': next_cursor,
+    }, etag, last_modified)
+
+
+@api_bp.route('/posts/popular') # 실제 경로는 /api/v1/posts/popular?limit=
+def list_popular_posts():
+    """조회수 상위 게시글. 주기적으로 반영된 조회수 기준이며 POPULAR_POSTS_TTL 동안 캐시됩니다."""
+    limit = request.args.get('limit', type=int) or current_app.config.get('POPULAR_POSTS_LIMIT', 10)
+    if not 1 <= limit <= 100:
+        abort(400, description='limit must be between 1 and 100')
+    return _body_etag_response({'items': [_serialize(r) for r in popular_posts(limit)]})
+
+
+@api_bp.route('/posts/<int:post_id>') # 실제 경로는 /api/v1/posts/<id>
+def get_post(post_id):
+    """단일 게시글. updated_at으로 ETag/Last-Modified를 만들고 일치하면 본문을 읽지 않습니다."""
+    fields = _selected_fields(POST_FIELDS, tuple(f for f in POST_FIELDS if f != 'excerpt'))
+
+    conn = get_db_connection()
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT id, updated_at, comment_count, views FROM board WHERE id = %s", (post_id,))
+        key = cursor.fetchone()
+        if not key:
+            abort(404, description='post not found')
+
+        # 댓글 수와 조회수는 updated_at을 바꾸지 않으므로 ETag에 함께 넣습니다.
+        # views를 요청하면 Last-Modified(updated_at)로는 바뀐 것을 알 수 없으므로 ETag로만 검증합니다.
+        with_views = 'views' in fields
+        etag = _make_etag('post', post_id, key['updated_at'], key['comment_count'],
+                          key['views'] if with_views else '', ','.join(fields))
+        last_modified = None if with_views else key['updated_at']
+        if _is_not_modified(etag, last_modified):
+            return _finish(None, etag, last_modified)
+
+        cursor.execute(f"SELECT {_columns(POST_FIELDS, fields)} FROM board b JOIN users u ON b.user_id = u.id "
+                       "WHERE b.id = %s", (post_id,))
+        post = cursor.fetchone()
+    if not post:
+        abort(404, description='post not found')
+    return _finish(_serialize(post), etag, last_modified)
+
+
+@api_bp.route('/posts/<int:post_id>/comments') # 실제 경로는 /api/v1/posts/<id>/comments
+def list_comments(post_id):
+    """게시글의 댓글을 오래된 순으로 페이지 단위 반환합니다. 댓글은 수정되지 않으므로 (id, created_at)이 버전입니다."""
+    fields = _selected_fields(COMMENT_FIELDS, COMMENT_DEFAULT_FIELDS, required=('id',))
+    page_size, page_cursor, direction = _page_args()
+
+    conn = get_db_connection()
+    with conn.cursor() as cursor:
+        keyset_sql, params, order_sql = keyset_clause('created_at', 'id', page_cursor, direction, descending=False)
+        sql = "SELECT id, created_at FROM comments WHERE board_id = %s"
+        if keyset_sql:
+            sql += " AND " + keyset_sql
+        cursor.execute(f"{sql} {order_sql} LIMIT %s", [post_id] + params + [page_size + 1])
+        keys, prev_cursor, next_cursor = finalize_page(cursor.fetchall(), page_size, page_cursor, direction)
+        if not keys:
+            # 댓글이 없으면 게시글이 있는지 PK로 확인합니다. (없는 글은 get_post와 같은 404)
+            cursor.execute("SELECT 1 FROM board WHERE id = %s", (post_id,))
+            if cursor.fetchone() is None:
+                abort(404, description='post not found')
+
+        etag = _make_etag('comments', post_id, ','.join(fields), *(f"{k['id']}:{k['created_at']}" for k in keys))
+        last_modified = max((k['created_at'] for k in keys), default=None)
+        if _is_not_modified(etag, last_modified):
+            return _finish(None, etag, last_modified)
+
+        ids = [k['id'] for k in keys]
+        rows = _fetch_by_ids(cursor,
+                             f"SELECT {_columns(COMMENT_FIELDS, fields)} FROM comments c JOIN users u ON c.user_id = u.id WHERE c.id",
+                             ids, ids)
+
+    return _finish({
+        'items': [_serialize(r) for r in rows],
+        'prev_cursor': prev_cursor,
+        'next_cursor': next_cursor,
+    }, etag, last_modified)
+
+
+# --- To-Do ---
+
+@api_bp.route('/todos') # 실제 경로는 /api/v1/todos
+def list_todos():
+    """로그인한 사용자의 To-Do 목록 (최신 순, ?status= 필터)."""
+    fields = _selected_fields(TODO_FIELDS, TODO_DEFAULT_FIELDS, required=('id', 'created_at'))
+    page_size, page_cursor, direction = _page_args()
+    status = request.args.get('status')
+
+    conn = get_db_connection()
+    with conn.cursor() as cursor:
+        sql = f"SELECT {_columns(TODO_FIELDS, fields)} FROM todos WHERE user_id = %s"
+        params = [g.user['id']]
+        if status:
+            sql += " AND status = %s"
+            params.append(status)
+        keyset_sql, keyset_params, order_sql = keyset_clause('created_at', 'id', page_cursor, direction)
+        if keyset_sql:
+            sql += " AND " + keyset_sql
+            params.extend(keyset_params)
+        cursor.execute(f"{sql} {order_sql} LIMIT %s", params + [page_size + 1])
+        rows, prev_cursor, next_cursor = finalize_page(cursor.fetchall(), page_size, page_cursor, direction)
+
+    return _body_etag_response({
+        'items': [_serialize(r) for r in rows],
+        'prev_cursor': prev_cursor,
+        'next_cursor': next_cursor,
+    })
+
+
+@api_bp.route('/todos/summary') # 실제 경로는 /api/v1/todos/summary
+def get_todo_summary():
+    """로그인한 사용자의 상태별 To-Do 개수와 마감 지남/오늘 마감 개수."""
+    conn = get_db_connection()
+    with conn.cursor() as cursor:
+        summary = todo_summary(cursor, g.user['id'])
+    return _body_etag_response(summary)
+
+
+# --- 일기 ---
+
+@api_bp.route('/diaries') # 실제 경로는 /api/v1/diaries?year=&month=
+def list_diaries():
+    """로그인한 사용자의 월별 일기 목록. 기본은 이번 달입니다."""
+    fields = _selected_fields(DIARY_FIELDS, DIARY_DEFAULT_FIELDS)
+    today = date.today()
+    year = request.args.get('year', today.year, type=int)
+    month = request.args.get('month', today.month, type=int)
+    if not is_valid_month(year, month):
+        abort(400, description='invalid year or month')
+
+    start, end = month_range(year, month)
+    conn = get_db_connection()
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT {_columns(DIARY_FIELDS, fields)} FROM diaries "
+                       "WHERE user_id = %s AND entry_date >= %s AND entry_date < %s ORDER BY entry_date",
+                       (g.user['id'], start, end))
+        rows = cursor.fetchall()
+
+    return _body_etag_response({'year': year, 'month': month, 'items': [_serialize(r) for r in rows]})
+
+
+@api_bp.route('/diaries/<string:date_str>') # 실제 경로는 /api/v1/diaries/YYYY-MM-DD
+def get_diary(date_str):
+    """특정 날짜의 일기."""
+    fields = _selected_fields(DIARY_FIELDS, tuple(DIARY_FIELDS))
+    try:
+        entry_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+    except ValueError:
+        abort(400, description='invalid date')
+
+    conn = get_db_connection()
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT {_columns(DIARY_FIELDS, fields)} FROM diaries WHERE user_id = %s AND entry_date = %s",
+                       (g.user['id'], entry_date))
+        diary = cursor.fetchone()
+    if not diary:
+        abort(404, description='diary not found')
+    return _body_etag_response(_serialize(diary))
+
+
+# --- 내보내기/가져오기 (common/user_data.py) ---
+
+@api_bp.route('/export') # 실제 경로는 /api/v1/export?format=jsonl|csv&kind=todos,diaries&compress=gzip
+def export_data():
+    """
+    로그인한 사용자의 일기/할 일/게시글/댓글을 CSV 또는 JSONL로 스트리밍합니다.
+    결과 전체를 메모리에 올리지 않고 서버 측 커서에서 읽는 대로 보냅니다. CSV는 kind를 하나만 지정합니다.
+    """
+    fmt = request.args.get('format', 'jsonl')
+    kinds = [k for k in request.args.get('kind', '').split(',') if k] or list(KINDS)
+    compress = request.args.get('compress') or None
+    if fmt not in FORMATS:
+        abort(400, description=f"format must be one of {', '.join(FORMATS)}")
+    if any(k not in KINDS for k in kinds):
+        abort(400, description=f"kind must be one of {', '.join(KINDS)}")
+    if fmt == 'csv' and len(kinds) != 1:
+        abort(400, description='csv export needs exactly one kind')
+    if compress not in (None, 'gzip'):
+        abort(400, description='compress must be gzip')
+
+    chunks = pooled_export(get_pool(), get_backend(), g.user['id'], kinds, fmt, compress=compress,
+                           batch_size=current_app.config.get('EXPORT_BATCH_SIZE', 500),
+                           chunk_size=current_app.config.get('EXPORT_CHUNK_SIZE', 65536))
+    if compress:
+        mimetype = 'application/gzip'
+    else:
+        mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    # stream_with_context: 쿼리 계측/프로파일러가 쓰는 요청 컨텍스트를 응답을 다 보낼 때까지 유지합니다.
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{export_filename(kinds, fmt, compress)}"'
+    response.headers['Cache-Control'] = 'private, no-store'
+    return response
+
+
+@api_bp.route('/import', methods=['POST']) # 실제 경로는 /api/v1/import (multipart: file, [format], [kind])
+def import_data():
+    """
+    내보내기 파일(.csv/.jsonl, .gz 가능)을 로그인한 사용자의 데이터로 가져옵니다.
+    파일을 한 줄씩 읽어 IMPORT_BATCH_SIZE개씩 INSERT/커밋하므로, 중간에 실패하면 앞선 배치는 남습니다.
+    """
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        abort(400, description='file is required')
+    name = upload.filename.lower()
+    compressed = name.endswith('.gz')
+    fmt = request.form.get('format') or ('jsonl' if name.removesuffix('.gz').endswith(('.jsonl', '.ndjson')) else 'csv')
+    kind = request.form.get('kind')
+    if fmt not in FORMATS:
+        abort(400, description=f"format must be one of {', '.join(FORMATS)}")
+    if fmt == 'csv' and kind not in IMPORT_STATEMENTS:
+        abort(400, description=f"csv import needs kind ({', '.join(IMPORT_STATEMENTS)})")
+
+    user_id = g.user['id']
+    conn = get_db_connection(primary=True)
+    diary_months = set()
+    try:
+        counts = import_records(conn, user_id, read_records(upload.stream, fmt, kind, compressed=compressed),
+                                batch_size=current_app.config.get('IMPORT_BATCH_SIZE', 500), diary_months=diary_months)
+    except (UnicodeDecodeError, gzip.BadGzipFile, EOFError) as e:
+        conn.rollback()
+        abort(400, description=f"unreadable file: {e}")
+    finally:
+        # 실패해도 앞서 커밋된 배치의 일기 월 요약은 비웁니다.
+        for year, month in diary_months:
+            invalidate_month_summary(user_id, date(year, month, 1))
+    return jsonify(counts)
+
@@ -1,35 +1,200 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import os
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+import logging
+import threading
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, Response
 # config.py에서 설정 클래스 임포트
-from config import Config
+from config import Config, validate_config
+from common.utils import init_db_pool, get_pool_stats
+from common.async_db import init_async_db
+from common.migrations import register_cli
+from common.user_import import register_user_cli
+from common.user_data import register_data_cli
+from common.templating import init_templates
+from common.compression import init_compression
+from common.cache import init_cache, get_cache
+from common.view_counts import init_view_counter, get_view_counter
+from common.log import setup_logging
+from common.instrumentation import init_instrumentation, render_prometheus, monitoring_required
+from common.profiler import init_query_profiler
+from common.sessions import init_sessions
+from common.auth import init_auth
+from common.passwords import init_passwords, get_hasher
+from common.ratelimit import init_rate_limits, get_login_throttle
+from common.startup import StartupReport, LazyBlueprints, init_startup_report, get_startup_report, preload_app
 
-# 모든 블루프린트 임포트
-from auth.routes import auth_bp
-from board.routes import board_bp
-from diary.routes import diary_bp
-from todos.routes import todos_bp
+logger = logging.getLogger(__name__)
 
-# Flask 애플리케이션 인스턴스 생성
-app = Flask(__name__)
+# 앱 팩토리: create_app()이 설정을 한 번 읽고 검증한 뒤 확장 초기화, 블루프린트 등록, (선택) 예열을 합니다.
+# 각 단계와 블루프린트 모듈의 import 시간은 StartupReport에 기록되고 /health/startup에서 볼 수 있습니다.
+# wsgi.py/asgi.py는 create_app(preload=True)로 트래픽을 받기 전에 DB 연결과 템플릿을 준비합니다.
+# 기존의 'from app import app'(flask CLI, 운영 스크립트)은 모듈 __getattr__로 처음 접근할 때 앱을 만듭니다.
 
-# config.py에서 정의한 설정 적용
-app.config.from_object(Config)
 
-# FLASK_SECRET_KEY는 app.config['SECRET_KEY']로 접근
-print(f"DEBUG: Flask secret key loaded from app.config: {'exists' if app.secret_key else 'NOT FOUND'}")
+# --- 블루프린트 ---
+# (모듈, 속성, url_prefix). url_prefix는 해당 블루프린트 안의 모든 라우트 앞에 자동으로 붙을 경로를 의미합니다.
+BLUEPRINTS = (
+    ('auth.routes', 'auth_bp', None), # 인증 블루프린트는 기본 경로('/')를 사용
+    ('board.routes', 'board_bp', '/board'), # 게시판 블루프린트는 /board로 시작
+    ('diary.routes', 'diary_bp', '/diary'), # 일기장 블루프린트는 /diary로 시작
+    ('todos.routes', 'todos_bp', '/todos'), # To-Do List 블루프린트는 /todos로 시작
+    ('api.routes', 'api_bp', '/api/v1'), # JSON API 블루프린트는 /api/v1로 시작
+)
 
 
-# --- 블루프린트 등록 ---
-# 각 블루프린트를 메인 앱에 등록합니다.
-# url_prefix는 해당 블루프린트 안의 모든 라우트 앞에 자동으로 붙을 경로를 의미합니다.
-app.register_blueprint(auth_bp) # 인증 블루프린트는 기본 경로('/')를 사용
-app.register_blueprint(board_bp, url_prefix='/board') # 게시판 블루프린트는 /board로 시작
-app.register_blueprint(diary_bp, url_prefix='/diary') # 일기장 블루프린트는 /diary로 시작
-app.register_blueprint(todos_bp, url_prefix='/todos') # To-Do List 블루프린트는 /todos로 시작
+def register_blueprints(app):
+    """블루프린트 모듈을 import해 메인 앱에 등록합니다. (LAZY_BLUEPRINTS면 첫 요청 직전에 호출)"""
+    report = get_startup_report(app)
+    with report.phase('blueprints'):
+        for module_name, attr, url_prefix in BLUEPRINTS:
+            blueprint = getattr(report.import_module(module_name), attr)
+            app.register_blueprint(blueprint, url_prefix=url_prefix)
 
 
-# --- 개발용 블록 (Apache/mod_wsgi로 배포 시에는 사용되지 않습니다.) ---
-if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0')
+# --- 확장 초기화 (순서대로 실행) ---
+INIT_STEPS = (
+    # 모든 모듈의 logging 출력을 버퍼링해 stderr(Apache error log)로 보냅니다.
+    ('logging', setup_logging),
+    # DB 연결 풀: 요청마다 연결을 하나 빌려주고 요청 종료 시 반납합니다.
+    ('db_pool', init_db_pool),
+    # async def 뷰는 쿼리를 전용 스레드 풀에서 실행해 독립적인 쿼리를 동시에 보냅니다. (DB_ASYNC_WORKERS)
+    ('async_db', init_async_db),
+    # 게시글/댓글 조각, 일기 월 요약 등에 쓰는 공용 캐시 (CACHE_BACKEND 설정)
+    ('cache', init_cache),
+    # 게시글 조회수는 메모리에 모았다가 VIEW_FLUSH_INTERVAL마다 여러 행을 한 번에 반영합니다. (VIEW_* 설정)
+    ('view_counter', init_view_counter),
+    # 요청 시간, SQL 수/시간, 연결 대기, 템플릿 렌더링 시간 계측 (Server-Timing 헤더, /metrics)
+    ('instrumentation', init_instrumentation),
+    # QUERY_PROFILER가 켜져 있으면 SQL 지문별 집계, N+1/시간 예산 경고, 슬로 쿼리 리포트를 남깁니다.
+    ('query_profiler', init_query_profiler),
+    # 공통 레이아웃 템플릿의 바이트코드 캐시와 버전이 붙은 정적 파일 주소(asset_url), 정적 파일 장기 캐시 헤더
+    ('templates', init_templates),
+    # HTML/JSON/CSS/JS 응답을 gzip(brotli 설치 시 br)으로 압축하는 WSGI 미들웨어 (COMPRESSION_* 설정)
+    # 'flask assets build'로 미리 압축해 둔 static/dist 파일은 .br/.gz를 그대로 보냅니다.
+    ('compression', init_compression),
+    # 서버 측 세션(쿠키에는 세션 id만)과 요청당 한 번만 조회하는 사용자 캐시. 'flask session revoke | purge' 명령도 등록합니다.
+    ('sessions', init_sessions),
+    ('auth', init_auth),
+    # 비밀번호 해시는 제한된 작업자 풀에서 계산하고(PASSWORD_HASH_*), 로그인/가입 시도는 사용자 이름/IP별로 제한합니다(LOGIN_LIMIT_*).
+    ('passwords', init_passwords),
+    ('rate_limits', init_rate_limits),
+    # 'flask db upgrade | status | check-indexes | slow-queries' 명령 등록 (common/migrations.py, common/profiler.py)
+    ('cli.db', register_cli),
+    # 'flask users import' 명령 등록 (common/user_import.py)
+    ('cli.users', register_user_cli),
+    # 'flask data export | import' 명령 등록 (common/user_data.py)
+    ('cli.data', register_data_cli),
+)
+
+
+def create_app(config_object=Config, preload=False):
+    """
+    Flask 애플리케이션을 만듭니다.
+    preload=True면 트래픽을 받기 전에 블루프린트 등록, DB 연결 풀 채우기, 템플릿 컴파일을 끝냅니다. (common/startup.py)
+    """
+    report = StartupReport(import_time=_IMPORT_TIME)
+
+    with report.phase('config'):
+        app = Flask(__name__)
+        # config.py에서 정의한 설정 적용 후 잘못된 값은 여기서 한꺼번에 알립니다.
+        app.config.from_object(config_object)
+        validate_config(app.config)
+    init_startup_report(app, report)
+
+    for name, init in INIT_STEPS:
+        with report.phase(name):
+            init(app)
+    # FLASK_SECRET_KEY는 app.config['SECRET_KEY']로 접근
+    logger.debug("Flask secret key loaded from app.config: %s", 'exists' if app.secret_key else 'NOT FOUND')
+
+    # 블루프린트는 바로 등록하거나(기본), LAZY_BLUEPRINTS면 첫 요청(또는 예열) 때 import/등록합니다.
+    if app.config.get('LAZY_BLUEPRINTS'):
+        lazy = LazyBlueprints(app, register_blueprints)
+        app.extensions['lazy_blueprints'] = lazy
+        app.wsgi_app = lazy
+    else:
+        register_blueprints(app)
+
+    register_monitoring(app)
+
+    if preload:
+        preload_app(app)
+    report.mark_ready()
+    return app
+
+
+# --- 모니터링 ---
+def register_monitoring(app):
+    """헬스 체크/지표 라우트를 등록합니다. MONITORING이 꺼져 있으면 등록하지 않고, 접근은 monitoring_required로 제한합니다."""
+    if not app.config.get('MONITORING', True):
+        return
 
+    @app.route('/health/db-pool')
+    @monitoring_required
+    def db_pool_stats():
+        """DB 연결 풀 통계(in-use, idle, waits, 체크아웃 지연)를 JSON으로 반환합니다."""
+        return jsonify(get_pool_stats())
 
+    @app.route('/health/cache')
+    @monitoring_required
+    def cache_stats():
+        """공용 캐시의 적중/미스 통계를 JSON으로 반환합니다."""
+        return jsonify(get_cache().stats())
+
+    @app.route('/health/login')
+    @monitoring_required
+    def login_stats():
+        """비밀번호 해시 작업자 풀과 로그인 제한기 상태를 JSON으로 반환합니다."""
+        return jsonify(hasher=get_hasher().stats(), throttle=get_login_throttle().stats())
+
+    @app.route('/metrics')
+    @monitoring_required
+    def metrics():
+        """엔드포인트별 요청/SQL 지표와 풀/캐시 상태를 Prometheus 텍스트 형식으로 반환합니다."""
+        pool = get_pool_stats()
+        cache = get_cache().stats()
+        views = get_view_counter()
+        gauges = {
+            'app_db_pool_opened': pool['opened'],
+            'app_db_pool_in_use': pool['in_use'],
+            'app_db_pool_idle': pool['idle'],
+            'app_db_pool_waits': pool['waits'],
+            'app_db_pool_timeouts': pool['timeouts'],
+            'app_cache_hits': cache['hits'],
+            'app_cache_misses': cache['misses'],
+        }
+        if views is not None:
+            gauges['app_view_counter_pending'] = views.stats()['pending_views']
+        return Response(render_prometheus(gauges), mimetype='text/plain; version=0.0.4')
+
+    @app.route('/health/startup')
+    @monitoring_required
+    def startup_report():
+        """이 워커의 시작 시간(import, 초기화 단계별, 예열, 첫 요청)을 JSON으로 반환합니다."""
+        return jsonify(get_startup_report(app).as_dict())
+
+
+_IMPORT_TIME = time.perf_counter() - _IMPORT_STARTED
+
+# 'from app import app' 호환: 처음 접근할 때 기본 설정으로 한 번 만듭니다.
+_app = None
+_app_lock = threading.Lock()
+
+
+def __getattr__(name):
+    global _app
+    if name != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                _app = create_app()
+    return _app
+
+
+# --- 개발용 블록 (Apache/mod_wsgi로 배포 시에는 사용되지 않습니다.) ---
+if __name__ == '__main__':
+    create_app().run(debug=True, host='0.0.0.0')
@@ -0,0 +1,20 @@
+import sys
+import os
+
+# Flask 애플리케이션의 루트 디렉토리
+project_home = '/var/www/html/your_flask_app'
+
+# 프로젝트 홈 디렉토리가 sys.path에 없으면 추가
+if project_home not in sys.path:
+    sys.path.insert(0, project_home) # 리스트의 맨 앞에 추가
+
+# ASGI 서버(uvicorn, hypercorn 등)용 진입점. mod_wsgi는 계속 wsgi.py를 사용합니다.
+#   uvicorn asgi:application --host 127.0.0.1 --port 8000 --workers 4
+# Flask는 WSGI 앱이므로 asgiref의 WsgiToAsgi로 감쌉니다. (pip install "flask[async]" uvicorn)
+# 요청은 어댑터의 스레드 풀에서 처리되고, async def 뷰의 쿼리는 common/async_db.py의
+# DB 스레드 풀에서 동시에 실행됩니다.
+from asgiref.wsgi import WsgiToAsgi
+
+from app import create_app
+
+application = WsgiToAsgi(create_app(preload=True))
@@ -1,11 +1,17 @@
+import logging
 import os
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash
-from werkzeug.security import generate_password_hash, check_password_hash
-from common.utils import get_db_connection # common/utils.py에서 가져옴
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from common.auth import current_user, login_user, logout_user
+from common.passwords import HasherBusyError, get_hasher
+from common.ratelimit import get_login_throttle
+from common.utils import get_db_connection, get_backend # common/utils.py에서 가져옴
+from common.todo_summary import todo_summary
 
 # 'auth_bp'라는 이름의 블루프린트 인스턴스 생성
 # url_prefix는 이 블루프린트 안의 모든 라우트 앞에 자동으로 붙을 경로를 의미합니다.
 # 여기서는 인증 기능이므로 별도 프리픽스 없이 '/'를 기본으로 사용합니다.
+logger = logging.getLogger(__name__)
+
 auth_bp = Blueprint('auth', __name__)
 
 # --- 사용자 인증 관련 라우트 ---
@@ -16,8 +22,16 @@ def index():
     메인 페이지를 렌더링합니다.
     로그인 상태에 따라 다른 UI (인증 폼 또는 링크 메뉴)를 보여줍니다.
     """
-    if 'loggedin' in session:
-        return render_template('main_logged_in.html', username=session['username'])
+    user = current_user()
+    if user is not None:
+        # 대시보드의 할 일 요약 (GROUP BY 쿼리 한 번). 실패해도 메인 페이지는 보여줍니다.
+        summary = None
+        try:
+            with get_db_connection().cursor() as cursor:
+                summary = todo_summary(cursor, user['id'])
+        except Exception:
+            logger.exception("To-Do 요약 불러오기 오류")
+        return render_template('main_logged_in.html', username=user['username'], todo_summary=summary)
     return render_template('default.html')
 
 
@@ -31,23 +45,35 @@ def register():
         flash('사용자 이름과 비밀번호를 비워둘 수 없습니다.', 'error')
         return redirect(url_for('auth.index')) # url_for에 블루프린트 이름 명시
 
-    hashed_password = generate_password_hash(password)
+    # 가입도 해시를 계산하므로 IP별 제한을 함께 적용합니다.
+    if get_login_throttle().check(request.remote_addr):
+        flash('요청이 너무 많습니다. 잠시 후 다시 시도해주세요.', 'error')
+        return redirect(url_for('auth.index')) # url_for에 블루프린트 이름 명시
 
     conn = None
     try:
+        hashed_password = get_hasher().hash(password)
         conn = get_db_connection()
+        # 중복 확인은 users.username의 UNIQUE 인덱스(uq_users_username)에 맡깁니다.
+        # SELECT 후 INSERT하는 방식과 달리 왕복이 한 번이고, 동시에 같은 이름으로 가입해도 하나만 성공합니다.
         with conn.cursor() as cursor:
-            cursor.execute("SELECT id FROM users WHERE username = %s", (username,))
-            if cursor.fetchone():
-                flash('이미 존재하는 사용자 이름입니다. 다른 이름을 선택해주세요.', 'error')
-                return redirect(url_for('auth.index')) # url_for에 블루프린트 이름 명시
-
             sql = "INSERT INTO users (username, password) VALUES (%s, %s)"
             cursor.execute(sql, (username, hashed_password))
         conn.commit()
         flash('회원가입에 성공했습니다! 이제 로그인할 수 있습니다.', 'success')
+    except get_backend().Error as e:
+        if conn:
+            conn.rollback()
+        if get_backend().is_duplicate_key(e):
+            flash('이미 존재하는 사용자 이름입니다. 다른 이름을 선택해주세요.', 'error')
+        else:
+            logger.exception("데이터베이스 오류 (회원가입)")
+            flash('회원가입에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
+    except HasherBusyError:
+        logger.warning("비밀번호 해시 작업자 풀 포화 (회원가입)")
+        flash('요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요.', 'error')
     except Exception as e:
-        print(f"데이터베이스 오류 (회원가입): {e}")
+        logger.exception("데이터베이스 오류 (회원가입)")
         flash('회원가입에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
@@ -59,46 +85,64 @@ def login():
     """사용자 로그인을 처리합니다."""
     username = request.form['username'].strip()
     password = request.form['password'].strip()
-    print(f"DEBUG: 로그인 시도 사용자: {username}")
+    logger.debug("로그인 시도 사용자: %s", username)
 
     if not username or not password:
-        print("DEBUG: 로그인 시도: 사용자 이름 또는 비밀번호가 비어 있습니다.")
+        logger.debug("로그인 시도: 사용자 이름 또는 비밀번호가 비어 있습니다.")
         flash('사용자 이름과 비밀번호를 모두 입력해주세요.', 'error')
         return redirect(url_for('auth.index')) # url_for에 블루프린트 이름 명시
 
+    # 해시 검증 전에 사용자 이름별/IP별 시도 횟수를 확인합니다. (common/ratelimit.py)
+    throttle = get_login_throttle()
+    retry_after = throttle.check(request.remote_addr, username)
+    if retry_after:
+        logger.info("사용자 %s 로그인 제한 (%s)", username, request.remote_addr)
+        flash(f'로그인 시도가 너무 많습니다. {int(retry_after) + 1}초 후에 다시 시도해주세요.', 'error')
+        return redirect(url_for('auth.index')) # url_for에 블루프린트 이름 명시
+
     conn = None
     try:
         conn = get_db_connection()
+        hasher = get_hasher()
         with conn.cursor() as cursor:
             sql = "SELECT id, username, password FROM users WHERE username = %s"
             cursor.execute(sql, (username,))
             user = cursor.fetchone()
 
-            if user and check_password_hash(user['password'], password):
-                session['loggedin'] = True
-                session['id'] = user['id']
-                session['username'] = user['username']
-                print(f"DEBUG: 사용자 {username} 로그인 성공. 대시보드로 리디렉션.")
+            if user and hasher.verify(user['password'], password):
+                # 해시 알고리즘/비용 설정이 바뀌었으면 로그인하는 김에 새 설정으로 다시 저장합니다.
+                # (풀이 바쁘면 이번에는 건너뛰고 다음 로그인에서 다시 시도)
+                if hasher.needs_rehash(user['password']):
+                    try:
+                        cursor.execute("UPDATE users SET password = %s WHERE id = %s",
+                                       (hasher.hash(password), user['id']))
+                        conn.commit()
+                        hasher.count_rehash()
+                    except HasherBusyError:
+                        logger.info("사용자 %s 비밀번호 재해시 보류", username)
+                throttle.succeeded(username)
+                login_user(user)
+                logger.info("사용자 %s 로그인 성공.", username)
                 flash(f'환영합니다, {user["username"]}님!', 'success')
                 return redirect(url_for('auth.dashboard')) # url_for에 블루프린트 이름 명시
             else:
-                print(f"DEBUG: 사용자 {username} 로그인 실패: 잘못된 자격 증명.")
+                logger.info("사용자 %s 로그인 실패: 잘못된 자격 증명.", username)
                 flash('잘못된 사용자 이름 또는 비밀번호입니다. 다시 시도해주세요.', 'error')
+    except HasherBusyError:
+        logger.warning("비밀번호 해시 작업자 풀 포화 (로그인: %s)", username)
+        flash('요청이 많아 로그인을 처리하지 못했습니다. 잠시 후 다시 시도해주세요.', 'error')
     except Exception as e:
-        print(f"DEBUG: 로그인 처리 중 일반 오류: {e}")
+        logger.exception("로그인 처리 중 일반 오류")
         flash('로그인에 실패했습니다. 서버 오류입니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
             conn.close()
-            print("DEBUG: 로그인 라우트에서 DB 연결 닫음.")
     return redirect(url_for('auth.index')) # url_for에 블루프린트 이름 명시
 
 @auth_bp.route('/logout')
 def logout():
     """현재 사용자를 로그아웃합니다."""
-    session.pop('loggedin', None)
-    session.pop('id', None)
-    session.pop('username', None)
+    logout_user()
     flash('성공적으로 로그아웃되었습니다.', 'success')
     return redirect(url_for('auth.index')) # url_for에 블루프린트 이름 명시
 
@@ -108,7 +152,7 @@ def dashboard():
     로그인한 사용자에게는 메인 페이지로 리디렉션하고,
     로그아웃 상태이면 로그인 페이지로 리디렉션합니다.
     """
-    if 'loggedin' in session:
+    if current_user() is not None:
         return redirect(url_for('auth.index')) # url_for에 블루프린트 이름 명시
     flash('이 페이지에 접근하려면 로그인해야 합니다.', 'error')
     return redirect(url_for('auth.index')) # url_for에 블루프린트 이름 명시
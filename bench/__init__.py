@@ -0,0 +1,2 @@
+# 성능 회귀 측정용 벤치마크 도구 (배포 대상 아님)
+# 사용법은 README.md의 '벤치마크' 절을 참고하세요.
@@ -0,0 +1,160 @@
+import json
+import platform
+import sys
+from datetime import datetime
+
+import click
+
+from bench import render, runner, startup
+from bench.seed import SCALES, seed, bench_fixture, clear_bench_data
+from common.migrations import upgrade
+from common.utils import get_pool
+
+
+# 실행 예:
+#   python -m bench seed --scale 100k
+#   python -m bench run --mode wsgi --workers 8 --requests 400 --save-baseline bench_baseline.json
+#   python -m bench run --compare bench_baseline.json
+#   python -m bench render --save-baseline render_baseline.json   (템플릿 렌더링만, DB 불필요)
+#   python -m bench startup --runs 5 --preload --compare startup_baseline.json   (워커 콜드 스타트)
+# DB 접속 정보는 앱과 같은 설정(.env의 DB_*)을 사용하므로, 로컬 MySQL/MariaDB를 가리키도록 지정하세요.
+
+
+def _load_app():
+    from app import create_app
+    return create_app()
+
+
+class _Connection:
+    """요청 컨텍스트 밖에서 풀 연결을 빌려 쓰는 컨텍스트 매니저."""
+
+    def __init__(self, app):
+        self.pool = get_pool(app)
+
+    def __enter__(self):
+        self.conn = self.pool.acquire()
+        return self.conn
+
+    def __exit__(self, *exc_info):
+        self.pool.release(self.conn)
+
+
+@click.group()
+def cli():
+    """게시판/할 일/일기 라우트 성능 측정 도구"""
+
+
+@cli.command('seed')
+@click.option('--scale', type=click.Choice(sorted(SCALES)), default='10k', help='데이터 규모 프리셋')
+@click.option('--users', type=int, default=None)
+@click.option('--posts', type=int, default=None)
+@click.option('--comments-per-post', type=int, default=None)
+@click.option('--todos-per-user', type=int, default=None)
+@click.option('--diaries-per-user', type=int, default=None)
+@click.option('--random-seed', type=int, default=42)
+def seed_command(scale, random_seed, **overrides):
+    """마이그레이션을 적용하고 합성 데이터를 채웁니다."""
+    params = dict(SCALES[scale])
+    params.update({k: v for k, v in overrides.items() if v is not None})
+    app = _load_app()
+    with app.app_context(), _Connection(app) as conn:
+        upgrade(conn, echo=click.echo)
+        click.echo(f"시드 중: {params}")
+        seed(conn, random_seed=random_seed, echo=click.echo, **params)
+
+
+@cli.command('clear')
+def clear_command():
+    """벤치마크 사용자와 그에 딸린 데이터를 지웁니다."""
+    app = _load_app()
+    with app.app_context(), _Connection(app) as conn:
+        click.echo(f"벤치마크 사용자 {clear_bench_data(conn)}명 삭제")
+
+
+@cli.command('run')
+@click.option('--mode', type=click.Choice(['client', 'wsgi']), default='client',
+              help='client: Flask 테스트 클라이언트, wsgi: 로컬 스레드 WSGI 서버로 HTTP 요청')
+@click.option('--workers', type=int, default=4, help='동시 실행 워커 수')
+@click.option('--requests', 'requests_', type=int, default=200, help='시나리오별 요청 수')
+@click.option('--only', multiple=True, help='특정 시나리오만 실행 (여러 번 지정 가능)')
+@click.option('--save-baseline', type=click.Path(dir_okay=False), default=None, help='결과를 기준선 JSON으로 저장')
+@click.option('--compare', 'baseline', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='저장된 기준선과 비교해 회귀가 있으면 종료 코드 1')
+@click.option('--threshold', type=float, default=10.0, help='회귀로 판단할 p95 증가율(%)')
+@click.option('--seed', 'random_seed', type=int, default=1)
+def run_command(mode, workers, requests_, only, save_baseline, baseline, threshold, random_seed):
+    """시나리오별 p50/p95/p99 지연, 처리량, 요청당 쿼리 수를 측정합니다."""
+    app = _load_app()
+    app.config['LOGIN_THROTTLE'] = False # 워커마다 같은 IP에서 로그인하므로 제한을 끕니다.
+    with app.app_context(), _Connection(app) as conn:
+        fixture = bench_fixture(conn)
+    if fixture is None:
+        raise click.ClickException("벤치마크 데이터가 없습니다. 먼저 'python -m bench seed'를 실행하세요.")
+
+    click.echo(f"mode={mode} workers={workers} requests={requests_} users={len(fixture['users'])}")
+    click.echo(runner.HEADER)
+    results = runner.run(app, fixture, mode=mode, workers=workers, requests=requests_,
+                         only=set(only), seed=random_seed, echo=click.echo)
+
+    if save_baseline:
+        runner.save_results(save_baseline, results, {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'mode': mode, 'workers': workers, 'requests': requests_,
+            'python': platform.python_version(),
+        })
+        click.echo(f"기준선 저장: {save_baseline}")
+    if baseline:
+        regressions = runner.compare(baseline, results, threshold=threshold, echo=click.echo)
+        if regressions:
+            click.echo(f"회귀 감지: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+@cli.command('render')
+@click.option('--iterations', type=int, default=200, help='페이지별 렌더링 횟수')
+@click.option('--only', multiple=True, help='특정 페이지만 실행 (여러 번 지정 가능)')
+@click.option('--save-baseline', type=click.Path(dir_okay=False), default=None, help='결과를 기준선 JSON으로 저장')
+@click.option('--compare', 'baseline', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='저장된 기준선과 렌더링 시간/응답 크기 비교')
+def render_command(iterations, only, save_baseline, baseline):
+    """페이지 템플릿별 렌더링 시간(p50/p95)과 응답 크기를 측정합니다."""
+    app = _load_app()
+    click.echo(render.HEADER)
+    results = render.run(app, iterations=iterations, only=set(only), echo=click.echo)
+    if save_baseline:
+        runner.save_results(save_baseline, results, {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'iterations': iterations, 'python': platform.python_version(),
+        })
+        click.echo(f"기준선 저장: {save_baseline}")
+    if baseline:
+        with open(baseline, encoding='utf-8') as f:
+            render.compare(json.load(f)['results'], results, echo=click.echo)
+
+
+@cli.command('startup')
+@click.option('--runs', type=int, default=5, help='새 프로세스로 측정할 횟수 (중앙값 보고)')
+@click.option('--path', default='/', help='첫 요청 경로')
+@click.option('--preload/--no-preload', default=False, help='create_app(preload=True)로 예열까지 포함 (wsgi.py와 같음)')
+@click.option('--save-baseline', type=click.Path(dir_okay=False), default=None, help='결과를 기준선 JSON으로 저장')
+@click.option('--compare', 'baseline', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='저장된 기준선과 import/create_app/첫 요청 시간 비교')
+def startup_command(runs, path, preload, save_baseline, baseline):
+    """워커 콜드 스타트(모듈별 import 시간, create_app 단계별 시간, 첫 요청까지)를 측정합니다."""
+    try:
+        results = startup.run(path=path, preload=preload, runs=runs, echo=click.echo)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    if save_baseline:
+        runner.save_results(save_baseline, results, {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'runs': runs, 'path': path, 'preload': preload, 'python': platform.python_version(),
+        })
+        click.echo(f"기준선 저장: {save_baseline}")
+    if baseline:
+        with open(baseline, encoding='utf-8') as f:
+            startup.compare(json.load(f)['results'], results, echo=click.echo)
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,121 @@
+import time
+from datetime import date, datetime, timedelta
+
+from flask import render_template
+
+from bench.runner import percentile
+from common.compression import compress_bytes
+from common.calendar_service import month_view
+from common.startup import ensure_blueprints
+
+# 템플릿 렌더링 벤치마크 ('python -m bench render')
+# DB 없이 페이지별 대표 컨텍스트로 render_template만 반복해 렌더링 시간과 응답 크기(바이트)를 측정합니다.
+# gzip_bytes는 압축 미들웨어(COMPRESSION_LEVEL 6)를 거쳐 실제로 전송되는 크기입니다.
+# 결과 형식은 'run'과 같은 JSON이므로 --save-baseline/--compare로 템플릿 변경 전후를 비교할 수 있습니다.
+
+_NOW = datetime(2026, 1, 15, 9, 30)
+_TODAY = date(2026, 1, 15)
+_STATUSES = ['미완료', '진행중', '완료', '기간연장']
+
+
+def _posts(count=20):
+    return [{'id': 1000 - i, 'title': f"게시글 제목 {i} 배포 회의 정리", 'excerpt': '본문 미리보기 ' * 10,
+             'username': f"user{i % 7}", 'created_at': _NOW - timedelta(hours=i),
+             'updated_at': _NOW - timedelta(hours=i) + timedelta(minutes=i % 3)} for i in range(count)]
+
+
+def _todos(count=50):
+    return [{'id': 500 - i, 'task': f"할 일 {i}: 보고서 작성과 검토", 'status': _STATUSES[i % 4],
+             'due_date': _TODAY + timedelta(days=i) if i % 3 else None,
+             'created_at': _NOW - timedelta(days=i)} for i in range(count)]
+
+
+def _calendar(year=2026, month=1):
+    view = month_view(year, month)
+    return dict(year=year, month=month, month_name=view.month_name, month_days=view.weeks,
+                prev_year=view.prev_year, prev_month=view.prev_month,
+                next_year=view.next_year, next_month=view.next_month,
+                current_day=_TODAY.day, today=_TODAY, username='user0')
+
+
+def _view_post():
+    post = {'id': 1000, 'user_id': 1, 'title': '배포 회의 정리', 'content': '본문 ' * 300, 'username': 'user0',
+            'created_at': _NOW, 'updated_at': _NOW, 'comment_count': 20}
+    comments = [{'content': f"댓글 {i} " * 5, 'username': f"user{i % 5}", 'created_at': _NOW + timedelta(minutes=i)}
+                for i in range(20)]
+    return dict(post=post, username='user0',
+                post_html=render_template('_post_content.html', post=post),
+                comments_html=render_template('_comments.html', comments=comments, post_id=post['id'],
+                                              first_page=True, next_cursor='abc'))
+
+
+# (이름, 템플릿, 컨텍스트 생성 함수)
+PAGES = [
+    ('default', 'default.html', lambda: {}),
+    ('main_logged_in', 'main_logged_in.html', lambda: {'username': 'user0'}),
+    ('board_list', 'board_list.html', lambda: dict(posts=_posts(), username='user0', search_query='', excerpt_len=100,
+                                                   page_size=20, prev_cursor='p', next_cursor='n', page=1,
+                                                   has_next_page=False)),
+    ('view_post', 'view_post.html', _view_post),
+    ('write_post', 'write_post.html', lambda: {'username': 'user0'}),
+    ('edit_post', 'edit_post.html', lambda: {'username': 'user0', 'post': {'id': 1, 'title': '제목', 'content': '본문 ' * 100}}),
+    ('todos_list', 'todos_list.html', lambda: dict(todos=_todos(), username='user0', status_filter='all',
+                                                   search_query='', page=1, has_next_page=False,
+                                                   all_statuses=_STATUSES)),
+    ('todos_reschedule', 'todos_reschedule.html',
+     lambda: dict(todo_item={'id': 1, 'task': '보고서', 'due_date': _TODAY, 'status': '진행중'}, **_calendar())),
+    ('diary_calendar', 'diary_calendar.html', lambda: dict(diary_days={1, 5, 9, 15}, entry_count=4, **_calendar())),
+    ('diary_entry', 'diary_entry.html', lambda: dict(diary={'entry_date': _TODAY, 'title': '제목', 'content': '일기 ' * 100},
+                                                     date_str='2026-01-15', username='user0')),
+]
+
+
+def run(app, iterations=200, only=None, echo=print):
+    """페이지별로 iterations번 렌더링하고 {이름: 결과} 사전을 반환합니다. (첫 렌더링은 컴파일 시간으로 따로 기록)"""
+    results = {}
+    ensure_blueprints(app) # LAZY_BLUEPRINTS여도 url_for가 동작하도록
+    with app.test_request_context('/'):
+        for name, template, make_context in PAGES:
+            if only and name not in only:
+                continue
+            context = make_context()
+            started = time.perf_counter()
+            html = render_template(template, **context)
+            first_ms = (time.perf_counter() - started) * 1000
+            timings = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                render_template(template, **context)
+                timings.append(time.perf_counter() - started)
+            timings.sort()
+            results[name] = {
+                'requests': iterations,
+                'first_ms': round(first_ms, 2),
+                'p50_ms': round(percentile(timings, 50) * 1000, 3),
+                'p95_ms': round(percentile(timings, 95) * 1000, 3),
+                'bytes': len(html.encode('utf-8')),
+                'gzip_bytes': len(compress_bytes(html.encode('utf-8'), 'gzip')),
+            }
+            echo(format_row(name, results[name]))
+    return results
+
+
+HEADER = f"{'page':<18} {'first_ms':>9} {'p50_ms':>8} {'p95_ms':>8} {'bytes':>8} {'gzip':>7}"
+
+
+def format_row(name, r):
+    return f"{name:<18} {r['first_ms']:>9.2f} {r['p50_ms']:>8.3f} {r['p95_ms']:>8.3f} {r['bytes']:>8} {r.get('gzip_bytes', 0):>7}"
+
+
+def compare(baseline, results, echo=print):
+    """기준선 대비 p50 렌더링 시간과 바이트 수 변화를 출력합니다."""
+    echo(f"{'page':<18} {'p50 base':>9} {'p50 now':>9} {'change':>8} {'bytes base':>10} {'bytes now':>9} {'change':>8}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            echo(f"{name:<18} (기준선 없음)")
+            continue
+        time_change = (current['p50_ms'] - base['p50_ms']) / base['p50_ms'] * 100 if base['p50_ms'] else 0.0
+        size_change = (current['bytes'] - base['bytes']) / base['bytes'] * 100 if base['bytes'] else 0.0
+        echo(f"{name:<18} {base['p50_ms']:>9.3f} {current['p50_ms']:>9.3f} {time_change:>+7.1f}% "
+             f"{base['bytes']:>10} {current['bytes']:>9} {size_change:>+7.1f}%")
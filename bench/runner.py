@@ -0,0 +1,195 @@
+import json
+import logging
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from http.cookiejar import CookieJar
+
+from werkzeug.serving import make_server
+
+from bench.seed import BENCH_PASSWORD
+from common.instrumentation import registry
+
+# 시나리오: (이름, Flask 엔드포인트, URL 생성 함수)
+# URL 생성 함수는 fixture와 난수 생성기를 받아 요청할 경로를 돌려줍니다.
+# 읽기 전용 GET 라우트만 포함합니다. (쓰기 라우트는 데이터가 바뀌어 회차 간 비교가 어렵습니다.)
+
+
+def _post_id(fixture, rng):
+    first, last = fixture['post_ids']
+    # 최근 글 위주로 조회되도록 상위 10% 범위에 가중치
+    if rng.random() < 0.8:
+        first = max(first, last - max(1, (last - first) // 10))
+    return rng.randint(first, last)
+
+
+def _recent_month(rng):
+    day = date.today() - timedelta(days=rng.randint(0, 180))
+    return day.year, day.month
+
+
+SCENARIOS = [
+    ('dashboard', 'auth.dashboard', lambda f, r: '/dashboard'),
+    ('board_list', 'board.board_list', lambda f, r: '/board/'),
+    ('board_search', 'board.board_list', lambda f, r: '/board/?query=' + urllib.parse.quote(r.choice(['배포', 'cache', '회의']))),
+    ('view_post', 'board.view_post', lambda f, r: f"/board/view/{_post_id(f, r)}"),
+    ('comment_page', 'board.comment_page', lambda f, r: f"/board/view/{_post_id(f, r)}/comments"),
+    ('todos_list', 'todos.todos_list', lambda f, r: '/todos/'),
+    ('todos_search', 'todos.todos_list', lambda f, r: '/todos/?query=' + urllib.parse.quote(r.choice(['보고서', 'query']))),
+    ('diary_calendar', 'diary.diary_calendar', lambda f, r: '/diary/%d/%d' % _recent_month(r)),
+    ('diary_entry', 'diary.diary_entry', lambda f, r: '/diary/entry/' + (date.today() - timedelta(days=r.randint(0, 60))).isoformat()),
+    ('api_posts', 'api.list_posts', lambda f, r: '/api/v1/posts'),
+    ('api_todos', 'api.list_todos', lambda f, r: '/api/v1/todos'),
+]
+
+
+def percentile(sorted_values, pct):
+    """nearest-rank 방식 백분위수."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class _TestClientSession:
+    """Flask 테스트 클라이언트로 WSGI 앱을 직접 호출합니다. (네트워크/서버 오버헤드 제외)"""
+
+    def __init__(self, app, username):
+        self.client = app.test_client()
+        self.client.post('/login', data={'username': username, 'password': BENCH_PASSWORD})
+
+    def get(self, path):
+        response = self.client.get(path)
+        response.close()
+        return response.status_code
+
+
+class _HttpSession:
+    """실제 WSGI 서버로 HTTP 요청을 보냅니다. 워커마다 쿠키(세션)를 따로 가집니다."""
+
+    def __init__(self, base_url, username):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+        data = urllib.parse.urlencode({'username': username, 'password': BENCH_PASSWORD}).encode()
+        self.opener.open(base_url + '/login', data=data).read()
+
+    def get(self, path):
+        try:
+            with self.opener.open(self.base_url + path) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+def _sql_counts():
+    return {endpoint: (entry['count'], entry['sql_count'])
+            for (endpoint, method), entry in registry.snapshot().items() if method == 'GET'}
+
+
+def run_scenario(make_session, fixture, name, endpoint, url_for_run, workers, requests, seed):
+    """한 시나리오를 workers개 스레드로 requests번 실행하고 지연/처리량/요청당 쿼리 수를 측정합니다."""
+    per_worker = max(1, requests // workers)
+    sessions = [make_session(fixture['users'][i % len(fixture['users'])]['username']) for i in range(workers)]
+    before = _sql_counts().get(endpoint, (0, 0))
+
+    def work(index):
+        rng = random.Random(seed * 1000 + index)
+        latencies, errors = [], 0
+        for _ in range(per_worker):
+            path = url_for_run(fixture, rng)
+            started = time.perf_counter()
+            status = sessions[index].get(path)
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors += 1
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(work, range(workers)))
+    elapsed = time.perf_counter() - started
+
+    after = _sql_counts().get(endpoint, (0, 0))
+    latencies = sorted(l for worker_latencies, _ in results for l in worker_latencies)
+    handled = after[0] - before[0]
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors for _, errors in results),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'queries_per_request': round((after[1] - before[1]) / handled, 2) if handled else 0.0,
+    }
+
+
+def run(app, fixture, mode='client', workers=4, requests=200, only=None, seed=1, echo=print):
+    """선택한 시나리오를 모두 실행하고 {이름: 결과} 사전을 반환합니다."""
+    server = None
+    if mode == 'wsgi':
+        logging.getLogger('werkzeug').setLevel(logging.WARNING) # 요청마다 찍히는 접근 로그는 측정을 방해합니다.
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        make_session = lambda username: _HttpSession(base_url, username)
+    else:
+        make_session = lambda username: _TestClientSession(app, username)
+
+    results = {}
+    try:
+        for name, endpoint, url_for_run in SCENARIOS:
+            if only and name not in only:
+                continue
+            # 캐시/풀 워밍업 후 측정
+            run_scenario(make_session, fixture, name, endpoint, url_for_run, 1, min(10, requests), seed)
+            results[name] = run_scenario(make_session, fixture, name, endpoint, url_for_run,
+                                         workers, requests, seed)
+            echo(format_row(name, results[name]))
+    finally:
+        if server is not None:
+            server.shutdown()
+    return results
+
+
+HEADER = f"{'scenario':<16} {'reqs':>6} {'err':>4} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} {'rps':>8} {'q/req':>6}"
+
+
+def format_row(name, r):
+    return (f"{name:<16} {r['requests']:>6} {r['errors']:>4} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+            f"{r['p99_ms']:>8.2f} {r['rps']:>8.1f} {r['queries_per_request']:>6.2f}")
+
+
+def save_results(path, results, meta):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': results}, f, ensure_ascii=False, indent=2)
+
+
+def compare(baseline_path, results, threshold=10.0, echo=print):
+    """
+    저장된 기준선과 비교합니다. p95 지연이 threshold% 넘게 늘었거나
+    요청당 쿼리 수가 늘어난 시나리오 목록을 반환합니다.
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    echo(f"{'scenario':<16} {'p95 base':>9} {'p95 now':>9} {'change':>8} {'q/req base':>10} {'q/req now':>9}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            echo(f"{name:<16} (기준선 없음)")
+            continue
+        change = (current['p95_ms'] - base['p95_ms']) / base['p95_ms'] * 100 if base['p95_ms'] else 0.0
+        regressed = change > threshold or current['queries_per_request'] > base['queries_per_request']
+        if regressed:
+            regressions.append(name)
+        echo(f"{name:<16} {base['p95_ms']:>9.2f} {current['p95_ms']:>9.2f} {change:>+7.1f}% "
+             f"{base['queries_per_request']:>10.2f} {current['queries_per_request']:>9.2f}"
+             + ('  << 회귀' if regressed else ''))
+    return regressions
@@ -0,0 +1,138 @@
+import random
+from datetime import date, datetime, timedelta
+
+from common.passwords import get_hasher
+
+# 벤치마크용 합성 데이터 생성기.
+# 모든 행은 'bench_' 접두사 사용자에 딸려 있으므로 clear_bench_data()로 한 번에 지울 수 있습니다.
+
+BENCH_USER_PREFIX = 'bench_user_'
+BENCH_PASSWORD = 'bench-password'
+
+# 규모 프리셋: 대략적인 전체 행 수 기준
+SCALES = {
+    '10k': dict(users=20, posts=1_000, comments_per_post=5, todos_per_user=100, diaries_per_user=100),
+    '100k': dict(users=100, posts=10_000, comments_per_post=5, todos_per_user=300, diaries_per_user=365),
+    '1m': dict(users=500, posts=100_000, comments_per_post=6, todos_per_user=500, diaries_per_user=365),
+    '10m': dict(users=2_000, posts=1_000_000, comments_per_post=7, todos_per_user=1_000, diaries_per_user=730),
+}
+
+BATCH_SIZE = 5000
+STATUSES = ('미완료', '진행중', '완료')
+WORDS = ('회의', '보고서', '여행', '운동', '장보기', '프로젝트', '일정', '리뷰', '배포', '점검',
+         'flask', 'mysql', 'index', 'cache', 'query', 'template', 'session', 'pool')
+
+
+def _sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def _max_id(cursor, table):
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) AS max_id FROM {table}")
+    return cursor.fetchone()['max_id']
+
+
+def _insert_batches(conn, sql, rows, echo):
+    batch = []
+    total = 0
+    with conn.cursor() as cursor:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                cursor.executemany(sql, batch)
+                conn.commit()
+                total += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            conn.commit()
+            total += len(batch)
+    echo(f"  {sql.split()[2]}: {total}행")
+    return total
+
+
+def seed(conn, users, posts, comments_per_post, todos_per_user, diaries_per_user,
+         random_seed=42, echo=print):
+    """
+    합성 데이터를 채웁니다. id를 직접 지정해 배치 삽입하므로 대량 시드도 왕복 횟수가 적습니다.
+    반환값: {'user_ids': [...], 'post_ids': (first, last)}
+    """
+    rng = random.Random(random_seed)
+    now = datetime.now().replace(microsecond=0)
+    password_hash = get_hasher().hash(BENCH_PASSWORD) # 앱 설정(PASSWORD_HASH_METHOD)과 같아야 로그인 때 재해시되지 않습니다.
+
+    with conn.cursor() as cursor:
+        first_user = _max_id(cursor, 'users') + 1
+        first_post = _max_id(cursor, 'board') + 1
+    user_ids = list(range(first_user, first_user + users))
+    tag = f"{first_user}_" # 재시드해도 username이 겹치지 않도록
+
+    _insert_batches(conn, "INSERT INTO users (id, username, password) VALUES (%s, %s, %s)",
+                    ((uid, f"{BENCH_USER_PREFIX}{tag}{i}", password_hash) for i, uid in enumerate(user_ids)),
+                    echo)
+
+    # 게시글: 최근 글일수록 id가 크도록 과거부터 순서대로 생성
+    comment_counts = [max(0, int(rng.gauss(comments_per_post, comments_per_post / 2))) for _ in range(posts)]
+
+    def post_rows():
+        for i in range(posts):
+            created = now - timedelta(minutes=(posts - i) * 7)
+            yield (first_post + i, rng.choice(user_ids), _sentence(rng, 4),
+                   _sentence(rng, rng.randint(20, 200)), created, created, comment_counts[i])
+
+    _insert_batches(conn, "INSERT INTO board (id, user_id, title, content, created_at, updated_at, comment_count)"
+                          " VALUES (%s, %s, %s, %s, %s, %s, %s)", post_rows(), echo)
+
+    def comment_rows():
+        for i, count in enumerate(comment_counts):
+            post_created = now - timedelta(minutes=(posts - i) * 7)
+            for j in range(count):
+                yield (first_post + i, rng.choice(user_ids), _sentence(rng, rng.randint(3, 30)),
+                       post_created + timedelta(seconds=30 * (j + 1)))
+
+    _insert_batches(conn, "INSERT INTO comments (board_id, user_id, content, created_at) VALUES (%s, %s, %s, %s)",
+                    comment_rows(), echo)
+
+    def todo_rows():
+        for uid in user_ids:
+            for j in range(todos_per_user):
+                created = now - timedelta(hours=j * 3)
+                due = (created + timedelta(days=rng.randint(-10, 30))).date() if rng.random() < 0.7 else None
+                yield (uid, _sentence(rng, rng.randint(2, 8)), due, rng.choice(STATUSES), created)
+
+    _insert_batches(conn, "INSERT INTO todos (user_id, task, due_date, status, created_at) VALUES (%s, %s, %s, %s, %s)",
+                    todo_rows(), echo)
+
+    def diary_rows():
+        today = date.today()
+        for uid in user_ids:
+            for j in range(diaries_per_user):
+                day = today - timedelta(days=j)
+                yield (uid, day, _sentence(rng, 3), _sentence(rng, rng.randint(10, 120)))
+
+    _insert_batches(conn, "INSERT INTO diaries (user_id, entry_date, title, content) VALUES (%s, %s, %s, %s)",
+                    diary_rows(), echo)
+
+    return {'user_ids': user_ids, 'post_ids': (first_post, first_post + posts - 1)}
+
+
+def bench_fixture(conn):
+    """이미 시드된 벤치마크 사용자/게시글 범위를 찾습니다. 없으면 None."""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT id, username FROM users WHERE username LIKE %s ORDER BY id",
+                       (BENCH_USER_PREFIX + '%',))
+        users = cursor.fetchall()
+        if not users:
+            return None
+        cursor.execute("SELECT MIN(id) AS first_id, MAX(id) AS last_id FROM board")
+        bounds = cursor.fetchone()
+    return {'users': users, 'post_ids': (bounds['first_id'], bounds['last_id'])}
+
+
+def clear_bench_data(conn):
+    """벤치마크 사용자를 지웁니다. 게시글/댓글/일기/할 일은 FK ON DELETE CASCADE로 함께 지워집니다."""
+    with conn.cursor() as cursor:
+        cursor.execute("DELETE FROM users WHERE username LIKE %s", (BENCH_USER_PREFIX + '%',))
+        deleted = cursor.rowcount
+    conn.commit()
+    return deleted
@@ -0,0 +1,117 @@
+import json
+import os
+import subprocess
+import sys
+
+from bench.runner import percentile
+
+# 워커 콜드 스타트 측정
+# 회차마다 새 파이썬 프로세스(-X importtime)에서 app 모듈 import, create_app(), 첫 요청(테스트 클라이언트)까지의
+# 시간을 잽니다. mod_wsgi가 워커를 새로 띄울 때(maximum-requests, 재시작)의 비용과 같은 경로입니다.
+# 모듈별 import 시간은 -X importtime의 누적 시간(하위 모듈 포함)입니다.
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_PACKAGES = ('app', 'config', 'common', 'auth', 'board', 'diary', 'todos', 'api')
+_MARKER = 'BENCH_STARTUP '
+
+_CHILD = r'''
+import json, time
+started = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+app = app_module.create_app(preload={preload!r})
+created = time.perf_counter()
+response = app.test_client().get({path!r})
+response.close()
+finished = time.perf_counter()
+report = app.extensions['startup_report'].as_dict()
+print({marker!r} + json.dumps({{
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (finished - created) * 1000,
+    'status': response.status_code,
+    'phases_ms': report['phases_ms'],
+}}))
+'''
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력에서 {모듈: 누적 마이크로초}를 만듭니다."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def _is_project(module):
+    return module.split('.', 1)[0] in PROJECT_PACKAGES
+
+
+def measure_once(path='/', preload=False):
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _CHILD.format(preload=preload, path=path, marker=_MARKER)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    line = next((l for l in proc.stdout.splitlines() if l.startswith(_MARKER)), None)
+    if proc.returncode != 0 or line is None:
+        raise RuntimeError(f"시작 측정 프로세스 실패 (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+    result = json.loads(line[len(_MARKER):])
+    result['imports_us'] = parse_importtime(proc.stderr)
+    return result
+
+
+def run(path='/', preload=False, runs=5, top=10, echo=print):
+    """runs번 새 프로세스로 측정하고 중앙값 요약을 반환합니다."""
+    samples = [measure_once(path=path, preload=preload) for _ in range(runs)]
+
+    def median(values):
+        return round(percentile(sorted(values), 50), 1)
+
+    results = {
+        name: median([s[name] for s in samples])
+        for name in ('import_ms', 'create_app_ms', 'first_request_ms')
+    }
+    results['total_ms'] = round(results['import_ms'] + results['create_app_ms'] + results['first_request_ms'], 1)
+    results['phases_ms'] = {name: median([s['phases_ms'].get(name, 0.0) for s in samples])
+                            for name in samples[0]['phases_ms']}
+
+    # 프로젝트 모듈은 모두, 외부 패키지는 최상위 패키지 중 느린 순서로 top개
+    modules = {}
+    for name in samples[0]['imports_us']:
+        modules[name] = median([s['imports_us'].get(name, 0) / 1000 for s in samples])
+    project = {name: ms for name, ms in modules.items() if _is_project(name)}
+    third_party = sorted(((name, ms) for name, ms in modules.items()
+                          if '.' not in name and not _is_project(name)), key=lambda item: item[1], reverse=True)
+    results['imports_ms'] = dict(sorted(project.items(), key=lambda item: item[1], reverse=True))
+    results['third_party_imports_ms'] = dict(third_party[:top])
+
+    echo(f"runs={runs} preload={preload} path={path} status={samples[-1]['status']}")
+    echo(f"{'import':<20} {results['import_ms']:>9.1f} ms")
+    echo(f"{'create_app':<20} {results['create_app_ms']:>9.1f} ms")
+    echo(f"{'first request':<20} {results['first_request_ms']:>9.1f} ms")
+    echo(f"{'total':<20} {results['total_ms']:>9.1f} ms")
+    echo("\n[create_app 단계]")
+    for name, ms in results['phases_ms'].items():
+        echo(f"  {name:<24} {ms:>8.1f} ms")
+    echo("\n[프로젝트 모듈 import (누적)]")
+    for name, ms in list(results['imports_ms'].items())[:top * 2]:
+        echo(f"  {name:<24} {ms:>8.1f} ms")
+    echo("\n[외부 패키지 import (누적)]")
+    for name, ms in results['third_party_imports_ms'].items():
+        echo(f"  {name:<24} {ms:>8.1f} ms")
+    return results
+
+
+def compare(baseline, results, echo=print):
+    """기준선 대비 구간별 시간 변화를 출력합니다."""
+    echo(f"{'stage':<20} {'base':>9} {'now':>9} {'change':>8}")
+    for name in ('import_ms', 'create_app_ms', 'first_request_ms', 'total_ms'):
+        base, current = baseline.get(name), results[name]
+        if base is None:
+            echo(f"{name:<20} (기준선 없음)")
+            continue
+        change = (current - base) / base * 100 if base else 0.0
+        echo(f"{name:<20} {base:>9.1f} {current:>9.1f} {change:>+7.1f}%")
@@ -1,59 +1,126 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+import logging
+from flask import Blueprint, render_template, request, redirect, url_for, g, flash, current_app
+from common.auth import login_required, current_user
 from common.utils import get_db_connection
+from common.pagination import keyset_clause, finalize_page, decode_cursor, clamp_page_size
+from common.search import search_board, index_board_post, unindex_board_post
+from common.cache import get_cache
+from common.view_counts import record_view, current_views, popular_posts, STORED_VIEWS_SQL, views_cache_key, views_cache_ttl
+from markupsafe import Markup
 import pymysql.cursors
 from datetime import datetime
 
 # 'board_bp'라는 이름의 블루프린트 인스턴스 생성
+logger = logging.getLogger(__name__)
+
 board_bp = Blueprint('board', __name__) # url_prefix는 app.py에서 등록 시 지정
 
+
+# --- view_post 조각 캐시 키 (common/cache.py) ---
+def _post_cache_key(post_id):
+    return f"board:post:{post_id}"
+
+
+def _comments_cache_key(post_id):
+    return f"board:comments:{post_id}"
+
+
+def _comment_page_query(post_id, page_cursor):
+    """댓글 한 페이지를 읽는 (sql, params, page_size). (created_at, id) 오름차순 키셋"""
+    page_size = current_app.config.get('COMMENT_PAGE_SIZE', 50)
+    keyset_sql, keyset_params, order_sql = keyset_clause('c.created_at', 'c.id', page_cursor, descending=False)
+    sql = "SELECT c.id, c.content, c.created_at, u.username, c.user_id " \
+          "FROM comments c JOIN users u ON c.user_id = u.id WHERE c.board_id = %s"
+    params = [post_id]
+    if keyset_sql:
+        sql += " AND " + keyset_sql
+        params.extend(keyset_params)
+    sql += f" {order_sql} LIMIT %s"
+    params.append(page_size + 1)
+    return sql, params, page_size
+
+
+def _load_comment_page(conn, post_id, page_cursor):
+    """
+    댓글을 (created_at, id) 오름차순 키셋으로 한 페이지 읽습니다.
+    반환값: (comments, next_cursor)
+    """
+    sql, params, page_size = _comment_page_query(post_id, page_cursor)
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        comments, _, next_cursor = finalize_page(cursor.fetchall(), page_size, page_cursor)
+    return comments, next_cursor
+
+
+_POST_SQL = "SELECT b.id, b.title, b.content, b.created_at, b.updated_at, b.user_id, b.comment_count, u.username " \
+            "FROM board b JOIN users u ON b.user_id = u.id WHERE b.id = %s"
+
+
 # --- 게시판 관련 라우트 ---
 
 @board_bp.route('/') # 실제 경로는 /board (app.py에서 url_prefix로 지정)
+@login_required('게시판을 보려면 로그인해야 합니다.')
 def board_list():
     """검색 기능을 포함한 게시글 목록을 표시합니다."""
-    if 'loggedin' not in session:
-        flash('게시판을 보려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index')) # auth 블루프린트의 index로 리디렉션
-
     search_query = request.args.get('query', '').strip()
+    page_size = clamp_page_size(request.args.get('size'),
+                                current_app.config.get('BOARD_PAGE_SIZE', 20),
+                                current_app.config.get('BOARD_MAX_PAGE_SIZE', 100))
+    excerpt_len = current_app.config.get('BOARD_EXCERPT_LENGTH', 100)
+
+    # 키셋 커서: ?before=<커서> 는 더 오래된 글(다음 페이지), ?after=<커서> 는 더 최신 글(이전 페이지)
+    direction = 'prev' if request.args.get('after') else 'next'
+    page_cursor = decode_cursor(request.args.get('after') or request.args.get('before'))
 
     conn = None
     posts = []
+    popular = []
+    prev_cursor = next_cursor = None
+    page = max(1, request.args.get('page', 1, type=int))
+    has_next_page = False
     try:
+        if not search_query and page_cursor is None:
+            popular = popular_posts() # 첫 페이지에만 인기 글 (캐시됨)
         conn = get_db_connection()
         with conn.cursor() as cursor:
-            sql = "SELECT b.id, b.title, b.content, b.created_at, b.updated_at, u.username " \
-                  "FROM board b JOIN users u ON b.user_id = u.id"
-            params = []
-
             if search_query:
-                sql += " WHERE b.title LIKE %s OR b.content LIKE %s"
-                params.append(f"%{search_query}%")
-                params.append(f"%{search_query}%")
-
-            sql += " ORDER BY b.created_at DESC"
-
-            cursor.execute(sql, params)
-            posts = cursor.fetchall()
+                # 검색 결과는 관련도 순이므로 커서 대신 페이지 번호로 나눕니다.
+                posts, has_next_page = search_board(cursor, search_query, page=page,
+                                                    page_size=page_size, excerpt_len=excerpt_len)
+            else:
+                # 본문 전체 대신 목록에 표시할 앞부분만 가져옵니다. (truncate 여부 판단을 위해 1자 더)
+                sql = "SELECT b.id, b.title, SUBSTR(b.content, 1, %s) AS excerpt, b.created_at, b.updated_at, u.username " \
+                      "FROM board b JOIN users u ON b.user_id = u.id"
+                params = [excerpt_len + 1]
+
+                keyset_sql, keyset_params, order_sql = keyset_clause('b.created_at', 'b.id', page_cursor, direction)
+                if keyset_sql:
+                    sql += " WHERE " + keyset_sql
+                    params.extend(keyset_params)
+                sql += f" {order_sql} LIMIT %s"
+                params.append(page_size + 1) # 다음 페이지 존재 여부 확인용으로 1건 더
+
+                cursor.execute(sql, params)
+                posts, prev_cursor, next_cursor = finalize_page(cursor.fetchall(), page_size, page_cursor, direction)
     except Exception as e:
-        print(f"데이터베이스 오류 (게시글 불러오기 및 검색): {e}")
+        logger.exception("데이터베이스 오류 (게시글 불러오기 및 검색)")
         flash('게시판 글을 불러오는 데 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
             conn.close()
-    return render_template('board_list.html', posts=posts, username=session['username'], search_query=search_query)
+    return render_template('board_list.html', posts=posts, popular_posts=popular, username=g.user['username'], search_query=search_query,
+                           excerpt_len=excerpt_len, page_size=page_size,
+                           prev_cursor=prev_cursor, next_cursor=next_cursor,
+                           page=page, has_next_page=has_next_page)
 
 @board_bp.route('/write', methods=['GET', 'POST']) # 실제 경로는 /board/write
+@login_required('게시글을 작성하려면 로그인해야 합니다.')
 def write_post():
     """새 게시글 작성을 처리합니다."""
-    if 'loggedin' not in session:
-        flash('게시글을 작성하려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index'))
-
     if request.method == 'POST':
         title = request.form['title'].strip()
         content = request.form['content'].strip()
-        user_id = session['id']
+        user_id = g.user['id']
 
         if not title or not content:
             flash('제목과 내용은 비워둘 수 없습니다.', 'error')
@@ -65,59 +132,103 @@ def write_post():
             with conn.cursor() as cursor:
                 sql = "INSERT INTO board (user_id, title, content) VALUES (%s, %s, %s)"
                 cursor.execute(sql, (user_id, title, content))
+                post_id = cursor.lastrowid
             conn.commit()
+            index_board_post(post_id, title, content)
             flash('게시글이 성공적으로 작성되었습니다!', 'success')
         except Exception as e:
-            print(f"데이터베이스 오류 (게시글 작성): {e}")
+            logger.exception("데이터베이스 오류 (게시글 작성)")
             flash('게시글 작성에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
         finally:
             if conn:
                 conn.close()
         return redirect(url_for('board.board_list')) # url_for에 블루프린트 이름 명시
-    return render_template('write_post.html', username=session['username'])
+    return render_template('write_post.html', username=g.user['username'])
 
 @board_bp.route('/view/<int:post_id>') # 실제 경로는 /board/view/<id>
+@login_required('게시글을 보려면 로그인해야 합니다.')
 def view_post(post_id):
-    """단일 게시글과 해당 댓글을 표시합니다."""
-    if 'loggedin' not in session:
-        flash('게시글을 보려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index'))
-
+    """단일 게시글과 해당 댓글을 표시합니다.
+    캐시에 없는 조각(본문, 조회수, 댓글 첫 페이지)만 연결 하나에서 차례로 조회합니다."""
+    cache = get_cache()
     conn = None
     post = None
-    comments = []
+    post_html = comments_html = None
+    views = 0
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
-            sql_post = "SELECT b.id, b.title, b.content, b.created_at, b.updated_at, b.user_id, u.username " \
-                       "FROM board b JOIN users u ON b.user_id = u.id WHERE b.id = %s"
-            cursor.execute(sql_post, (post_id,))
-            post = cursor.fetchone()
+        # 1) 게시글 본문 조각과 2) 댓글 첫 페이지 조각: 캐시에 있으면 DB를 조회하지 않습니다.
+        # 댓글 이후 페이지는 comment_page에서 요청 시 가져옵니다.
+        # 3) 반영된 조회수: 본문 조각과 따로, 조회수 반영 주기 동안만 캐시합니다. (common/view_counts.py)
+        cached_post = cache.get(_post_cache_key(post_id))
+        comments_html = cache.get(_comments_cache_key(post_id))
+        stored_views = cache.get(views_cache_key(post_id))
+        if cached_post is None or stored_views is None or comments_html is None:
+            conn = get_db_connection()
 
+        if cached_post is None:
+            with conn.cursor() as cursor:
+                cursor.execute(_POST_SQL, (post_id,))
+                post = cursor.fetchone()
             if not post:
                 flash('게시글을 찾을 수 없습니다.', 'error')
                 return redirect(url_for('board.board_list')) # url_for에 블루프린트 이름 명시
 
-            sql_comments = "SELECT c.id, c.content, c.created_at, u.username, c.user_id " \
-                           "FROM comments c JOIN users u ON c.user_id = u.id WHERE c.board_id = %s ORDER BY c.created_at ASC"
-            cursor.execute(sql_comments, (post_id,))
-            comments = cursor.fetchall()
+            cached_post = {'post': post, 'html': render_template('_post_content.html', post=post)}
+            cache.set(_post_cache_key(post_id), cached_post, ttl=current_app.config.get('POST_CACHE_TTL', 300))
+        post = cached_post['post']
+        post_html = Markup(cached_post['html'])
+        if stored_views is None:
+            with conn.cursor() as cursor:
+                cursor.execute(STORED_VIEWS_SQL, (post_id,))
+                stored_views = (cursor.fetchone() or {}).get('views') or 0
+            cache.set(views_cache_key(post_id), stored_views, ttl=views_cache_ttl())
+        # 조회수는 메모리에 더하기만 합니다. 표시 값은 반영된 views + 이 프로세스의 미반영 조회 수
+        record_view(post_id)
+        views = current_views(post_id, stored_views)
+
+        if comments_html is None:
+            comments, next_cursor = _load_comment_page(conn, post_id, None)
+            comments_html = render_template('_comments.html', comments=comments, post_id=post_id,
+                                            next_cursor=next_cursor, first_page=True)
+            cache.set(_comments_cache_key(post_id), comments_html, ttl=current_app.config.get('POST_CACHE_TTL', 300))
+        comments_html = Markup(comments_html)
 
     except Exception as e:
-        print(f"데이터베이스 오류 (게시글 조회): {e}")
+        logger.exception("데이터베이스 오류 (게시글 조회)")
         flash('게시글을 불러오는 데 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
             conn.close()
-    return render_template('view_post.html', post=post, comments=comments, username=session['username'])
+    return render_template('view_post.html', post=post, post_html=post_html, comments_html=comments_html,
+                           views=views, username=g.user['username'])
+
+@board_bp.route('/view/<int:post_id>/comments') # 실제 경로는 /board/view/<id>/comments?cursor=<커서>
+def comment_page(post_id):
+    """댓글 다음 페이지를 HTML 조각으로 반환합니다. (view_post의 '댓글 더 보기'에서 호출)"""
+    if current_user() is None:
+        return '', 401
+
+    page_cursor = decode_cursor(request.args.get('cursor'))
+    if page_cursor is None:
+        return '', 400
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        comments, next_cursor = _load_comment_page(conn, post_id, page_cursor)
+    except Exception as e:
+        logger.exception("데이터베이스 오류 (댓글 페이지 조회)")
+        return '', 500
+    finally:
+        if conn:
+            conn.close()
+    return render_template('_comments.html', comments=comments, post_id=post_id,
+                           next_cursor=next_cursor, first_page=False)
 
 @board_bp.route('/edit/<int:post_id>', methods=['GET', 'POST']) # 실제 경로는 /board/edit/<id>
+@login_required('게시글을 수정하려면 로그인해야 합니다.')
 def edit_post(post_id):
     """기존 게시글 편집을 처리합니다."""
-    if 'loggedin' not in session:
-        flash('게시글을 수정하려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index'))
-
     conn = None
     post = None
     try:
@@ -131,7 +242,7 @@ def edit_post(post_id):
                 flash('게시글을 찾을 수 없습니다.', 'error')
                 return redirect(url_for('board.board_list')) # url_for에 블루프린트 이름 명시
 
-            if post['user_id'] != session['id']:
+            if post['user_id'] != g.user['id']:
                 flash('이 게시글을 수정할 권한이 없습니다.', 'error')
                 return redirect(url_for('board.view_post', post_id=post_id)) # url_for에 블루프린트 이름 명시
 
@@ -147,23 +258,22 @@ def edit_post(post_id):
                 sql = "UPDATE board SET title = %s, content = %s WHERE id = %s"
                 cursor.execute(sql, (title, content, post_id))
             conn.commit()
+            index_board_post(post_id, title, content)
+            get_cache().delete(_post_cache_key(post_id))
             flash('게시글이 성공적으로 수정되었습니다!', 'success')
             return redirect(url_for('board.view_post', post_id=post_id)) # url_for에 블루프린트 이름 명시
     except Exception as e:
-        print(f"데이터베이스 오류 (게시글 수정): {e}")
+        logger.exception("데이터베이스 오류 (게시글 수정)")
         flash('게시글 수정에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
             conn.close()
-    return render_template('edit_post.html', post=post, username=session['username'])
+    return render_template('edit_post.html', post=post, username=g.user['username'])
 
 @board_bp.route('/delete/<int:post_id>', methods=['POST']) # 실제 경로는 /board/delete/<id>
+@login_required('게시글을 삭제하려면 로그인해야 합니다.')
 def delete_post(post_id):
     """게시글 삭제를 처리합니다."""
-    if 'loggedin' not in session:
-        flash('게시글을 삭제하려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index'))
-
     conn = None
     try:
         conn = get_db_connection()
@@ -176,16 +286,18 @@ def delete_post(post_id):
                 flash('게시글을 찾을 수 없습니다.', 'error')
                 return redirect(url_for('board.board_list')) # url_for에 블루프린트 이름 명시
 
-            if post_owner['user_id'] != session['id']:
+            if post_owner['user_id'] != g.user['id']:
                 flash('이 게시글을 삭제할 권한이 없습니다.', 'error')
                 return redirect(url_for('board.view_post', post_id=post_id)) # url_for에 블루프린트 이름 명시
 
             sql_delete = "DELETE FROM board WHERE id = %s"
             cursor.execute(sql_delete, (post_id,))
         conn.commit()
+        unindex_board_post(post_id)
+        get_cache().delete(_post_cache_key(post_id), _comments_cache_key(post_id))
         flash('게시글이 성공적으로 삭제되었습니다!', 'success')
     except Exception as e:
-        print(f"데이터베이스 오류 (게시글 삭제): {e}")
+        logger.exception("데이터베이스 오류 (게시글 삭제)")
         flash('게시글 삭제에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
@@ -194,14 +306,11 @@ def delete_post(post_id):
 
 
 @board_bp.route('/comment/add/<int:post_id>', methods=['POST']) # 실제 경로는 /board/comment/add/<id>
+@login_required('댓글을 작성하려면 로그인해야 합니다.')
 def add_comment(post_id):
     """게시글에 댓글 추가를 처리합니다."""
-    if 'loggedin' not in session:
-        flash('댓글을 작성하려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index'))
-
     content = request.form['content'].strip()
-    user_id = session['id']
+    user_id = g.user['id']
 
     if not content:
         flash('댓글 내용은 비워둘 수 없습니다.', 'error')
@@ -211,17 +320,21 @@ def add_comment(post_id):
     try:
         conn = get_db_connection()
         with conn.cursor() as cursor:
-            cursor.execute("SELECT id FROM board WHERE id = %s", (post_id,))
-            if not cursor.fetchone():
+            # 댓글 수 증가가 게시글 존재 확인을 겸합니다. (행 잠금으로 동시 작성 시에도 정확)
+            # updated_at은 ON UPDATE로 갱신되지 않도록 기존 값을 그대로 지정합니다. (게시글 '수정됨' 표시 유지)
+            sql_count = "UPDATE board SET comment_count = comment_count + 1, updated_at = updated_at WHERE id = %s"
+            cursor.execute(sql_count, (post_id,))
+            if cursor.rowcount == 0:
                 flash('댓글을 달 게시글을 찾을 수 없습니다.', 'error')
                 return redirect(url_for('board.board_list')) # url_for에 블루프린트 이름 명시
 
             sql = "INSERT INTO comments (board_id, user_id, content) VALUES (%s, %s, %s)"
             cursor.execute(sql, (post_id, user_id, content))
         conn.commit()
+        get_cache().delete(_post_cache_key(post_id), _comments_cache_key(post_id))
         flash('댓글이 성공적으로 작성되었습니다!', 'success')
     except Exception as e:
-        print(f"데이터베이스 오류 (댓글 작성): {e}")
+        logger.exception("데이터베이스 오류 (댓글 작성)")
         flash('댓글 작성에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import re
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from common.compression import brotli, compress_bytes
+
+# 정적 파일 빌드 ('flask assets build')
+# static/css, static/js의 파일을 줄여(minify) 내용 해시가 들어간 이름으로 static/dist에 쓰고,
+# 옆에 최고 압축률로 미리 압축한 .gz(brotli가 설치돼 있으면 .br도)를 만듭니다.
+#   static/css/app.css -> static/dist/css/app.<hash>.css (+ .gz, .br)
+# static/dist/manifest.json에 원본 이름 -> 빌드 결과를 기록하면 asset_url()이 빌드 결과 주소를 돌려주고,
+# 압축 미들웨어(common/compression.py)는 요청마다 압축하지 않고 .br/.gz 파일을 그대로 보냅니다.
+# 이름이 내용과 함께 바뀌므로 모두 immutable로 캐시됩니다. (자동 리로드 중에는 manifest를 쓰지 않고 원본을 씁니다)
+
+SOURCE_DIRS = ('css', 'js')
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE_RE = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css(text):
+    """주석과 불필요한 공백을 지웁니다. (문자열 안의 내용을 바꾸지 않는 범위의 단순한 축약)"""
+    text = _CSS_COMMENT_RE.sub('', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = _CSS_SPACE_RE.sub(r'\1', text)
+    text = re.sub(r':\s+', ':', text)
+    return text.replace(';}', '}').strip() + '\n'
+
+
+def minify_js(text):
+    """한 줄 주석, 들여쓰기, 빈 줄만 지웁니다. (문법을 해석하지 않으므로 줄 안의 내용은 그대로 둡니다)"""
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith('//'):
+            lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+_MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def _source_files(static_folder):
+    for directory in SOURCE_DIRS:
+        root = os.path.join(static_folder, directory)
+        for dirpath, _, filenames in os.walk(root):
+            for filename in sorted(filenames):
+                if os.path.splitext(filename)[1] in _MINIFIERS:
+                    path = os.path.join(dirpath, filename)
+                    yield os.path.relpath(path, static_folder).replace(os.sep, '/'), path
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def build_assets(static_folder, echo=print):
+    """static_folder의 CSS/JS를 빌드하고 manifest 사전을 반환합니다. 이전 빌드의 남은 파일은 지웁니다."""
+    dist = os.path.join(static_folder, DIST_DIR)
+    manifest = {}
+    written = set()
+    for name, path in _source_files(static_folder):
+        stem, ext = os.path.splitext(name)
+        with open(path, encoding='utf-8') as f:
+            data = _MINIFIERS[ext](f.read()).encode('utf-8')
+        digest = hashlib.sha1(data).hexdigest()[:12]
+        built = f"{DIST_DIR}/{stem}.{digest}{ext}"
+        target = os.path.join(static_folder, *built.split('/'))
+        outputs = {'': data}
+        for encoding, suffix in (('gzip', '.gz'), ('br', '.br')):
+            if encoding == 'br' and brotli is None:
+                continue
+            compressed = compress_bytes(data, encoding, level=9, brotli_quality=11)
+            if len(compressed) < len(data):
+                outputs[suffix] = compressed
+        for suffix, content in outputs.items():
+            _write(target + suffix, content)
+            written.add(os.path.abspath(target + suffix))
+        manifest[name] = built
+        sizes = ', '.join(f"{suffix or 'min'} {len(content)}" for suffix, content in outputs.items())
+        echo(f"  {name} ({os.path.getsize(path)} bytes) -> {built} ({sizes})")
+
+    manifest_path = os.path.join(dist, MANIFEST_NAME)
+    _write(manifest_path, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    written.add(os.path.abspath(manifest_path))
+    for dirpath, _, filenames in os.walk(dist):
+        for filename in filenames:
+            path = os.path.abspath(os.path.join(dirpath, filename))
+            if path not in written:
+                os.remove(path)
+    return manifest
+
+
+def load_manifest(static_folder):
+    """빌드된 manifest({원본 이름: dist 경로}). 빌드하지 않았으면 빈 사전."""
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# --- Flask CLI: flask assets <command> ---
+assets_cli = AppGroup('assets', help='정적 파일 빌드 명령')
+
+
+@assets_cli.command('build')
+def build_command():
+    """CSS/JS를 줄이고 해시 이름과 미리 압축한 파일로 static/dist에 빌드합니다. (배포 때 실행, 앱 재시작 후 적용)"""
+    if brotli is None:
+        click.echo("brotli 모듈이 없어 .gz만 만듭니다. (pip install brotli)")
+    manifest = build_assets(current_app.static_folder, echo=click.echo)
+    click.echo(f"정적 파일 {len(manifest)}개 빌드 완료: {os.path.join(current_app.static_folder, DIST_DIR)}")
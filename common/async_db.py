@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from common.instrumentation import record_acquire, record_query
+from common.utils import get_backend, get_pool, get_replicas, reads_from_replica
+
+_create_lock = threading.Lock()
+
+# 비동기 DB 헬퍼 (async def 뷰에서 사용, flask[async] 필요)
+# pymysql은 동기 드라이버이므로 쿼리를 DB 전용 스레드 풀(DB_ASYNC_WORKERS)에서 실행하고 await합니다.
+# 쿼리마다 풀에서 연결을 따로 빌렸다가 바로 반납하므로 asyncio.gather로 묶은 독립적인 쿼리들은
+# 서로 다른 연결에서 동시에 실행됩니다.
+#   post, comments = await asyncio.gather(fetch_one(sql1, args1), fetch_all(sql2, args2))
+# 실행 스레드에는 요청 컨텍스트가 없으므로 연결 대기/쿼리 시간은 await한 쪽(요청)에서 기록합니다.
+# 읽기(fetch_one/fetch_all)는 get_db_connection과 같은 규칙으로 읽기 복제본에 보냅니다. (common/replicas.py)
+# 쿼리 하나가 연결 하나를 쓰므로 동시에 gather하는 쿼리 수만큼 DB_POOL_SIZE/DB_POOL_MAX_OVERFLOW에 여유가 있어야 합니다.
+
+
+class AsyncDB:
+    """연결 풀과 전용 스레드 풀로 쿼리를 실행하는 비동기 인터페이스."""
+
+    def __init__(self, pool, backend, workers=8):
+        self.pool = pool
+        self.backend = backend
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='async-db')
+
+    def _run(self, sql, params, fetch, replicas):
+        """(스레드 풀에서 실행) 연결을 빌려 쿼리 하나를 실행하고 반납합니다. replicas가 있으면 복제본에서 읽습니다."""
+        started = time.perf_counter()
+        acquired = replicas.acquire() if replicas is not None else None
+        if acquired is not None:
+            replica, conn = acquired
+            release = lambda discard: replicas.release(replica, conn, discard=discard)
+        else:
+            conn = self.pool.acquire()
+            release = lambda discard: self.pool.release(conn, discard=discard)
+        acquired_at = time.perf_counter()
+        discard = False
+        try:
+            with conn.unwrapped_cursor() as cursor:
+                cursor.execute(sql, params)
+                if fetch == 'one':
+                    result = cursor.fetchone()
+                elif fetch == 'all':
+                    result = cursor.fetchall()
+                else:
+                    result = cursor.rowcount
+                rowcount = cursor.rowcount
+            if fetch is None:
+                conn.commit()
+        except self.backend.disconnect_errors:
+            discard = True
+            raise
+        finally:
+            release(discard)
+        return result, rowcount, acquired_at - started, time.perf_counter() - acquired_at
+
+    async def run(self, sql, params=None, fetch='all'):
+        """fetch: 'one' | 'all' | None(쓰기: 주 DB에서 실행하고 커밋 후 영향받은 행 수 반환)"""
+        # 요청 정보(메서드, 세션)는 이벤트 루프 쪽에서만 볼 수 있으므로 여기서 복제본 사용 여부를 정합니다.
+        replicas = get_replicas() if fetch is not None and reads_from_replica() else None
+        loop = asyncio.get_running_loop()
+        result, rowcount, acquire_time, query_time = await loop.run_in_executor(
+            self._executor, self._run, sql, params, fetch, replicas)
+        record_acquire(acquire_time)
+        record_query(sql, params, query_time, rowcount)
+        return result
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def get_async_db(app=None):
+    """앱의 AsyncDB를 반환합니다. 처음 호출 시 생성합니다."""
+    app = app or current_app._get_current_object()
+    async_db = app.extensions.get('async_db')
+    if async_db is None:
+        with _create_lock:
+            async_db = app.extensions.get('async_db')
+            if async_db is None:
+                async_db = AsyncDB(get_pool(app), get_backend(app), workers=app.config.get('DB_ASYNC_WORKERS', 8))
+                app.extensions['async_db'] = async_db
+    return async_db
+
+
+async def fetch_one(sql, params=None):
+    """첫 행(사전) 또는 None."""
+    return await get_async_db().run(sql, params, fetch='one')
+
+
+async def fetch_all(sql, params=None):
+    """모든 행(사전 목록)."""
+    return await get_async_db().run(sql, params, fetch='all')
+
+
+async def execute(sql, params=None):
+    """INSERT/UPDATE/DELETE를 실행하고 커밋합니다. 영향받은 행 수를 반환합니다."""
+    return await get_async_db().run(sql, params, fetch=None)
+
+
+def init_async_db(app):
+    """app.extensions에 자리를 만듭니다. AsyncDB는 첫 비동기 쿼리 때 생성됩니다. (app.py에서 한 번 호출)"""
+    app.extensions.setdefault('async_db', None)
@@ -0,0 +1,88 @@
+import inspect
+from functools import wraps
+
+from flask import current_app, flash, g, redirect, session, url_for
+
+from common.cache import MemoryCache
+from common.utils import get_db_connection
+
+# 로그인 확인과 현재 사용자 로딩.
+# 세션에는 loggedin/id만 두고, 사용자 정보(username 등)는 요청마다 한 번 프로세스 내 TTL 캐시에서 읽어
+# g.user에 둡니다. 캐시가 차 있으면 DB 조회 없이 처리됩니다.
+
+
+def _user_cache():
+    return current_app.extensions['user_cache']
+
+
+def _load_user(user_id):
+    conn = get_db_connection()
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT id, username FROM users WHERE id = %s", (user_id,))
+        return cursor.fetchone()
+
+
+def current_user():
+    """현재 로그인한 사용자({'id', 'username'}) 또는 None. 요청당 한 번만 조회합니다."""
+    if 'user' in g:
+        return g.user
+    user = None
+    user_id = session.get('id') if session.get('loggedin') else None
+    if user_id is not None:
+        user = _user_cache().get_or_set(f"user:{user_id}", lambda: _load_user(user_id))
+        if user is None:
+            session.clear() # 삭제된 사용자의 세션
+    g.user = user
+    return user
+
+
+def invalidate_user(user_id):
+    """사용자 정보가 바뀌었을 때 캐시를 비웁니다. (다른 mod_wsgi 프로세스는 USER_CACHE_TTL 뒤에 반영)"""
+    _user_cache().delete(f"user:{user_id}")
+
+
+def login_user(user):
+    """로그인 처리. 서버 측 세션이면 세션 id를 새로 발급합니다."""
+    session.clear()
+    if hasattr(session, 'regenerate'):
+        session.regenerate()
+    session['loggedin'] = True
+    session['id'] = user['id']
+    g.user = {'id': user['id'], 'username': user['username']}
+
+
+def logout_user():
+    session.clear()
+    if hasattr(session, 'regenerate'):
+        session.regenerate() # 로그아웃 후 남기는 flash 메시지는 새 세션 id로 저장
+    g.user = None
+
+
+def login_required(message='이 페이지에 접근하려면 로그인해야 합니다.'):
+    """로그인하지 않았으면 message를 flash하고 메인 페이지로 리디렉션하는 데코레이터. (async def 뷰에도 사용 가능)"""
+    def decorator(view):
+        if inspect.iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapped_async(*args, **kwargs):
+                if current_user() is None:
+                    flash(message, 'error')
+                    return redirect(url_for('auth.index'))
+                return await view(*args, **kwargs)
+            return wrapped_async
+
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if current_user() is None:
+                flash(message, 'error')
+                return redirect(url_for('auth.index')) # auth 블루프린트의 index로 리디렉션
+            return view(*args, **kwargs)
+        return wrapped
+    return decorator
+
+
+def init_auth(app):
+    """사용자 캐시를 만듭니다. (app.py에서 한 번 호출)"""
+    app.extensions['user_cache'] = MemoryCache(
+        max_entries=app.config.get('USER_CACHE_MAX_ENTRIES', 10000),
+        default_ttl=app.config.get('USER_CACHE_TTL', 60),
+    )
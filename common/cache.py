@@ -0,0 +1,307 @@
+import hashlib
+import hmac
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from flask import current_app
+
+from common.private_dir import ensure_private_dir
+
+logger = logging.getLogger(__name__)
+
+
+class BaseCache(ABC):
+    """
+    캐시 백엔드 공통 인터페이스. get/set/delete와 적중/미스 카운터를 제공합니다.
+    ttl이 None이면 만료되지 않습니다. (값으로 None은 저장할 수 없습니다.)
+    백엔드는 _get/_set/_delete/clear를 구현합니다. (빠뜨리면 인스턴스를 만들 때 TypeError)
+    """
+
+    def __init__(self, default_ttl=300):
+        self.default_ttl = default_ttl
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.deletes = 0
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _expires_at(self, ttl):
+        ttl = self.default_ttl if ttl is None else ttl
+        return None if not ttl else time.time() + ttl
+
+    def get(self, key):
+        value = self._get(key)
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, key, value, ttl=None):
+        self._count('sets')
+        self._set(key, value, self._expires_at(ttl))
+
+    def delete(self, *keys):
+        for key in keys:
+            self._count('deletes')
+            self._delete(key)
+
+    def get_or_set(self, key, factory, ttl=None):
+        """캐시에 없으면 factory()로 만들어 저장한 뒤 반환합니다."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            if value is not None:
+                self.set(key, value, ttl)
+        return value
+
+    def stats(self):
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': type(self).__name__,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'sets': self.sets,
+                'deletes': self.deletes,
+            }
+
+    @abstractmethod
+    def _get(self, key):
+        """저장된 값 또는 None(없거나 만료됨)"""
+
+    @abstractmethod
+    def _set(self, key, value, expires_at):
+        """expires_at(epoch 초)이 None이면 만료되지 않습니다."""
+
+    @abstractmethod
+    def _delete(self, key):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class NullCache(BaseCache):
+    """캐시를 끈 상태. 항상 미스입니다."""
+
+    def _get(self, key):
+        return None
+
+    def _set(self, key, value, expires_at):
+        pass
+
+    def _delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+
+class MemoryCache(BaseCache):
+    """프로세스 내 LRU + TTL 캐시. mod_wsgi 프로세스끼리는 공유되지 않습니다."""
+
+    def __init__(self, max_entries=2048, default_ttl=300):
+        super().__init__(default_ttl)
+        self.max_entries = max_entries
+        self._data = OrderedDict() # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def _set(self, key, value, expires_at):
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def _delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        stats = super().stats()
+        stats['entries'] = len(self._data)
+        return stats
+
+
+class FileCache(BaseCache):
+    """
+    디렉터리 기반 캐시. 같은 서버의 여러 mod_wsgi 데몬 프로세스가 공유할 수 있어
+    한 프로세스에서 무효화하면 다른 프로세스에도 즉시 반영됩니다.
+    각 항목은 파일 하나(HMAC-SHA256 서명 32바이트 + pickle)이며, 임시 파일에 쓴 뒤 os.replace로 원자적으로 교체합니다.
+    서명이 맞지 않는 파일은 unpickle하지 않고 지웁니다. (디렉터리에 쓸 수 있어도 코드를 실행시킬 수 없음)
+    파일 수정 시각(mtime)을 만료 시각으로 두고, purge_interval초마다 쓰기 도중에 만료된 파일을 지우고
+    max_entries를 넘으면 만료가 가까운 순서로 지웁니다.
+    """
+
+    _SIG_SIZE = hashlib.sha256().digest_size
+    _NO_EXPIRY = 10 * 365 * 86400 # 만료 없는 항목의 mtime (지금부터 10년 뒤)
+
+    def __init__(self, directory, secret_key, default_ttl=300, max_entries=10000, purge_interval=60):
+        super().__init__(default_ttl)
+        self.directory = ensure_private_dir(directory)
+        self._key = hmac.new(secret_key.encode('utf-8'), b'file-cache', hashlib.sha256).digest()
+        self.max_entries = max_entries
+        self.purge_interval = purge_interval
+        self._next_purge = time.monotonic() + purge_interval
+        self._purge_lock = threading.Lock()
+        self.purged = 0
+        self.rejected = 0
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.cache')
+
+    def _sign(self, data):
+        return hmac.new(self._key, data, hashlib.sha256).digest()
+
+    def _get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return None
+        signature, data = raw[:self._SIG_SIZE], raw[self._SIG_SIZE:]
+        if not hmac.compare_digest(signature, self._sign(data)):
+            # 다른 SECRET_KEY로 쓴 파일이거나 누군가 바꿔 넣은 파일
+            self._count('rejected')
+            self._delete(key)
+            return None
+        try:
+            expires_at, value = pickle.loads(data)
+        except (EOFError, pickle.UnpicklingError):
+            return None
+        if expires_at is not None and expires_at < time.time():
+            self._delete(key)
+            return None
+        return value
+
+    def _set(self, key, value, expires_at):
+        data = pickle.dumps((expires_at, value), protocol=pickle.HIGHEST_PROTOCOL)
+        mtime = expires_at if expires_at is not None else time.time() + self._NO_EXPIRY
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._sign(data))
+                f.write(data)
+            os.utime(tmp_path, (mtime, mtime))
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        if time.monotonic() >= self._next_purge:
+            self.purge()
+
+    def _delete(self, key):
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+    def purge(self):
+        """만료된 항목을 지우고, max_entries를 넘으면 만료가 가까운 항목부터 지웁니다. 지운 개수를 반환합니다."""
+        if not self._purge_lock.acquire(blocking=False):
+            return 0 # 다른 스레드가 정리 중
+        try:
+            self._next_purge = time.monotonic() + self.purge_interval
+            now = time.time()
+            live = []
+            removed = 0
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(('.cache', '.tmp')):
+                        continue
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except OSError:
+                        continue
+                    # .tmp는 쓰기 도중 죽은 프로세스가 남긴 파일 (1분 이상 지난 것만)
+                    expired = mtime < now if entry.name.endswith('.cache') else mtime < now - 60
+                    if expired:
+                        removed += self._unlink(entry.path)
+                    elif entry.name.endswith('.cache'):
+                        live.append((mtime, entry.path))
+            if len(live) > self.max_entries:
+                live.sort()
+                for _, path in live[:len(live) - self.max_entries]:
+                    removed += self._unlink(path)
+            with self._stats_lock:
+                self.purged += removed
+            return removed
+        finally:
+            self._purge_lock.release()
+
+    def _unlink(self, path):
+        try:
+            os.unlink(path)
+            return 1
+        except OSError:
+            return 0
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.cache'):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def stats(self):
+        stats = super().stats()
+        stats['purged'] = self.purged
+        stats['rejected'] = self.rejected
+        return stats
+
+
+def create_cache(config, instance_path):
+    """설정(CACHE_BACKEND 등)에 맞는 캐시 백엔드를 만듭니다."""
+    backend = config.get('CACHE_BACKEND', 'memory')
+    ttl = config.get('CACHE_DEFAULT_TTL', 300)
+    if backend == 'memory':
+        return MemoryCache(max_entries=config.get('CACHE_MAX_ENTRIES', 2048), default_ttl=ttl)
+    if backend == 'file':
+        directory = config.get('CACHE_DIR') or os.path.join(instance_path, 'cache')
+        return FileCache(directory, config['SECRET_KEY'], default_ttl=ttl,
+                         max_entries=config.get('CACHE_FILE_MAX_ENTRIES', 10000),
+                         purge_interval=config.get('CACHE_PURGE_INTERVAL', 60))
+    if backend == 'null':
+        return NullCache(default_ttl=ttl)
+    raise RuntimeError(f"알 수 없는 CACHE_BACKEND 설정입니다: {backend}")
+
+
+def init_cache(app):
+    """앱에 캐시 백엔드를 생성해 등록합니다. (app.py에서 한 번 호출)"""
+    app.extensions['cache'] = create_cache(app.config, app.instance_path)
+
+
+def get_cache():
+    """현재 앱의 캐시 백엔드를 반환합니다."""
+    return current_app.extensions['cache']
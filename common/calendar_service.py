@@ -0,0 +1,69 @@
+import calendar
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+
+# 일요일부터 시작하는 달력 (diary, todos 재조정 화면 공통)
+FIRST_WEEKDAY = 6
+MIN_YEAR, MAX_YEAR = 1900, 2100
+
+_calendar = calendar.Calendar(firstweekday=FIRST_WEEKDAY)
+
+# 템플릿에 넘기는 월 달력 정보. weeks는 monthdayscalendar와 같은 형태(빈 칸은 0)이며
+# 캐시된 객체를 여러 요청이 공유하므로 튜플로 고정합니다.
+MonthView = namedtuple('MonthView', [
+    'year', 'month', 'month_name', 'weeks',
+    'prev_year', 'prev_month', 'next_year', 'next_month',
+])
+
+
+def is_valid_month(year, month):
+    return 1 <= month <= 12 and MIN_YEAR <= year <= MAX_YEAR
+
+
+def shift_month(year, month, delta):
+    """(year, month)에서 delta개월 이동한 (year, month)를 반환합니다."""
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def month_range(year, month):
+    """해당 월의 반열린 구간 [첫날, 다음 달 첫날)을 date로 반환합니다."""
+    next_year, next_month = shift_month(year, month, 1)
+    return date(year, month, 1), date(next_year, next_month, 1)
+
+
+@lru_cache(maxsize=256)
+def month_view(year, month):
+    """월 달력 격자와 이전/다음 달 정보를 계산해 캐시합니다."""
+    prev_year, prev_month = shift_month(year, month, -1)
+    next_year, next_month = shift_month(year, month, 1)
+    weeks = tuple(tuple(week) for week in _calendar.monthdayscalendar(year, month))
+    return MonthView(
+        year=year,
+        month=month,
+        month_name=calendar.month_name[month], # datetime.strftime('%B')와 같은 로케일 월 이름
+        weeks=weeks,
+        prev_year=prev_year,
+        prev_month=prev_month,
+        next_year=next_year,
+        next_month=next_month,
+    )
+
+
+
+@lru_cache(maxsize=64)
+def month_views(year, month, count):
+    """(year, month)부터 count개월의 MonthView 튜플을 반환합니다. (예: 분기 보기는 count=3)
+    각 달은 month_view 캐시를 그대로 쓰므로 범위가 겹쳐도 격자를 다시 계산하지 않습니다."""
+    return tuple(month_view(*shift_month(year, month, offset)) for offset in range(count))
+
+
+def quarter_views(year, quarter):
+    """해당 연도 분기(1~4)의 세 달 MonthView 튜플을 반환합니다."""
+    return month_views(year, (quarter - 1) * 3 + 1, 3)
+
+
+def cache_info():
+    """월 달력 캐시 적중/미스 통계를 반환합니다."""
+    return month_view.cache_info()
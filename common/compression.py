@@ -0,0 +1,303 @@
+import gzip
+import mimetypes
+import os
+import re
+import threading
+import zlib
+
+try:
+    import brotli # 선택 의존성 (pip install brotli). 없으면 gzip만 사용합니다.
+except ImportError:
+    brotli = None
+
+# 응답 압축 WSGI 미들웨어 (COMPRESSION 설정)
+# - 클라이언트의 Accept-Encoding에 따라 br(설치된 경우) 또는 gzip으로 압축합니다.
+# - COMPRESSION_TYPES에 있는 Content-Type이고 COMPRESSION_MIN_SIZE 이상인 응답만 압축합니다.
+#   이미 Content-Encoding이 있거나 Cache-Control: no-transform이면 건드리지 않습니다.
+# - Content-Length가 없는 스트리밍 응답은 청크마다 압축해 흘려보냅니다. (버퍼링하지 않음)
+# - 압축한 응답의 ETag에는 '-gzip'/'-br'을 붙이고, 요청의 If-None-Match에서는 떼어 앱에 넘기므로
+#   앱의 ETag/304 처리는 그대로 동작합니다.
+# - 'flask assets build'로 미리 압축해 둔 static/dist 파일은 압축하지 않고 .br/.gz 파일을 그대로 보냅니다.
+
+DEFAULT_TYPES = (
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript', 'application/javascript',
+    'application/json', 'application/x-ndjson', 'image/svg+xml',
+)
+
+_SKIP_STATUS = {204, 206, 304}
+_ETAG_SUFFIX_RE = re.compile(r'-(gzip|br)"')
+
+
+def _parse_accept_encoding(header):
+    """Accept-Encoding을 {인코딩: q} 사전으로 바꿉니다."""
+    accepted = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(header):
+    """압축에 쓸 인코딩('br' | 'gzip') 또는 None."""
+    if not header:
+        return None
+    accepted = _parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    if brotli is not None and accepted.get('br', wildcard) > 0:
+        return 'br'
+    if accepted.get('gzip', accepted.get('x-gzip', wildcard)) > 0:
+        return 'gzip'
+    return None
+
+
+class _Encoder:
+    """인코딩별 증분 압축기. compress()는 지금까지 받은 데이터를 내보낼 수 있게 flush합니다."""
+
+    def __init__(self, encoding, level, brotli_quality):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31) # wbits=31: gzip 헤더/트레일러 포함
+
+    def compress(self, data):
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress_bytes(data, encoding, level=6, brotli_quality=4):
+    """한 번에 압축합니다. (버퍼링된 응답, 정적 파일 사전 압축)"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _header(headers, name):
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _replace_headers(headers, updates, remove=()):
+    """headers(리스트)에서 updates의 이름과 remove를 지우고 updates를 덧붙인 새 리스트."""
+    drop = {name.lower() for name in updates} | {name.lower() for name in remove}
+    return [(k, v) for k, v in headers if k.lower() not in drop] + list(updates.items())
+
+
+def _add_vary(headers):
+    vary = _header(headers, 'Vary')
+    if vary is None:
+        return headers + [('Vary', 'Accept-Encoding')]
+    if 'accept-encoding' in vary.lower() or vary.strip() == '*':
+        return headers
+    return _replace_headers(headers, {'Vary': f"{vary}, Accept-Encoding"})
+
+
+def _suffix_etag(headers, encoding):
+    etag = _header(headers, 'ETag')
+    if not etag or not etag.endswith('"'):
+        return headers
+    return _replace_headers(headers, {'ETag': f'{etag[:-1]}-{encoding}"'})
+
+
+class CompressionMiddleware:
+    """WSGI 앱을 감싸 응답을 압축합니다."""
+
+    def __init__(self, app, min_size=500, level=6, brotli_quality=4, mimetypes=DEFAULT_TYPES,
+                 precompressed=None, static_max_age=31536000):
+        self.app = app
+        self.min_size = min_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.mimetypes = frozenset(mimetypes)
+        # (URL 접두어, 디렉터리): 이 아래 파일은 미리 만든 .br/.gz를 그대로 보냅니다.
+        self.precompressed = precompressed
+        self.static_max_age = static_max_age
+        self._files = {} # 미리 압축한 파일 경로 -> bytes (빌드 결과는 이름에 해시가 있어 바뀌지 않음)
+        self._files_lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        encoding = choose_encoding(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return self._passthrough(environ, start_response)
+
+        if self.precompressed and environ.get('REQUEST_METHOD') in ('GET', 'HEAD'):
+            served = self._serve_precompressed(environ, start_response, encoding)
+            if served is not None:
+                return served
+
+        # 클라이언트가 압축된 표현의 ETag로 재검증하면 접미사를 떼어 앱의 ETag와 비교되게 합니다.
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match and _ETAG_SUFFIX_RE.search(if_none_match):
+            environ['HTTP_IF_NONE_MATCH'] = _ETAG_SUFFIX_RE.sub('"', if_none_match)
+
+        captured = {}
+        written = []
+
+        def capture_start_response(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['headers'] = headers
+            captured['exc_info'] = exc_info
+            return written.append # 구식 write() 호출도 본문 앞부분으로 모읍니다.
+
+        app_iter = self.app(environ, capture_start_response)
+        status, headers = captured['status'], captured['headers']
+        if written:
+            app_iter = _chain(written, app_iter)
+
+        code = int(status.split(' ', 1)[0])
+        if code == 304:
+            if if_none_match and f'-{encoding}"' in if_none_match:
+                headers = _suffix_etag(headers, encoding)
+            start_response(status, headers, captured['exc_info'])
+            return app_iter
+
+        if not self._should_compress(code, headers, environ):
+            if self._is_compressible_type(headers):
+                headers = _add_vary(headers)
+            start_response(status, headers, captured['exc_info'])
+            return app_iter
+
+        length = _header(headers, 'Content-Length')
+        if length is not None:
+            if int(length) < self.min_size:
+                start_response(status, _add_vary(headers), captured['exc_info'])
+                return app_iter
+            return self._compress_buffered(app_iter, status, headers, encoding, start_response, captured['exc_info'])
+        return self._compress_streaming(app_iter, status, headers, encoding, start_response, captured['exc_info'])
+
+    def _passthrough(self, environ, start_response):
+        def add_vary_start_response(status, headers, exc_info=None):
+            if self._is_compressible_type(headers):
+                headers = _add_vary(headers)
+            return start_response(status, headers, exc_info)
+        return self.app(environ, add_vary_start_response)
+
+    def _is_compressible_type(self, headers):
+        content_type = _header(headers, 'Content-Type') or ''
+        return content_type.split(';', 1)[0].strip().lower() in self.mimetypes
+
+    def _should_compress(self, code, headers, environ):
+        if code in _SKIP_STATUS or code < 200 or environ.get('REQUEST_METHOD') == 'HEAD':
+            return False
+        if _header(headers, 'Content-Encoding'):
+            return False
+        if 'no-transform' in (_header(headers, 'Cache-Control') or '').lower():
+            return False
+        return self._is_compressible_type(headers)
+
+    def _compress_buffered(self, app_iter, status, headers, encoding, start_response, exc_info):
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        compressed = compress_bytes(body, encoding, self.level, self.brotli_quality)
+        headers = _replace_headers(_suffix_etag(_add_vary(headers), encoding), {
+            'Content-Encoding': encoding,
+            'Content-Length': str(len(compressed)),
+        })
+        start_response(status, headers, exc_info)
+        return [compressed]
+
+    def _compress_streaming(self, app_iter, status, headers, encoding, start_response, exc_info):
+        headers = _replace_headers(_suffix_etag(_add_vary(headers), encoding),
+                                   {'Content-Encoding': encoding}, remove=('Content-Length',))
+        start_response(status, headers, exc_info)
+        encoder = _Encoder(encoding, self.level, self.brotli_quality)
+
+        def generate():
+            try:
+                for chunk in app_iter:
+                    if chunk:
+                        data = encoder.compress(chunk)
+                        if data:
+                            yield data
+                yield encoder.finish()
+            finally:
+                if hasattr(app_iter, 'close'):
+                    app_iter.close()
+        return generate()
+
+    def _serve_precompressed(self, environ, start_response, encoding):
+        prefix, directory = self.precompressed
+        path_info = environ.get('PATH_INFO', '')
+        if not path_info.startswith(prefix):
+            return None
+        relative = path_info[len(prefix):]
+        if not relative or '..' in relative.split('/'):
+            return None
+        source = os.path.join(directory, *relative.split('/'))
+        extension = '.br' if encoding == 'br' else '.gz'
+        data = self._read_precompressed(source + extension)
+        if data is None:
+            return None
+        content_type, _ = mimetypes.guess_type(source)
+        if content_type and content_type.startswith('text/'):
+            content_type += '; charset=utf-8'
+        headers = [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Content-Encoding', encoding),
+            ('Content-Length', str(len(data))),
+            ('Cache-Control', f"public, max-age={self.static_max_age}, immutable"),
+            ('Vary', 'Accept-Encoding'),
+        ]
+        start_response('200 OK', headers)
+        return [b''] if environ['REQUEST_METHOD'] == 'HEAD' else [data]
+
+    def _read_precompressed(self, path):
+        if path in self._files:
+            return self._files[path]
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = None
+        with self._files_lock:
+            self._files[path] = data
+        return data
+
+
+def _chain(first, rest):
+    yield from first
+    try:
+        yield from rest
+    finally:
+        if hasattr(rest, 'close'):
+            rest.close()
+
+
+def init_compression(app):
+    """COMPRESSION이 켜져 있으면 app.wsgi_app을 압축 미들웨어로 감쌉니다. (app.py에서 한 번 호출)"""
+    if not app.config.get('COMPRESSION', True):
+        return
+    types = app.config.get('COMPRESSION_TYPES') or DEFAULT_TYPES
+    precompressed = None
+    if app.static_folder:
+        precompressed = (f"{app.static_url_path}/dist/", os.path.join(app.static_folder, 'dist'))
+    app.wsgi_app = CompressionMiddleware(
+        app.wsgi_app,
+        min_size=app.config.get('COMPRESSION_MIN_SIZE', 500),
+        level=app.config.get('COMPRESSION_LEVEL', 6),
+        brotli_quality=app.config.get('COMPRESSION_BROTLI_QUALITY', 4),
+        mimetypes=types,
+        precompressed=precompressed,
+        static_max_age=app.config.get('STATIC_MAX_AGE', 31536000),
+    )
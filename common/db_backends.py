@@ -0,0 +1,298 @@
+import copy
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+
+import pymysql
+import pymysql.cursors
+from pymysql.constants import CLIENT
+
+# DB 백엔드 (DB_BACKEND 설정: 'mysql' | 'sqlite')
+# 라우트의 SQL은 pymysql 문법(%s 플레이스홀더, %% 이스케이프)을 그대로 쓰고, 가능한 한 양쪽에서 동작하는 함수
+# (SUBSTR 등)를 사용합니다. SQLite 백엔드는 플레이스홀더를 바꾸고 DATE_FORMAT을 같은 이름의 함수로 등록합니다.
+# FULLTEXT, EXPLAIN 형식, 마이그레이션 파일처럼 흉내 낼 수 없는 차이는 백엔드 속성으로 드러냅니다.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class MySQLBackend:
+    """pymysql + DictCursor. 운영 기본값."""
+
+    name = 'mysql'
+    supports_fulltext = True
+    migrations_dir = os.path.join(BASE_DIR, 'migrations')
+    Error = pymysql.Error
+    # 연결 자체가 끊어진 오류. 이런 연결은 풀에 돌려보내지 않고 버립니다.
+    disconnect_errors = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
+
+    # 같은 이름의 인덱스/컬럼이 이미 있을 때의 오류 코드. 마이그레이션 재실행 시 건너뜁니다.
+    _ALREADY_APPLIED_ERRORS = {
+        1060, # ER_DUP_FIELDNAME
+        1061, # ER_DUP_KEYNAME
+    }
+
+    def __init__(self, config):
+        db_host = config.get('DB_HOST')
+        db_user = config.get('DB_USER')
+        db_password = config.get('DB_PASSWORD')
+        db_name = config.get('DB_NAME')
+
+        # 필수 DB 환경 변수가 없는 경우 RuntimeError 발생 (엄격한 체크)
+        if not all([db_host, db_user, db_password, db_name]):
+            raise RuntimeError("데이터베이스 연결 환경 변수(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME)가 모두 설정되지 않았습니다. Apache 설정(flask_auth.conf) 또는 config.py를 확인해주세요.")
+
+        self.connect_kwargs = {
+            'host': db_host,
+            'port': int(config.get('DB_PORT') or 3306),
+            'user': db_user,
+            'password': db_password,
+            'db': db_name,
+            'charset': 'utf8mb4',
+            'cursorclass': pymysql.cursors.DictCursor,
+            # UPDATE의 rowcount가 '변경된 행'이 아닌 '일치한 행' 수가 되도록 합니다.
+            # (같은 값으로 UPDATE 해도 소유권 확인이 성공으로 보고되어야 함)
+            'client_flag': CLIENT.FOUND_ROWS,
+            'connect_timeout': config.get('DB_CONNECT_TIMEOUT', 10),
+        }
+
+    def connect(self):
+        return pymysql.connect(**self.connect_kwargs)
+
+    def ping(self, raw):
+        raw.ping(reconnect=False)
+
+    def is_already_applied(self, exc):
+        return isinstance(exc, pymysql.err.OperationalError) and bool(exc.args) \
+            and exc.args[0] in self._ALREADY_APPLIED_ERRORS
+
+    # UNIQUE 인덱스 위반 (ER_DUP_ENTRY)
+    def is_duplicate_key(self, exc):
+        return isinstance(exc, pymysql.err.IntegrityError) and bool(exc.args) and exc.args[0] == 1062
+
+    # 중복 키 행을 오류 없이 건너뛰는 INSERT
+    insert_ignore = 'INSERT IGNORE'
+
+    # 결과를 클라이언트 메모리에 모두 받지 않고 한 행씩 읽는 커서 (대량 내보내기, common/user_data.py)
+    server_side_cursor = pymysql.cursors.SSDictCursor
+
+    supports_replicas = True
+
+    def for_host(self, host, port=None, connect_timeout=None):
+        """같은 계정/DB로 다른 호스트(읽기 복제본)에 접속하는 백엔드."""
+        replica = copy.copy(self)
+        replica.connect_kwargs = dict(self.connect_kwargs, host=host, port=port or self.connect_kwargs['port'])
+        if connect_timeout is not None:
+            replica.connect_kwargs['connect_timeout'] = connect_timeout
+        return replica
+
+    def replica_lag(self, cursor):
+        """복제 지연(초). 복제가 멈췄으면 None. 복제본이 아니면(상태 행 없음) LookupError."""
+        try:
+            cursor.execute("SHOW REPLICA STATUS")
+        except pymysql.err.ProgrammingError: # MySQL 8.0.22 미만, MariaDB 10.5 미만
+            cursor.execute("SHOW SLAVE STATUS")
+        row = cursor.fetchone()
+        if not row:
+            raise LookupError("복제 상태가 없습니다. (복제본이 아닌 호스트)")
+        return row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+
+
+# --- SQLite ---
+
+_PARAM_RE = re.compile(r"%\((\w+)\)s|%s|%%")
+
+# DATE_FORMAT에서 쓰는 MySQL 지정자 -> strftime 지정자
+_MYSQL_DATE_FORMAT = {'%Y': '%Y', '%m': '%m', '%d': '%d', '%H': '%H', '%i': '%M', '%s': '%S', '%%': '%'}
+_DATE_FORMAT_RE = re.compile(r"%.")
+
+
+@lru_cache(maxsize=1024)
+def _translate(query):
+    """pymysql 스타일 쿼리(%s, %(name)s, %%)를 sqlite3 스타일(?, :name, %)로 바꿉니다. 같은 문자열은 캐시됩니다."""
+    def replace(match):
+        if match.group(0) == '%%':
+            return '%'
+        return f":{match.group(1)}" if match.group(1) else '?'
+    return _PARAM_RE.sub(replace, query)
+
+
+def _adapt_datetime(value):
+    # MySQL DATETIME과 같은 'YYYY-MM-DD HH:MM:SS' 형식 (마이크로초 없음)
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _convert_datetime(raw):
+    text = raw.decode()
+    return datetime.fromisoformat(text) if text else None
+
+
+def _convert_date(raw):
+    text = raw.decode()
+    return date.fromisoformat(text[:10]) if text else None
+
+
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter('DATETIME', _convert_datetime)
+sqlite3.register_converter('DATE', _convert_date)
+
+
+def _date_format(value, fmt):
+    if value is None:
+        return None
+    if isinstance(value, (bytes, str)):
+        value = value.decode() if isinstance(value, bytes) else value
+        value = datetime.fromisoformat(value) if len(value) > 10 else datetime.fromisoformat(value + ' 00:00:00')
+    return _DATE_FORMAT_RE.sub(lambda m: value.strftime(_MYSQL_DATE_FORMAT.get(m.group(0), m.group(0))), fmt)
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class SQLiteCursor:
+    """pymysql DictCursor처럼 쓸 수 있는 sqlite3 커서 래퍼. (with 문, %s 플레이스홀더 지원)"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, args=None):
+        # pymysql과 마찬가지로 인자가 없으면 %%를 이스케이프로 취급하지 않습니다.
+        if args is None:
+            return self._cursor.execute(query)
+        return self._cursor.execute(_translate(query), args)
+
+    def executemany(self, query, args):
+        return self._cursor.executemany(_translate(query), args)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size or self._cursor.arraysize)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SQLiteConnection:
+    """sqlite3 연결에 pymysql 연결과 같은 cursor()/commit()/rollback()/close() 인터페이스를 제공합니다."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def cursor(self, *args):
+        return SQLiteCursor(self._raw.cursor())
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def close(self):
+        self._raw.close()
+
+
+class SQLiteBackend:
+    """
+    단일 노드/로컬 개발/CI/벤치마크용 SQLite 백엔드.
+    WAL 모드로 읽기와 쓰기가 서로 막지 않으며, 연결마다 문장 캐시(cached_statements)를 크게 잡고
+    플레이스홀더 변환 결과도 캐시하므로 같은 쿼리는 준비된 문장을 재사용합니다.
+    """
+
+    name = 'sqlite'
+    supports_fulltext = False
+    migrations_dir = os.path.join(BASE_DIR, 'migrations', 'sqlite')
+    Error = sqlite3.Error
+    disconnect_errors = (sqlite3.ProgrammingError,) # 닫힌 연결 사용 등
+
+    def __init__(self, config):
+        self.path = config.get('SQLITE_PATH') or os.path.join(BASE_DIR, 'instance', 'app.db')
+        self.busy_timeout = config.get('SQLITE_BUSY_TIMEOUT', 5.0)
+        self.statement_cache = config.get('SQLITE_STATEMENT_CACHE', 256)
+        self.cache_size_kb = config.get('SQLITE_CACHE_SIZE_KB', 20000)
+        self.mmap_size = config.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024)
+        self._init_lock = threading.Lock()
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def connect(self):
+        raw = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False, # 풀이 한 번에 한 요청에만 빌려주므로 스레드 간 이동은 안전합니다.
+            cached_statements=self.statement_cache,
+        )
+        raw.row_factory = _dict_row
+        with self._init_lock:
+            # journal_mode=WAL은 DB 파일에 기록되므로 처음 한 번만 바뀌지만, 나머지는 연결별 설정입니다.
+            raw.execute("PRAGMA journal_mode=WAL")
+        raw.execute("PRAGMA synchronous=NORMAL") # WAL에서는 NORMAL도 충돌 시 일관성을 보장합니다.
+        raw.execute("PRAGMA foreign_keys=ON") # ON DELETE CASCADE 동작에 필요
+        raw.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        raw.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        raw.execute("PRAGMA temp_store=MEMORY")
+        # 라우트 SQL이 쓰는 MySQL 함수
+        raw.create_function('DATE_FORMAT', 2, _date_format, deterministic=True)
+        return SQLiteConnection(raw)
+
+    def ping(self, raw):
+        raw._raw.execute("SELECT 1")
+
+    def is_already_applied(self, exc):
+        message = str(exc).lower()
+        return isinstance(exc, sqlite3.OperationalError) and \
+            ('duplicate column name' in message or 'already exists' in message)
+
+    def is_duplicate_key(self, exc):
+        return isinstance(exc, sqlite3.IntegrityError) and 'UNIQUE constraint failed' in str(exc)
+
+    insert_ignore = 'INSERT OR IGNORE'
+
+    server_side_cursor = None # sqlite3 커서는 원래 한 단계(step)씩 읽습니다.
+
+    supports_replicas = False # 단일 파일 DB. DB_REPLICA_HOSTS는 무시됩니다.
+
+
+BACKENDS = {
+    'mysql': MySQLBackend,
+    'sqlite': SQLiteBackend,
+}
+
+
+def create_backend(config):
+    """설정(DB_BACKEND)에 맞는 백엔드를 만듭니다."""
+    name = config.get('DB_BACKEND', 'mysql')
+    try:
+        return BACKENDS[name](config)
+    except KeyError:
+        raise RuntimeError(f"알 수 없는 DB_BACKEND 설정입니다: {name}") from None
@@ -0,0 +1,225 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeoutError(RuntimeError):
+    """풀에서 제한 시간 안에 연결을 얻지 못했을 때 발생합니다."""
+
+
+class PooledConnection:
+    """
+    풀에서 빌려준 DB 연결(pymysql 또는 SQLite 래퍼)을 감싸는 프록시.
+    라우트 코드의 conn.close() 호출은 무시되고, 실제 반납은 요청 종료(teardown) 시 이루어집니다.
+    """
+
+    def __init__(self, raw_conn, created_at, cursor_wrapper=None):
+        self._raw = raw_conn
+        self._created_at = created_at
+        self._cursor_wrapper = cursor_wrapper
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._raw.cursor(*args, **kwargs)
+        return self._cursor_wrapper(cursor) if self._cursor_wrapper else cursor
+
+    def unwrapped_cursor(self, *args, **kwargs):
+        """계측 래퍼 없는 원래 커서. (요청 밖 스레드에서 실행하고 측정값은 호출한 쪽에서 기록할 때, common/async_db.py)"""
+        return self._raw.cursor(*args, **kwargs)
+
+    def close(self):
+        # 요청 단위로 재사용하므로 라우트의 close()는 아무 일도 하지 않습니다.
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class ConnectionPool:
+    """
+    크기 제한, 오버플로, 체크아웃 시 ping, 최대 수명 재활용, 대기 시간 제한을 지원하는
+    스레드 안전한 연결 풀. 실제 연결은 connect()로 열고, ping(raw)으로 살아 있는지 확인합니다.
+    (common/db_backends.py의 백엔드가 두 함수를 제공합니다.)
+    """
+
+    def __init__(self, connect, pool_size=5, max_overflow=10,
+                 timeout=10.0, recycle=3600, pre_ping=True, cursor_wrapper=None, ping=None):
+        self._connect_fn = connect
+        self._ping = ping or (lambda raw: raw.ping(reconnect=False))
+        self.cursor_wrapper = cursor_wrapper # 커서 계측용 래퍼 (common/instrumentation.py)
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._idle = deque() # (raw_conn, created_at)
+        self._cond = threading.Condition()
+        self._opened = 0 # 현재 열려 있는 물리 연결 수 (idle + in-use)
+        self._in_use = 0
+
+        # 모니터링용 통계
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._recycled = 0
+        self._ping_failures = 0
+        self._checkout_time_total = 0.0
+        self._checkout_time_max = 0.0
+
+    def _connect(self):
+        raw = self._connect_fn()
+        return raw, time.monotonic()
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def _is_expired(self, created_at):
+        return self.recycle is not None and self.recycle >= 0 and \
+            time.monotonic() - created_at > self.recycle
+
+    def acquire(self):
+        """풀에서 연결 하나를 빌립니다. 필요하면 새로 열거나, 한도에 도달하면 대기합니다."""
+        started = time.monotonic()
+        deadline = started + self.timeout if self.timeout is not None else None
+        waited = False
+
+        while True:
+            candidate = None
+            should_open = False
+            with self._cond:
+                while True:
+                    if self._idle:
+                        candidate = self._idle.pop() # LIFO: 최근에 쓴 연결을 우선 재사용
+                        self._in_use += 1
+                        break
+                    if self._opened < self.pool_size + self.max_overflow:
+                        self._opened += 1
+                        self._in_use += 1
+                        should_open = True
+                        break
+
+                    if not waited:
+                        waited = True
+                        self._waits += 1
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"DB 연결 풀에서 {self.timeout}초 안에 연결을 얻지 못했습니다. "
+                            f"(pool_size={self.pool_size}, max_overflow={self.max_overflow})"
+                        )
+                    self._cond.wait(remaining)
+
+            if should_open:
+                try:
+                    raw, created_at = self._connect()
+                except Exception:
+                    self._forget_slot()
+                    raise
+                return self._checked_out(raw, created_at, started)
+
+            raw, created_at = candidate
+            if self._is_expired(created_at):
+                self._discard(raw)
+                self._forget_slot(recycled=True)
+                continue
+            if self.pre_ping:
+                try:
+                    self._ping(raw)
+                except Exception:
+                    self._discard(raw)
+                    self._forget_slot(ping_failed=True)
+                    continue
+            return self._checked_out(raw, created_at, started)
+
+    def _forget_slot(self, recycled=False, ping_failed=False):
+        """체크아웃 도중 버려진 연결의 자리를 비우고 대기자를 깨웁니다."""
+        with self._cond:
+            self._opened -= 1
+            self._in_use -= 1
+            if recycled:
+                self._recycled += 1
+            if ping_failed:
+                self._ping_failures += 1
+            self._cond.notify()
+
+    def _checked_out(self, raw, created_at, started):
+        elapsed = time.monotonic() - started
+        with self._cond:
+            self._checkouts += 1
+            self._checkout_time_total += elapsed
+            if elapsed > self._checkout_time_max:
+                self._checkout_time_max = elapsed
+        return PooledConnection(raw, created_at, self.cursor_wrapper)
+
+    @property
+    def in_use(self):
+        """지금 빌려준 연결 수. (복제본 부하 분산용, common/replicas.py)"""
+        return self._in_use
+
+    def release(self, conn, discard=False):
+        """빌린 연결을 풀에 반납합니다. 끝나지 않은 트랜잭션은 롤백됩니다."""
+        raw, created_at = conn._raw, conn._created_at
+        if not discard:
+            try:
+                raw.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            keep = (not discard
+                    and not self._is_expired(created_at)
+                    and len(self._idle) < self.pool_size)
+            if keep:
+                self._idle.append((raw, created_at))
+            else:
+                self._opened -= 1
+                if not discard and self._is_expired(created_at):
+                    self._recycled += 1
+            self._cond.notify()
+
+        if not keep:
+            self._discard(raw)
+
+    def prefill(self, count):
+        """유휴 연결이 count개(최대 pool_size)가 되도록 미리 엽니다. 새로 연 연결 수를 반환합니다. (워커 예열용)"""
+        conns = []
+        try:
+            for _ in range(min(count, self.pool_size) - len(self._idle)):
+                conns.append(self.acquire())
+        finally:
+            for conn in conns:
+                self.release(conn)
+        return len(conns)
+
+    def dispose(self):
+        """유휴 연결을 모두 닫습니다. (사용 중인 연결은 반납 시 정리됩니다.)"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._opened -= len(idle)
+        for raw, _ in idle:
+            self._discard(raw)
+
+    def stats(self):
+        """모니터링용 풀 상태 스냅샷을 반환합니다."""
+        with self._cond:
+            avg = self._checkout_time_total / self._checkouts if self._checkouts else 0.0
+            return {
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'opened': self._opened,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'recycled': self._recycled,
+                'ping_failures': self._ping_failures,
+                'checkout_avg_ms': round(avg * 1000, 3),
+                'checkout_max_ms': round(self._checkout_time_max * 1000, 3),
+            }
@@ -0,0 +1,278 @@
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+
+from functools import wraps
+
+from flask import g, request, before_render_template, template_rendered, current_app, abort
+
+request_logger = logging.getLogger('request')
+
+# 요청 시간 히스토그램 버킷(초). Prometheus 기본값과 비슷하게 맞춥니다.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics:
+    """한 요청 동안 누적되는 측정값. g._metrics에 보관됩니다."""
+
+    __slots__ = ('started', 'sql_count', 'db_time', 'acquire_time', 'render_time', '_render_stack')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.db_time = 0.0
+        self.acquire_time = 0.0
+        self.render_time = 0.0
+        self._render_stack = []
+
+
+class MetricsRegistry:
+    """
+    엔드포인트별 누적 지표. 프로세스 단위이므로 mod_wsgi 데몬 프로세스가 여러 개면
+    각 프로세스가 자기 값을 내보냅니다. (/metrics 응답의 process 라벨로 구분)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {} # (endpoint, method) -> dict
+
+    def observe(self, endpoint, method, status, metrics, duration):
+        with self._lock:
+            entry = self._endpoints.get((endpoint, method))
+            if entry is None:
+                entry = {
+                    'count': 0, 'duration_sum': 0.0,
+                    'buckets': [0] * len(DURATION_BUCKETS),
+                    'sql_count': 0, 'db_time': 0.0, 'acquire_time': 0.0, 'render_time': 0.0,
+                    'status': {},
+                }
+                self._endpoints[(endpoint, method)] = entry
+            entry['count'] += 1
+            entry['duration_sum'] += duration
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    entry['buckets'][i] += 1
+            entry['sql_count'] += metrics.sql_count
+            entry['db_time'] += metrics.db_time
+            entry['acquire_time'] += metrics.acquire_time
+            entry['render_time'] += metrics.render_time
+            entry['status'][status] = entry['status'].get(status, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {key: {k: (dict(v) if isinstance(v, dict) else list(v) if isinstance(v, list) else v)
+                          for k, v in entry.items()}
+                    for key, entry in self._endpoints.items()}
+
+
+registry = MetricsRegistry()
+
+
+def current_metrics():
+    """현재 요청의 RequestMetrics. 요청 밖(CLI 등)에서는 None."""
+    try:
+        return g.get('_metrics')
+    except RuntimeError:
+        return None
+
+
+# --- DB 계측 훅 ---
+# record_query에 추가 리스너(예: 쿼리 프로파일러)를 붙일 수 있습니다.
+_query_listeners = []
+
+
+def add_query_listener(listener):
+    """listener(sql, params, duration, rowcount)를 모든 쿼리 실행 후 호출하도록 등록합니다."""
+    if listener not in _query_listeners:
+        _query_listeners.append(listener)
+
+
+def record_query(sql, params, duration, rowcount):
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.sql_count += 1
+        metrics.db_time += duration
+    for listener in _query_listeners:
+        listener(sql, params, duration, rowcount)
+
+
+def record_acquire(duration):
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.acquire_time += duration
+
+
+class InstrumentedCursor:
+    """execute/executemany 시간을 재는 커서 프록시. 나머지 속성은 원래 커서로 위임합니다."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, args)
+        finally:
+            record_query(query, args, time.perf_counter() - started, self._cursor.rowcount)
+
+    def executemany(self, query, args):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, args)
+        finally:
+            record_query(query, args, time.perf_counter() - started, self._cursor.rowcount)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._cursor.__exit__(*exc_info)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+# --- 모니터링 접근 제어 (MONITORING, MONITORING_TOKEN) ---
+
+_LOOPBACK = frozenset(('127.0.0.1', '::1'))
+
+
+def monitoring_allowed():
+    """현재 요청이 모니터링 정보(지표, Server-Timing)를 볼 수 있는지 반환합니다."""
+    config = current_app.config
+    if not config.get('MONITORING', True):
+        return False
+    token = config.get('MONITORING_TOKEN')
+    if token:
+        scheme, _, given = request.headers.get('Authorization', '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(given.strip().encode(), token.encode())
+    return request.remote_addr in _LOOPBACK
+
+
+def monitoring_required(view):
+    """모니터링 라우트용 데코레이터. 허용되지 않은 요청은 403."""
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if not monitoring_allowed():
+            abort(403)
+        return view(*args, **kwargs)
+    return wrapped
+
+
+# --- Flask 훅 ---
+
+def _before_request():
+    g._metrics = RequestMetrics()
+
+
+def _after_request(response):
+    metrics = g.pop('_metrics', None)
+    if metrics is None:
+        return response
+    duration = time.perf_counter() - metrics.started
+    endpoint = request.endpoint or 'unmatched'
+    registry.observe(endpoint, request.method, response.status_code, metrics, duration)
+
+    # 내부 처리 시간이 드러나므로 모니터링을 볼 수 있는 요청에만 붙입니다.
+    if monitoring_allowed():
+        response.headers['Server-Timing'] = (
+            f"app;dur={duration * 1000:.1f}, db;dur={metrics.db_time * 1000:.1f}, "
+            f"acquire;dur={metrics.acquire_time * 1000:.1f}, render;dur={metrics.render_time * 1000:.1f}"
+        )
+    if request_logger.isEnabledFor(logging.INFO):
+        request_logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'endpoint': endpoint,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'sql_count': metrics.sql_count,
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'acquire_ms': round(metrics.acquire_time * 1000, 2),
+            'render_ms': round(metrics.render_time * 1000, 2),
+        }, ensure_ascii=False))
+    return response
+
+
+def _on_before_render(sender, template, context, **extra):
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics._render_stack.append(time.perf_counter())
+
+
+def _on_rendered(sender, template, context, **extra):
+    metrics = current_metrics()
+    if metrics is not None and metrics._render_stack:
+        started = metrics._render_stack.pop()
+        # 중첩 렌더링은 바깥 렌더링 시간에 이미 포함되므로 가장 바깥 것만 더합니다.
+        if not metrics._render_stack:
+            metrics.render_time += time.perf_counter() - started
+
+
+def init_instrumentation(app):
+    """요청 타이밍/SQL 계측 훅을 등록합니다. (app.py에서 한 번 호출)"""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    before_render_template.connect(_on_before_render, app)
+    template_rendered.connect(_on_rendered, app)
+    # 요청별 구조화 로그는 REQUEST_LOG가 켜져 있을 때만 남깁니다.
+    request_logger.setLevel(logging.INFO if app.config.get('REQUEST_LOG') else logging.WARNING)
+
+
+# --- Prometheus 텍스트 형식 내보내기 ---
+
+def _labels(**labels):
+    return '{' + ','.join(f'{k}="{str(v)}"' for k, v in labels.items()) + '}'
+
+
+def render_prometheus(extra_gauges=None):
+    """
+    누적 지표를 Prometheus text exposition format(0.0.4)으로 만듭니다.
+    extra_gauges: {'metric_name': value} 형태의 추가 게이지 (예: 연결 풀 상태)
+    """
+    process = os.getpid()
+    lines = []
+    snapshot = registry.snapshot()
+
+    lines.append('# HELP app_request_duration_seconds Request wall time.')
+    lines.append('# TYPE app_request_duration_seconds histogram')
+    for (endpoint, method), entry in sorted(snapshot.items()):
+        base = dict(endpoint=endpoint, method=method, process=process)
+        for bound, count in zip(DURATION_BUCKETS, entry['buckets']):
+            lines.append(f"app_request_duration_seconds_bucket{_labels(**base, le=bound)} {count}")
+        lines.append(f"app_request_duration_seconds_bucket{_labels(**base, le='+Inf')} {entry['count']}")
+        lines.append(f"app_request_duration_seconds_sum{_labels(**base)} {entry['duration_sum']:.6f}")
+        lines.append(f"app_request_duration_seconds_count{_labels(**base)} {entry['count']}")
+
+    counters = (
+        ('app_sql_statements_total', 'SQL statements executed.', 'sql_count', '{}'),
+        ('app_db_seconds_total', 'Time spent executing SQL.', 'db_time', '{:.6f}'),
+        ('app_db_acquire_seconds_total', 'Time spent acquiring pooled connections.', 'acquire_time', '{:.6f}'),
+        ('app_template_render_seconds_total', 'Time spent rendering templates.', 'render_time', '{:.6f}'),
+    )
+    for name, help_text, key, fmt in counters:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for (endpoint, method), entry in sorted(snapshot.items()):
+            labels = _labels(endpoint=endpoint, method=method, process=process)
+            lines.append(f"{name}{labels} {fmt.format(entry[key])}")
+
+    lines.append('# HELP app_responses_total Responses by status code.')
+    lines.append('# TYPE app_responses_total counter')
+    for (endpoint, method), entry in sorted(snapshot.items()):
+        for status, count in sorted(entry['status'].items()):
+            labels = _labels(endpoint=endpoint, method=method, status=status, process=process)
+            lines.append(f"app_responses_total{labels} {count}")
+
+    for name, value in sorted((extra_gauges or {}).items()):
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f"{name}{_labels(process=process)} {value}")
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,41 @@
+import atexit
+import logging
+import logging.handlers
+import sys
+
+# 모든 모듈은 logging.getLogger(__name__)으로 로거를 얻습니다.
+# setup_logging()은 루트 로거에 버퍼링 핸들러를 한 번만 붙입니다.
+_LOG_FORMAT = '%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s'
+
+_buffer_handler = None
+
+
+def setup_logging(app):
+    """
+    LOG_LEVEL 이상 레코드를 메모리에 모았다가 한 번에 stderr(Apache error log)로 씁니다.
+    버퍼가 LOG_BUFFER_CAPACITY에 도달하거나, ERROR 이상이 기록되거나, 요청이 끝날 때 비웁니다.
+    """
+    global _buffer_handler
+    level = getattr(logging, str(app.config.get('LOG_LEVEL', 'INFO')).upper(), logging.INFO)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _buffer_handler is None:
+        target = logging.StreamHandler(sys.stderr)
+        target.setFormatter(logging.Formatter(_LOG_FORMAT))
+        _buffer_handler = logging.handlers.MemoryHandler(
+            capacity=app.config.get('LOG_BUFFER_CAPACITY', 200),
+            flushLevel=logging.ERROR,
+            target=target,
+        )
+        root.addHandler(_buffer_handler)
+        atexit.register(_buffer_handler.flush)
+
+    @app.teardown_request
+    def _flush_log_buffer(exc=None):
+        _buffer_handler.flush()
+
+
+def flush_logs():
+    if _buffer_handler is not None:
+        _buffer_handler.flush()
@@ -0,0 +1,333 @@
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from common.db_backends import MySQLBackend
+from common.utils import get_pool, get_backend
+
+# 프로젝트 루트의 migrations/ 디렉터리 (NNNN_이름.sql). SQLite용은 migrations/sqlite/
+MIGRATIONS_DIR = MySQLBackend.migrations_dir
+_FILENAME_RE = re.compile(r'^(\d+)_([\w-]+)\.sql$')
+
+# 블루프린트가 실제로 실행하는 주요 쿼리와 EXPLAIN용 예시 파라미터.
+# 라우트의 쿼리를 바꾸면 여기도 함께 맞춰 주세요.
+HOT_QUERIES = [
+    ('auth.login',
+     "SELECT id, username, password FROM users WHERE username = %s",
+     ('example',)),
+    ('board.board_list',
+     "SELECT b.id, b.title, SUBSTR(b.content, 1, 101) AS excerpt, b.created_at, b.updated_at, u.username "
+     "FROM board b JOIN users u ON b.user_id = u.id "
+     "WHERE (b.created_at < %s OR (b.created_at = %s AND b.id < %s)) "
+     "ORDER BY b.created_at DESC, b.id DESC LIMIT 21",
+     (datetime(2100, 1, 1), datetime(2100, 1, 1), 0)),
+    ('board.view_post (comments)',
+     "SELECT c.id, c.content, c.created_at, u.username, c.user_id "
+     "FROM comments c JOIN users u ON c.user_id = u.id WHERE c.board_id = %s "
+     "ORDER BY c.created_at ASC, c.id ASC LIMIT 51",
+     (1,)),
+    ('diary.diary_calendar',
+     "SELECT entry_date FROM diaries WHERE user_id = %s AND entry_date >= %s AND entry_date < %s ORDER BY entry_date",
+     (1, datetime(2024, 1, 1).date(), datetime(2024, 2, 1).date())),
+    ('diary.diary_entry',
+     "SELECT id, title, content, entry_date FROM diaries WHERE user_id = %s AND entry_date = %s",
+     (1, datetime(2024, 1, 1).date())),
+    ('todos.todos_list',
+     "SELECT id, task, due_date, status, created_at FROM todos WHERE user_id = %s ORDER BY created_at DESC, id DESC LIMIT 51",
+     (1,)),
+    ('todos.todos_list (status)',
+     "SELECT id, task, due_date, status, created_at FROM todos WHERE user_id = %s AND status = %s ORDER BY created_at DESC, id DESC LIMIT 51",
+     (1, '미완료')),
+    ('todos.todos_list (next page)',
+     "SELECT id, task, due_date, status, created_at FROM todos WHERE user_id = %s "
+     "AND (created_at < %s OR (created_at = %s AND id < %s)) ORDER BY created_at DESC, id DESC LIMIT 51",
+     (1, datetime(2100, 1, 1), datetime(2100, 1, 1), 0)),
+    ('todos.todos_list (due)',
+     "SELECT id, task, due_date, status, created_at FROM todos WHERE user_id = %s "
+     "AND (due_date > %s OR (due_date = %s AND id > %s) OR due_date IS NULL) "
+     "ORDER BY due_date IS NULL, due_date, id LIMIT 51",
+     (1, '2024-01-01', '2024-01-01', 0)),
+    ('todos.summary',
+     "SELECT status, COUNT(*) AS total, "
+     "SUM(CASE WHEN due_date < %s AND status <> '완료' THEN 1 ELSE 0 END) AS overdue, "
+     "SUM(CASE WHEN due_date = %s AND status <> '완료' THEN 1 ELSE 0 END) AS due_today "
+     "FROM todos WHERE user_id = %s GROUP BY status",
+     (datetime(2024, 1, 1).date(), datetime(2024, 1, 1).date(), 1)),
+    ('board.popular_posts',
+     "SELECT b.id, b.title, b.views, b.created_at, u.username FROM board b JOIN users u ON b.user_id = u.id "
+     "ORDER BY b.views DESC, b.id DESC LIMIT 10",
+     ()),
+]
+
+
+# 적용 전에 확인할 데이터 조건: 버전 -> [(설명, 위반 행을 찾는 SQL, 정리 방법)].
+# UNIQUE 인덱스를 추가하는 마이그레이션은 기존 데이터에 중복이 있으면 중간에 실패하므로,
+# 문장을 하나도 실행하기 전에 중복을 찾아 보고하고 멈춥니다. (예전 회원가입은 확인 후 INSERT라 동시 요청으로 중복 아이디가 생길 수 있었음)
+PREFLIGHT_CHECKS = {
+    3: [
+        ("중복 아이디 (uq_users_username)",
+         "SELECT username, COUNT(*) AS count, MIN(id) AS keep_id FROM users "
+         "GROUP BY username HAVING COUNT(*) > 1 ORDER BY username",
+         "아이디마다 한 계정만 남기고(가장 오래된 id 등) 나머지 계정의 username을 바꾸거나 글/할 일/일기를 옮긴 뒤 삭제하세요."),
+        ("같은 날짜의 일기 (uq_diaries_user_date)",
+         "SELECT user_id, entry_date, COUNT(*) AS count, MIN(id) AS keep_id FROM diaries "
+         "GROUP BY user_id, entry_date HAVING COUNT(*) > 1 ORDER BY user_id, entry_date",
+         "사용자/날짜마다 일기 하나(내용을 합친 것 등)만 남기고 나머지를 삭제하세요."),
+    ],
+}
+
+
+class PreflightError(RuntimeError):
+    """마이그레이션을 적용하기 전에 기존 데이터 정리가 필요할 때. (아무 문장도 실행하지 않은 상태)"""
+
+
+def preflight(cursor, version):
+    """
+    PREFLIGHT_CHECKS[version]을 실행해 [(설명, 위반 행 목록, 정리 방법)]을 반환합니다. 문제가 없으면 빈 목록.
+    각 행은 중복된 키 컬럼과 'count', 'keep_id'(가장 오래된 id)를 담습니다.
+    """
+    problems = []
+    for label, sql, fix in PREFLIGHT_CHECKS.get(version, ()):
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+        if rows:
+            problems.append((label, rows, fix))
+    return problems
+
+
+def _preflight_report(version, name, problems, limit=20):
+    lines = [f"{version:04d}_{name}을 적용하기 전에 기존 데이터를 정리해야 합니다. (이 버전의 문장은 실행하지 않았습니다)"]
+    for label, rows, fix in problems:
+        lines.append(f"  {label}: {len(rows)}건")
+        for row in rows[:limit]:
+            key = ', '.join(str(v) for k, v in row.items() if k not in ('count', 'keep_id'))
+            lines.append(f"    {key} x{row['count']} (가장 오래된 id {row['keep_id']})")
+        if len(rows) > limit:
+            lines.append(f"    ... 외 {len(rows) - limit}건")
+        lines.append(f"  -> {fix}")
+    lines.append("정리한 뒤 'flask db upgrade'를 다시 실행하세요. ('flask db preflight'로 미리 확인할 수 있습니다)")
+    return '\n'.join(lines)
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """migrations/ 아래의 SQL 파일을 버전 순서대로 [(version, name, path), ...]로 반환합니다."""
+    found = []
+    for filename in os.listdir(directory):
+        match = _FILENAME_RE.match(filename)
+        if match:
+            found.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    found.sort()
+    versions = [v for v, _, _ in found]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"마이그레이션 버전 번호가 중복되었습니다: {versions}")
+    return found
+
+
+_TRIGGER_RE = re.compile(r'^CREATE\s+TRIGGER\b', re.IGNORECASE)
+
+
+def split_statements(sql_text):
+    """
+    '--' 주석 줄을 제거하고 ';' 기준으로 SQL 문을 나눕니다.
+    CREATE TRIGGER ... BEGIN ... END 본문 안의 ';'에서는 나누지 않습니다. (SQLite 마이그레이션)
+    """
+    lines = [line for line in sql_text.splitlines() if not line.strip().startswith('--')]
+    statements = []
+    pending = ''
+    for piece in '\n'.join(lines).split(';'):
+        pending = f"{pending};{piece}" if pending else piece
+        stmt = pending.strip()
+        if _TRIGGER_RE.match(stmt) and not re.search(r'\bEND$', stmt, re.IGNORECASE):
+            continue
+        if stmt:
+            statements.append(stmt)
+        pending = ''
+    return statements
+
+
+@contextmanager
+def _cli_connection():
+    """CLI용 연결. 요청 컨텍스트가 없으므로 get_db_connection 대신 풀을 직접 사용합니다."""
+    pool = get_pool(current_app._get_current_object())
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def _ensure_version_table(cursor, backend):
+    sql = ("CREATE TABLE IF NOT EXISTS schema_migrations ("
+           " version INT PRIMARY KEY,"
+           " name VARCHAR(255) NOT NULL,"
+           " applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP"
+           ")")
+    if backend.name == 'mysql':
+        sql += " ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+    cursor.execute(sql)
+
+
+def applied_versions(cursor, backend=None):
+    _ensure_version_table(cursor, backend or get_backend())
+    cursor.execute("SELECT version, name, applied_at FROM schema_migrations ORDER BY version")
+    return {row['version']: row for row in cursor.fetchall()}
+
+
+def upgrade(conn, target=None, echo=print):
+    """아직 적용되지 않은 마이그레이션을 순서대로 적용합니다. 적용한 버전 목록을 반환합니다."""
+    backend = get_backend()
+    done = []
+    with conn.cursor() as cursor:
+        applied = applied_versions(cursor, backend)
+        conn.commit()
+        for version, name, path in discover_migrations(backend.migrations_dir):
+            if version in applied or (target is not None and version > target):
+                continue
+            problems = preflight(cursor, version)
+            if problems:
+                raise PreflightError(_preflight_report(version, name, problems))
+            echo(f"적용 중: {version:04d}_{name}")
+            with open(path, encoding='utf-8') as f:
+                statements = split_statements(f.read())
+            # MySQL DDL은 암묵적으로 커밋되므로 문장 단위로 실행하고, 실패 시 해당 버전은 기록하지 않습니다.
+            for stmt in statements:
+                try:
+                    cursor.execute(stmt)
+                except backend.Error as e:
+                    if backend.is_already_applied(e):
+                        echo(f"  건너뜀 (이미 존재): {e}")
+                        continue
+                    raise
+            cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+            conn.commit()
+            done.append(version)
+    return done
+
+
+def explain_hot_queries(conn):
+    """
+    HOT_QUERIES를 EXPLAIN 하여 풀 스캔/인덱스 미사용 쿼리와, 어떤 쿼리도 사용하지 않는 인덱스를 찾습니다.
+    반환값: (missing, unused) — missing: [(쿼리 이름, 테이블, access type, rows)], unused: [(테이블, 인덱스)]
+    """
+    if get_backend().name == 'sqlite':
+        return _explain_hot_queries_sqlite(conn)
+    missing = []
+    used = set()
+    with conn.cursor() as cursor:
+        for name, sql, params in HOT_QUERIES:
+            cursor.execute("EXPLAIN " + sql, params)
+            for row in cursor.fetchall():
+                key = row.get('key')
+                if key:
+                    used.update(key.split(','))
+                if row.get('type') == 'ALL' or (not key and row.get('type') not in ('const', 'system', None)):
+                    missing.append((name, row.get('table'), row.get('type'), row.get('rows')))
+
+        cursor.execute(
+            "SELECT DISTINCT TABLE_NAME AS table_name, INDEX_NAME AS index_name FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND INDEX_NAME <> 'PRIMARY'"
+        )
+        # EXPLAIN의 table 컬럼은 별칭(b, u, c)일 수 있으므로 인덱스 이름만으로 비교합니다.
+        unused = [(row['table_name'], row['index_name']) for row in cursor.fetchall()
+                  if row['index_name'] not in used and not row['index_name'].startswith(('fk_', 'ft_'))]
+    return missing, unused
+
+
+_SQLITE_INDEX_RE = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+
+
+def _explain_hot_queries_sqlite(conn):
+    """SQLite용 explain_hot_queries. EXPLAIN QUERY PLAN의 'SCAN <table>'(인덱스 없이 전체 스캔)을 찾습니다."""
+    missing = []
+    used = set()
+    with conn.cursor() as cursor:
+        for name, sql, params in HOT_QUERIES:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            for row in cursor.fetchall():
+                detail = row['detail']
+                used.update(_SQLITE_INDEX_RE.findall(detail))
+                if detail.startswith('SCAN ') and 'USING' not in detail:
+                    missing.append((name, detail.split()[1], 'SCAN', None))
+
+        cursor.execute("SELECT tbl_name AS table_name, name AS index_name FROM sqlite_master "
+                       "WHERE type = 'index' AND name NOT LIKE 'sqlite_autoindex%'")
+        unused = [(row['table_name'], row['index_name']) for row in cursor.fetchall()
+                  if row['index_name'] not in used]
+    return missing, unused
+
+
+# --- Flask CLI: flask db <command> ---
+db_cli = AppGroup('db', help='스키마 마이그레이션 및 인덱스 점검 명령')
+
+
+@db_cli.command('upgrade')
+@click.option('--target', type=int, default=None, help='이 버전까지만 적용합니다.')
+def upgrade_command(target):
+    """적용되지 않은 마이그레이션을 모두 적용합니다."""
+    with _cli_connection() as conn:
+        try:
+            done = upgrade(conn, target=target, echo=click.echo)
+        except PreflightError as e:
+            raise click.ClickException(str(e))
+    click.echo(f"{len(done)}개 마이그레이션 적용 완료." if done else "이미 최신 상태입니다.")
+
+
+@db_cli.command('status')
+def status_command():
+    """마이그레이션별 적용 여부를 표시합니다."""
+    with _cli_connection() as conn:
+        with conn.cursor() as cursor:
+            applied = applied_versions(cursor)
+        conn.commit()
+    for version, name, _ in discover_migrations(get_backend().migrations_dir):
+        row = applied.get(version)
+        mark = f"적용됨 {row['applied_at']}" if row else "미적용"
+        click.echo(f"{version:04d}_{name:<30} {mark}")
+
+
+@db_cli.command('preflight')
+def preflight_command():
+    """아직 적용하지 않은 마이그레이션의 데이터 조건(중복 아이디 등)을 확인만 합니다."""
+    backend = get_backend()
+    found = False
+    with _cli_connection() as conn:
+        with conn.cursor() as cursor:
+            applied = applied_versions(cursor, backend)
+            for version, name, _ in discover_migrations(backend.migrations_dir):
+                if version in applied:
+                    continue
+                problems = preflight(cursor, version)
+                if problems:
+                    found = True
+                    click.echo(_preflight_report(version, name, problems))
+        conn.commit()
+    if found:
+        raise click.exceptions.Exit(1)
+    click.echo("정리할 데이터가 없습니다.")
+
+
+@db_cli.command('check-indexes')
+def check_indexes_command():
+    """주요 쿼리를 EXPLAIN 하여 인덱스 누락/미사용 인덱스를 보고합니다."""
+    with _cli_connection() as conn:
+        missing, unused = explain_hot_queries(conn)
+    if missing:
+        click.echo("인덱스를 사용하지 않는 쿼리:")
+        for name, table, access_type, rows in missing:
+            click.echo(f"  {name}: table={table} type={access_type} rows={rows}")
+    else:
+        click.echo("모든 주요 쿼리가 인덱스를 사용합니다.")
+    if unused:
+        click.echo("주요 쿼리가 사용하지 않는 인덱스:")
+        for table, index_name in unused:
+            click.echo(f"  {table}.{index_name}")
+
+
+def register_cli(app):
+    """app.py에서 호출하여 'flask db' 명령 그룹을 등록합니다."""
+    app.cli.add_command(db_cli)
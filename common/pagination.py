@@ -0,0 +1,125 @@
+from datetime import date, datetime
+
+# 커서 문자열 형식: "<ISO 시각>_<id>" (예: 2024-05-01T12:30:00_42)
+_CURSOR_SEP = '_'
+
+
+def encode_cursor(created_at, row_id):
+    """(created_at, id) 쌍을 URL에 넣을 수 있는 커서 문자열로 변환합니다."""
+    return f"{created_at.isoformat()}{_CURSOR_SEP}{row_id}"
+
+
+def decode_cursor(cursor):
+    """커서 문자열을 (datetime, id)로 되돌립니다. 형식이 잘못되었으면 None을 반환합니다."""
+    if not cursor:
+        return None
+    ts, sep, row_id = cursor.rpartition(_CURSOR_SEP)
+    if not sep:
+        return None
+    try:
+        return datetime.fromisoformat(ts), int(row_id)
+    except ValueError:
+        return None
+
+
+def keyset_clause(ts_col, id_col, cursor=None, direction='next', descending=True):
+    """
+    (ts_col, id_col) 기준 키셋 페이지네이션용 WHERE 조각과 ORDER BY 절을 만듭니다.
+
+    descending=True이면 'next'는 더 오래된 행, 'prev'는 더 최신 행 방향입니다.
+    'prev' 방향은 반대 순서로 읽으므로 결과를 finalize_page()로 뒤집어야 합니다.
+    반환값: (where_sql 또는 None, params, order_sql)
+    """
+    forward = (direction != 'prev')
+    newest_first = (descending == forward) # 실제로 DB에서 읽는 정렬 방향
+    order = 'DESC' if newest_first else 'ASC'
+    order_sql = f"ORDER BY {ts_col} {order}, {id_col} {order}"
+
+    if cursor is None:
+        return None, [], order_sql
+
+    ts, row_id = cursor
+    op = '<' if newest_first else '>'
+    # (a, b) < (x, y) 대신 펼친 형태를 사용해야 (ts_col, id_col) 인덱스 범위 스캔을 탑니다.
+    where_sql = f"({ts_col} {op} %s OR ({ts_col} = %s AND {id_col} {op} %s))"
+    return where_sql, [ts, ts, row_id], order_sql
+
+
+def encode_date_cursor(day, row_id):
+    """(날짜 문자열 'YYYY-MM-DD' 또는 None, id) 쌍을 커서 문자열로 변환합니다. 날짜가 없으면 앞부분을 비웁니다."""
+    return f"{day or ''}{_CURSOR_SEP}{row_id}"
+
+
+def decode_date_cursor(cursor):
+    """encode_date_cursor()의 커서를 (날짜 문자열 또는 None, id)로 되돌립니다. 형식이 잘못되었으면 None을 반환합니다."""
+    if not cursor:
+        return None
+    day, sep, row_id = cursor.rpartition(_CURSOR_SEP)
+    if not sep:
+        return None
+    try:
+        if day:
+            day = date.fromisoformat(day).isoformat()
+        return day or None, int(row_id)
+    except ValueError:
+        return None
+
+
+def nulls_last_keyset_clause(col, id_col, cursor=None, direction='next'):
+    """
+    NULL을 맨 뒤에 두는 오름차순 (col, id_col) 키셋 페이지네이션용 WHERE 조각과 ORDER BY 절을 만듭니다.
+    (예: 마감일순 To-Do. col이 NULL인 행은 id 순서로 맨 뒤에 옵니다.)
+    cursor는 decode_date_cursor()의 (값 또는 None, id)이고, 'prev' 방향은 keyset_clause()와 같이 finalize_page()로 뒤집습니다.
+    반환값: (where_sql 또는 None, params, order_sql)
+    """
+    if direction == 'prev':
+        order_sql = f"ORDER BY {col} IS NULL DESC, {col} DESC, {id_col} DESC"
+    else:
+        order_sql = f"ORDER BY {col} IS NULL, {col}, {id_col}"
+
+    if cursor is None:
+        return None, [], order_sql
+
+    value, row_id = cursor
+    if direction == 'prev':
+        if value is None:
+            return f"({col} IS NOT NULL OR {id_col} < %s)", [row_id], order_sql
+        return f"({col} < %s OR ({col} = %s AND {id_col} < %s))", [value, value, row_id], order_sql
+    if value is None:
+        return f"({col} IS NULL AND {id_col} > %s)", [row_id], order_sql
+    return f"({col} > %s OR ({col} = %s AND {id_col} > %s) OR {col} IS NULL)", [value, value, row_id], order_sql
+
+
+def finalize_page(rows, page_size, cursor=None, direction='next',
+                  ts_key='created_at', id_key='id', encode=encode_cursor):
+    """
+    LIMIT page_size + 1로 읽은 행을 화면 순서로 정리하고 이전/다음 커서를 계산합니다.
+    커서는 encode(행[ts_key], 행[id_key])로 만듭니다. (마감일순은 encode_date_cursor)
+    반환값: (rows, prev_cursor, next_cursor)
+    """
+    rows = list(rows)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if direction == 'prev':
+        rows.reverse()
+        has_prev, has_next = has_more, cursor is not None
+    else:
+        has_prev, has_next = cursor is not None, has_more
+
+    prev_cursor = next_cursor = None
+    if rows:
+        if has_prev:
+            prev_cursor = encode(rows[0][ts_key], rows[0][id_key])
+        if has_next:
+            next_cursor = encode(rows[-1][ts_key], rows[-1][id_key])
+    return rows, prev_cursor, next_cursor
+
+
+def clamp_page_size(value, default, maximum):
+    """요청 파라미터로 받은 페이지 크기를 1..maximum 범위로 제한합니다."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, maximum))
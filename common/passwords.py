@@ -0,0 +1,114 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from flask import current_app
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+# 비밀번호 해시 (PASSWORD_HASH_METHOD 설정, werkzeug 형식: 'scrypt:n:r:p' | 'pbkdf2:sha256:iterations')
+# 해시 계산은 CPU를 오래 쓰므로 요청 스레드에서 직접 하지 않고 작은 작업자 풀(PASSWORD_HASH_WORKERS)에 맡깁니다.
+# hashlib의 scrypt/pbkdf2는 계산 중 GIL을 놓기 때문에, 로그인 요청이 몰려도 동시에 해시를 계산하는 스레드는
+# 작업자 수로 제한되고 나머지 라우트는 계속 CPU를 받을 수 있습니다.
+# 대기열(PASSWORD_HASH_QUEUE)이 가득 차면 기다리지 않고 HasherBusyError를 냅니다.
+
+
+class HasherBusyError(Exception):
+    """해시 작업자 풀이 포화 상태입니다. (잠시 후 재시도)"""
+
+
+def normalize_method(method):
+    """'scrypt', 'pbkdf2:sha256'처럼 생략된 인자를 werkzeug 기본값으로 채워 저장된 해시의 접두어와 비교할 수 있게 합니다."""
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        n, r, p = args if args else (2 ** 15, 8, 1)
+        return f"scrypt:{int(n)}:{int(r)}:{int(p)}"
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    raise RuntimeError(f"알 수 없는 PASSWORD_HASH_METHOD 설정입니다: {method}")
+
+
+class PasswordHasher:
+    """설정된 알고리즘/비용으로 해시를 만들고 검증합니다. 계산은 제한된 작업자 풀에서 실행됩니다."""
+
+    def __init__(self, method='scrypt', workers=2, queue_size=32, timeout=10.0):
+        self.method = normalize_method(method)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + queue_size) # 실행 중 + 대기 중 작업 수 상한
+        self._stats_lock = threading.Lock()
+        self.workers = workers
+        self.queue_size = queue_size
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected += 1
+            raise HasherBusyError("password hash queue is full")
+        with self._stats_lock:
+            self.in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # 작업은 풀에서 끝까지 실행되고 슬롯은 그때 반납됩니다.
+            raise HasherBusyError("password hash timed out") from None
+
+    def _done(self, future):
+        with self._stats_lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+    def hash(self, password):
+        return self._submit(generate_password_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        return self._submit(check_password_hash, stored_hash, password)
+
+    def needs_rehash(self, stored_hash):
+        """저장된 해시가 현재 설정과 다른 알고리즘/비용으로 만들어졌는지 확인합니다."""
+        return stored_hash.split('$', 1)[0] != self.method
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'method': self.method,
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'in_flight': self.in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'rehashed': self.rehashed,
+            }
+
+    def count_rehash(self):
+        with self._stats_lock:
+            self.rehashed += 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def init_passwords(app):
+    """비밀번호 해시 작업자 풀을 만듭니다. (app.py에서 한 번 호출)"""
+    app.extensions['password_hasher'] = PasswordHasher(
+        method=app.config.get('PASSWORD_HASH_METHOD', 'scrypt'),
+        workers=app.config.get('PASSWORD_HASH_WORKERS', 2),
+        queue_size=app.config.get('PASSWORD_HASH_QUEUE', 32),
+        timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 10.0),
+    )
+
+
+def get_hasher():
+    """현재 앱의 PasswordHasher를 반환합니다."""
+    return current_app.extensions['password_hasher']
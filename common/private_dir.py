@@ -0,0 +1,27 @@
+import logging
+import os
+import stat
+
+logger = logging.getLogger(__name__)
+
+# 세션/캐시 파일을 두는 디렉터리 확인
+# 다른 로컬 사용자가 미리 만들어 두거나 쓸 수 있는 디렉터리(/tmp 아래의 고정 이름 등)를 쓰면
+# 세션 위조나 캐시 파일 바꿔치기가 가능하므로, 시작할 때 이 프로세스 사용자 소유의 0700 디렉터리인지 확인합니다.
+
+
+def ensure_private_dir(path):
+    """
+    path를 0700으로 만들고(이미 있으면 검사) 경로를 반환합니다.
+    심볼릭 링크이거나 다른 사용자 소유면 RuntimeError, 그룹/다른 사용자 권한이 있으면 0700으로 고칩니다.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if stat.S_ISLNK(st.st_mode) or not stat.S_ISDIR(st.st_mode):
+        raise RuntimeError(f"{path}는 디렉터리가 아닙니다(심볼릭 링크 등). 다른 경로를 지정하세요.")
+    if hasattr(os, 'geteuid'): # POSIX만
+        if st.st_uid != os.geteuid():
+            raise RuntimeError(f"{path}의 소유자(uid {st.st_uid})가 이 프로세스(uid {os.geteuid()})가 아닙니다.")
+        if st.st_mode & 0o077:
+            logger.warning("%s의 권한을 %o에서 700으로 바꿉니다.", path, stat.S_IMODE(st.st_mode))
+            os.chmod(path, 0o700)
+    return path
@@ -0,0 +1,224 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+
+import click
+from flask import current_app, g, request
+
+from common.instrumentation import add_query_listener
+from common.migrations import db_cli
+
+logger = logging.getLogger(__name__)
+
+# 쿼리 프로파일러 (QUERY_PROFILER=true 일 때만 동작)
+# - 실행된 SQL을 지문(fingerprint)으로 정규화해 횟수/시간/행 수를 집계합니다.
+# - 한 요청에서 같은 지문이 반복되면(N+1 의심) 또는 SQL 시간이 예산을 넘으면 경고 로그를 남깁니다.
+# - 최근 QUERY_REPORT_WINDOW초 동안의 집계를 프로세스별 JSON 파일로 내보내며,
+#   'flask db slow-queries'가 모든 프로세스의 파일을 합쳐 총 시간 기준 상위 N개를 보여줍니다.
+
+_BUCKET_SECONDS = 60
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_RE = re.compile(r"\bVALUES\s*(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*",
+                        re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """리터럴/플레이스홀더를 ?로 바꾸고 IN 목록과 공백을 접어 같은 모양의 쿼리를 하나로 묶습니다."""
+    text = _STRING_RE.sub('?', sql)
+    text = _PLACEHOLDER_RE.sub('?', text)
+    text = _NUMBER_RE.sub('?', text)
+    text = _IN_LIST_RE.sub('IN (?+)', text)
+    text = _VALUES_RE.sub(r'VALUES \1', text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+class QueryStats:
+    """
+    지문별 누적 통계를 분 단위 버킷으로 보관하는 롤링 집계.
+    window초보다 오래된 버킷은 버려집니다.
+    """
+
+    def __init__(self, window=3600):
+        self.window = window
+        self._lock = threading.Lock()
+        self._buckets = deque() # (bucket_start, {fingerprint: entry})
+
+    def _current_bucket(self, now):
+        start = int(now) - int(now) % _BUCKET_SECONDS
+        if not self._buckets or self._buckets[-1][0] != start:
+            self._buckets.append((start, {}))
+        while self._buckets and self._buckets[0][0] <= now - self.window - _BUCKET_SECONDS:
+            self._buckets.popleft()
+        return self._buckets[-1][1]
+
+    def add(self, fp, duration, rowcount, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            bucket = self._current_bucket(now)
+            entry = bucket.get(fp)
+            if entry is None:
+                entry = bucket[fp] = {'count': 0, 'total': 0.0, 'max': 0.0, 'rows': 0}
+            entry['count'] += 1
+            entry['total'] += duration
+            entry['max'] = max(entry['max'], duration)
+            entry['rows'] += max(rowcount or 0, 0)
+
+    def snapshot(self, now=None):
+        """윈도 안의 버킷을 합친 {fingerprint: entry}를 반환합니다."""
+        now = time.time() if now is None else now
+        merged = {}
+        with self._lock:
+            for start, bucket in self._buckets:
+                if start <= now - self.window - _BUCKET_SECONDS:
+                    continue
+                for fp, entry in bucket.items():
+                    _merge_entry(merged, fp, entry)
+        return merged
+
+
+def _merge_entry(merged, fp, entry):
+    target = merged.get(fp)
+    if target is None:
+        merged[fp] = dict(entry)
+        return
+    target['count'] += entry['count']
+    target['total'] += entry['total']
+    target['max'] = max(target['max'], entry['max'])
+    target['rows'] += entry['rows']
+
+
+def top_queries(stats, limit=20):
+    """총 시간 기준 상위 limit개 (fingerprint, entry) 목록."""
+    return sorted(stats.items(), key=lambda item: item[1]['total'], reverse=True)[:limit]
+
+
+class QueryProfiler:
+    """record_query 리스너. 요청별 지문 카운트와 프로세스 전체 롤링 집계를 함께 기록합니다."""
+
+    def __init__(self, config):
+        self.repeat_threshold = config.get('QUERY_REPEAT_THRESHOLD', 5)
+        self.time_budget = config.get('QUERY_TIME_BUDGET_MS', 200) / 1000.0
+        self.report_dir = config.get('QUERY_REPORT_DIR') or _default_report_dir()
+        self.report_interval = config.get('QUERY_REPORT_INTERVAL', 30)
+        self.stats = QueryStats(window=config.get('QUERY_REPORT_WINDOW', 3600))
+        self._last_dump = time.monotonic()
+        self._dump_lock = threading.Lock()
+
+    def __call__(self, sql, params, duration, rowcount):
+        fp = fingerprint(sql)
+        self.stats.add(fp, duration, rowcount)
+        try:
+            per_request = g.get('_query_profile')
+        except RuntimeError:
+            return # 요청 밖(CLI 등)
+        if per_request is None:
+            per_request = g._query_profile = {}
+        count, total = per_request.get(fp, (0, 0.0))
+        per_request[fp] = (count + 1, total + duration)
+
+    def finish_request(self, response):
+        per_request = g.pop('_query_profile', None)
+        if per_request:
+            self._check_request(per_request)
+        self._maybe_dump()
+        return response
+
+    def _check_request(self, per_request):
+        for fp, (count, total) in per_request.items():
+            if count >= self.repeat_threshold:
+                logger.warning("N+1 의심: %s %s 에서 같은 쿼리 %d회 (%.1fms): %s",
+                               request.method, request.path, count, total * 1000, fp)
+        db_time = sum(total for _, total in per_request.values())
+        if db_time > self.time_budget:
+            worst = max(per_request.items(), key=lambda item: item[1][1])
+            logger.warning("SQL 시간 예산 초과: %s %s 에서 %.1fms (예산 %.0fms), 가장 느린 쿼리 %.1fms: %s",
+                           request.method, request.path, db_time * 1000, self.time_budget * 1000,
+                           worst[1][1] * 1000, worst[0])
+
+    def _maybe_dump(self):
+        if time.monotonic() - self._last_dump < self.report_interval:
+            return
+        if not self._dump_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_dump = time.monotonic()
+            self.dump()
+        finally:
+            self._dump_lock.release()
+
+    def dump(self):
+        """현재 프로세스의 롤링 집계를 QUERY_REPORT_DIR/queries-<pid>.json에 원자적으로 씁니다."""
+        try:
+            os.makedirs(self.report_dir, exist_ok=True)
+            payload = {'pid': os.getpid(), 'written_at': time.time(), 'window': self.stats.window,
+                       'queries': self.stats.snapshot()}
+            fd, tmp_path = tempfile.mkstemp(dir=self.report_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, os.path.join(self.report_dir, f'queries-{os.getpid()}.json'))
+        except OSError:
+            logger.exception("슬로 쿼리 리포트를 쓰지 못했습니다: %s", self.report_dir)
+
+
+def _default_report_dir():
+    return os.path.join(tempfile.gettempdir(), 'your_flask_app_queries')
+
+
+def load_report(report_dir, max_age=None):
+    """모든 프로세스의 리포트 파일을 합칩니다. max_age초보다 오래된 파일은 건너뜁니다."""
+    merged = {}
+    if not os.path.isdir(report_dir):
+        return merged
+    now = time.time()
+    for name in os.listdir(report_dir):
+        if not (name.startswith('queries-') and name.endswith('.json')):
+            continue
+        try:
+            with open(os.path.join(report_dir, name), encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if max_age is not None and now - payload.get('written_at', 0) > max_age:
+            continue
+        for fp, entry in payload.get('queries', {}).items():
+            _merge_entry(merged, fp, entry)
+    return merged
+
+
+def init_query_profiler(app):
+    """QUERY_PROFILER가 켜져 있으면 프로파일러를 쿼리 리스너로 등록합니다. (app.py에서 한 번 호출)"""
+    if not app.config.get('QUERY_PROFILER'):
+        return None
+    profiler = QueryProfiler(app.config)
+    add_query_listener(profiler)
+    app.after_request(profiler.finish_request)
+    app.extensions['query_profiler'] = profiler
+    return profiler
+
+
+@db_cli.command('slow-queries')
+@click.option('--top', 'limit', type=int, default=20, help='총 시간 기준으로 보여줄 쿼리 수')
+@click.option('--dir', 'report_dir', default=None, help='리포트 디렉터리 (기본값: QUERY_REPORT_DIR)')
+def slow_queries_command(limit, report_dir):
+    """프로세스별 쿼리 리포트를 합쳐 총 시간이 긴 쿼리 지문을 보여줍니다."""
+    config = current_app.config
+    report_dir = report_dir or config.get('QUERY_REPORT_DIR') or _default_report_dir()
+    stats = load_report(report_dir, max_age=config.get('QUERY_REPORT_WINDOW', 3600))
+    if not stats:
+        click.echo(f"{report_dir} 에 최근 쿼리 리포트가 없습니다. (QUERY_PROFILER 설정을 확인하세요.)")
+        return
+    click.echo(f"{'total_ms':>10} {'count':>7} {'avg_ms':>8} {'max_ms':>8} {'rows':>8}  query")
+    for fp, entry in top_queries(stats, limit):
+        avg = entry['total'] / entry['count'] if entry['count'] else 0.0
+        click.echo(f"{entry['total'] * 1000:>10.1f} {entry['count']:>7} {avg * 1000:>8.2f} "
+                   f"{entry['max'] * 1000:>8.2f} {entry['rows']:>8}  {fp}")
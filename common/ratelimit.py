@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+from flask import current_app
+
+# 로그인 시도 제한 (슬라이딩 윈도우)
+# 키(예: 'user:kim', 'ip:10.0.0.1')마다 최근 window초 동안의 시도 시각을 기억하고, limit회를 넘으면 거절합니다.
+# 해시 검증 전에 확인하므로 크리덴셜 스터핑처럼 몰려드는 시도가 CPU를 쓰지 못합니다.
+# 프로세스 내 메모리이므로 mod_wsgi 프로세스마다 따로 셉니다. (실제 상한 = limit x 프로세스 수)
+
+
+class SlidingWindowLimiter:
+    """키별 슬라이딩 윈도우 카운터. 키 수는 max_keys로 제한되며 오래 쓰이지 않은 키부터 버립니다."""
+
+    def __init__(self, limit, window, max_keys=100000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._hits = OrderedDict() # key -> deque[timestamp]
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def hit(self, key):
+        """시도를 기록합니다. 허용되면 0, 제한에 걸리면 다시 시도할 수 있을 때까지 남은 초를 반환합니다."""
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                hits = self._hits[key] = deque()
+            else:
+                self._hits.move_to_end(key)
+            while hits and hits[0] <= now - self.window:
+                hits.popleft()
+            if len(hits) >= self.limit:
+                self.rejected += 1
+                return hits[0] + self.window - now
+            hits.append(now)
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+            return 0
+
+    def reset(self, key):
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {'limit': self.limit, 'window': self.window, 'keys': len(self._hits), 'rejected': self.rejected}
+
+
+class LoginThrottle:
+    """사용자 이름별, IP별 제한을 함께 적용합니다."""
+
+    def __init__(self, per_user, per_ip, window, max_keys=100000):
+        self.by_user = SlidingWindowLimiter(per_user, window, max_keys)
+        self.by_ip = SlidingWindowLimiter(per_ip, window, max_keys)
+
+    def check(self, ip, username=None):
+        """제한에 걸리면 남은 초(>0), 아니면 0. IP를 먼저 확인해 한 IP가 여러 사용자 이름을 시도하는 경우도 막습니다."""
+        if current_app.config.get('LOGIN_THROTTLE', True) is False:
+            return 0
+        retry_after = self.by_ip.hit(f"ip:{ip}")
+        if retry_after or username is None:
+            return retry_after
+        return self.by_user.hit(f"user:{username.lower()}")
+
+    def succeeded(self, username):
+        """로그인에 성공하면 해당 사용자 이름의 실패 기록을 지웁니다."""
+        self.by_user.reset(f"user:{username.lower()}")
+
+    def stats(self):
+        return {'user': self.by_user.stats(), 'ip': self.by_ip.stats()}
+
+
+def init_rate_limits(app):
+    """로그인 제한기를 만듭니다. (app.py에서 한 번 호출)"""
+    app.extensions['login_throttle'] = LoginThrottle(
+        per_user=app.config.get('LOGIN_LIMIT_PER_USER', 5),
+        per_ip=app.config.get('LOGIN_LIMIT_PER_IP', 30),
+        window=app.config.get('LOGIN_LIMIT_WINDOW', 60),
+        max_keys=app.config.get('LOGIN_LIMIT_MAX_KEYS', 100000),
+    )
+
+
+def get_login_throttle():
+    """현재 앱의 LoginThrottle을 반환합니다."""
+    return current_app.extensions['login_throttle']
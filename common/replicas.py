@@ -0,0 +1,163 @@
+import itertools
+import logging
+import threading
+import time
+
+from common.db_pool import ConnectionPool, PoolTimeoutError
+from common.instrumentation import InstrumentedCursor
+
+logger = logging.getLogger(__name__)
+
+# 읽기 복제본 (DB_REPLICA_HOSTS 설정, MySQL 백엔드만)
+# - GET/HEAD 요청의 get_db_connection()은 복제본 연결을, 쓰기 요청(POST 등)은 주 DB(DB_HOST) 연결을 돌려줍니다.
+#   (common/utils.py) 모든 쓰기는 POST 라우트에서만 일어나므로 라우트 코드는 바꾸지 않습니다.
+# - 복제본마다 ConnectionPool을 두고, 빌려준 연결이 가장 적은 복제본을 고릅니다. (같으면 돌아가며)
+# - 연결/ping에 실패했거나 복제 지연이 DB_REPLICA_MAX_LAG초를 넘은 복제본은 DB_REPLICA_RETRY초 동안 빼 둡니다.
+#   쓸 수 있는 복제본이 없으면 주 DB에서 읽습니다.
+# - 쓰기 요청을 한 사용자는 DB_REPLICA_STICKY_SECONDS 동안 주 DB에서 읽습니다. (read-your-writes:
+#   글 작성 후 목록으로 리디렉션했을 때 복제 지연 때문에 방금 쓴 글이 안 보이는 일을 막습니다)
+
+
+def parse_hosts(value):
+    """'db2:3306, db3' -> [('db2', 3306), ('db3', None)]"""
+    hosts = []
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.partition(':')
+        hosts.append((host, int(port) if port else None))
+    return hosts
+
+
+class Replica:
+    """복제본 하나의 풀과 상태."""
+
+    def __init__(self, name, backend, pool):
+        self.name = name
+        self.backend = backend
+        self.pool = pool
+        self.down_until = 0.0 # 이 시각(monotonic)까지 후보에서 제외
+        self.last_error = None
+        self.failures = 0
+        self.lag = None # 마지막으로 확인한 복제 지연(초)
+        self.lag_checked_at = 0.0
+        self.check_lag = True # 권한이 없거나 복제 상태를 볼 수 없는 호스트면 False
+
+
+class ReplicaSet:
+    """상태 확인과 부하 분산을 하는 읽기 복제본 묶음. acquire()가 None이면 주 DB를 쓰면 됩니다."""
+
+    def __init__(self, replicas, retry_interval=30, max_lag=0, lag_check_interval=5):
+        self.replicas = list(replicas)
+        self.retry_interval = retry_interval
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self._rotation = itertools.count()
+        self._lock = threading.Lock()
+        self._fallbacks = 0 # 쓸 수 있는 복제본이 없어 주 DB로 보낸 횟수
+
+    def _candidates(self, now):
+        healthy = [r for r in self.replicas if r.down_until <= now]
+        if len(healthy) > 1:
+            # 돌아가며 시작점을 바꾼 뒤 사용 중인 연결 수로 정렬 (sorted는 안정 정렬이므로 동률이면 순서 유지)
+            start = next(self._rotation) % len(healthy)
+            healthy = sorted(healthy[start:] + healthy[:start], key=lambda r: r.pool.in_use)
+        return healthy
+
+    def mark_down(self, replica, reason):
+        with self._lock:
+            replica.down_until = time.monotonic() + self.retry_interval
+            replica.failures += 1
+            replica.last_error = str(reason)
+        logger.warning("읽기 복제본 %s를 %s초 동안 제외합니다: %s", replica.name, self.retry_interval, reason)
+
+    def acquire(self):
+        """(replica, conn) 또는 쓸 수 있는 복제본이 없으면 None."""
+        for replica in self._candidates(time.monotonic()):
+            try:
+                conn = replica.pool.acquire()
+            except PoolTimeoutError:
+                continue # 바쁠 뿐이므로 제외하지 않고 다음 복제본으로
+            except replica.backend.Error as e:
+                self.mark_down(replica, e)
+                continue
+            if self.max_lag and replica.check_lag and \
+                    time.monotonic() - replica.lag_checked_at >= self.lag_check_interval:
+                if not self._lag_ok(replica, conn):
+                    replica.pool.release(conn)
+                    continue
+            return replica, conn
+        with self._lock:
+            self._fallbacks += 1
+        return None
+
+    def _lag_ok(self, replica, conn):
+        try:
+            with conn.unwrapped_cursor() as cursor:
+                lag = replica.backend.replica_lag(cursor)
+        except (LookupError, replica.backend.Error) as e:
+            # 권한(REPLICATION CLIENT)이 없거나 복제본이 아닌 주소(프록시 등)는 지연을 확인하지 않습니다.
+            replica.check_lag = False
+            logger.warning("읽기 복제본 %s의 복제 지연을 확인할 수 없어 확인을 끕니다: %s", replica.name, e)
+            return True
+        replica.lag = lag
+        replica.lag_checked_at = time.monotonic()
+        if lag is None:
+            self.mark_down(replica, "복제가 멈춰 있습니다")
+            return False
+        if lag > self.max_lag:
+            self.mark_down(replica, f"복제 지연 {lag}초 > DB_REPLICA_MAX_LAG {self.max_lag}초")
+            return False
+        return True
+
+    def release(self, replica, conn, discard=False):
+        """연결을 반납합니다. 연결이 끊어져 버리는 경우(discard)에는 복제본도 잠시 제외합니다."""
+        replica.pool.release(conn, discard=discard)
+        if discard:
+            self.mark_down(replica, "연결이 끊어졌습니다")
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            'fallbacks_to_primary': self._fallbacks,
+            'replicas': {
+                r.name: dict(r.pool.stats(),
+                             healthy=r.down_until <= now,
+                             failures=r.failures,
+                             last_error=r.last_error,
+                             lag=r.lag)
+                for r in self.replicas
+            },
+        }
+
+
+def create_replica_set(app, backend):
+    """DB_REPLICA_HOSTS로 ReplicaSet을 만듭니다. 설정이 없거나 백엔드가 지원하지 않으면 None."""
+    hosts = parse_hosts(app.config.get('DB_REPLICA_HOSTS', ''))
+    if not hosts:
+        return None
+    if not getattr(backend, 'supports_replicas', False):
+        logger.warning("%s 백엔드는 읽기 복제본을 지원하지 않아 DB_REPLICA_HOSTS를 무시합니다.", backend.name)
+        return None
+    replicas = []
+    for host, port in hosts:
+        replica_backend = backend.for_host(host, port, connect_timeout=app.config.get('DB_REPLICA_CONNECT_TIMEOUT', 2))
+        pool = ConnectionPool(
+            replica_backend.connect,
+            pool_size=app.config.get('DB_POOL_SIZE', 5),
+            max_overflow=app.config.get('DB_POOL_MAX_OVERFLOW', 10),
+            # 복제본이 바쁘면 오래 기다리지 않고 다른 복제본이나 주 DB로 보냅니다.
+            timeout=app.config.get('DB_REPLICA_POOL_TIMEOUT', 1.0),
+            recycle=app.config.get('DB_POOL_RECYCLE', 3600),
+            pre_ping=app.config.get('DB_POOL_PRE_PING', True),
+            cursor_wrapper=InstrumentedCursor,
+            ping=replica_backend.ping,
+        )
+        replicas.append(Replica(f"{host}:{port or replica_backend.connect_kwargs['port']}", replica_backend, pool))
+    return ReplicaSet(
+        replicas,
+        retry_interval=app.config.get('DB_REPLICA_RETRY', 30),
+        max_lag=app.config.get('DB_REPLICA_MAX_LAG', 0),
+        lag_check_interval=app.config.get('DB_REPLICA_LAG_CHECK_INTERVAL', 5),
+    )
@@ -0,0 +1,341 @@
+# 게시판/To-Do 검색 모듈.
+#
+# SEARCH_BACKEND 설정에 따라 검색 방식을 고릅니다.
+#   - 'fulltext': MySQL FULLTEXT(ngram 파서) 인덱스 사용. 관련도 순 정렬. (migrations 참고)
+#   - 'memory'  : FULLTEXT를 쓸 수 없는 환경(MariaDB, SQLite 등)을 위한 프로세스 내 역색인.
+#                 DB_BACKEND='sqlite'에서 'fulltext'를 지정하면 자동으로 이 방식을 씁니다.
+#                 게시글은 제목과 본문을 모두 색인하므로 검색 중에 LIKE로 테이블을 훑지 않습니다.
+#                 (문서마다 소문자로 바꾼 텍스트만 보관하고 토큰 집합은 삭제할 때 다시 계산합니다)
+#                 색인은 요청 안에서 만들지 않고 워커별 백그라운드 스레드가 id 순서로 나눠 읽어 채웁니다.
+#                 (새 행은 SEARCH_INDEX_REFRESH초마다 id 워터마크 이후만, 수정/삭제 반영은 SEARCH_INDEX_TTL초마다 전체 재구축)
+#                 재구축 중에는 이전 색인으로, 처음 만들어지기 전에는 LIKE로 검색합니다.
+#   - 'like'    : 기존 LIKE '%q%' 방식. 인덱스가 준비되기 전 임시로 사용.
+# 검색어가 ngram 토큰 크기보다 짧으면 FULLTEXT가 매칭할 수 없으므로 LIKE로 처리합니다.
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app
+
+from common.utils import get_backend, get_pool
+
+logger = logging.getLogger(__name__)
+
+NGRAM_SIZE = 2 # MySQL ngram_token_size 기본값과 동일하게 맞춥니다.
+
+
+def _ngrams(text, n=NGRAM_SIZE):
+    """공백으로 나눈 각 단어를 n-gram 토큰으로 분해합니다. (n보다 짧은 단어는 그대로)"""
+    tokens = []
+    for word in (text or '').lower().split():
+        if len(word) <= n:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return tokens
+
+
+def _boolean_phrase(query):
+    """BOOLEAN MODE용 구문 검색어. 따옴표는 제거해 연산자로 해석되지 않게 합니다."""
+    return '"' + query.replace('"', ' ').strip() + '"'
+
+
+class InvertedIndex:
+    """
+    n-gram 기반 프로세스 내 역색인.
+    문서는 {필드명: 소문자 텍스트}와 필터용 메타데이터(예: user_id)로 저장됩니다.
+    토큰 집합은 문서마다 따로 두지 않고(본문이 길면 포스팅과 같은 크기가 됨) 교체/삭제할 때 텍스트에서 다시 계산합니다.
+    """
+
+    def __init__(self, fields, weights=None):
+        self.fields = fields
+        self.weights = weights or {}
+        self._postings = defaultdict(set) # token -> {doc_id}
+        self._docs = {} # doc_id -> (texts, meta)
+        self._lock = threading.RLock()
+        self.built_at = None
+        self.max_id = 0 # 백그라운드 갱신이 읽은 마지막 id (이후 행만 추가로 읽음)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _tokens(self, texts):
+        tokens = set()
+        for field in self.fields:
+            tokens.update(_ngrams(texts.get(field)))
+        return tokens
+
+    def add(self, doc_id, texts, **meta):
+        """문서를 추가하거나 교체합니다."""
+        texts = {field: (texts.get(field) or '').lower() for field in self.fields}
+        tokens = self._tokens(texts)
+        with self._lock:
+            self._remove_locked(doc_id)
+            self._docs[doc_id] = (texts, meta)
+            for token in tokens:
+                self._postings[token].add(doc_id)
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def _remove_locked(self, doc_id):
+        old = self._docs.pop(doc_id, None)
+        if old is None:
+            return
+        for token in self._tokens(old[0]):
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[token]
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self.built_at = None
+            self.max_id = 0
+
+    def swap(self, other):
+        """다른 색인에서 새로 만든 내용으로 통째로 교체합니다. (재구축 중에도 검색 가능)"""
+        with self._lock:
+            self._postings = other._postings
+            self._docs = other._docs
+            self.built_at = other.built_at
+            self.max_id = other.max_id
+
+    def search(self, query, offset=0, limit=20, **filters):
+        """
+        모든 n-gram을 포함하는 문서를 찾아 실제 부분 문자열 일치를 확인한 뒤 관련도 순으로 반환합니다.
+        반환값: [(doc_id, score), ...] (limit + 1개까지, 다음 페이지 판단용)
+        """
+        return self.search_all(query, **filters)[offset:offset + limit + 1]
+
+    def search_all(self, query, **filters):
+        """search와 같지만 일치하는 문서를 모두 반환합니다."""
+        needle = query.lower().strip()
+        tokens = set(_ngrams(needle))
+        if not tokens:
+            return []
+
+        with self._lock:
+            # 가장 짧은 포스팅 리스트부터 교집합을 구해 비교 횟수를 줄입니다.
+            postings = sorted((self._postings.get(t, set()) for t in tokens), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting
+                if not candidates:
+                    return []
+
+            scored = []
+            for doc_id in candidates:
+                texts, meta = self._docs[doc_id]
+                if any(meta.get(k) != v for k, v in filters.items()):
+                    continue
+                score = 0.0
+                for field in self.fields:
+                    hits = texts[field].count(needle)
+                    score += hits * self.weights.get(field, 1.0)
+                if score > 0:
+                    scored.append((doc_id, score))
+
+        scored.sort(key=lambda item: (-item[1], -item[0]))
+        return scored
+
+
+# 테이블별 프로세스 내 역색인 (SEARCH_BACKEND='memory'일 때만 채워집니다)
+_board_index = InvertedIndex(('title', 'content'), weights={'title': 3.0, 'content': 1.0})
+_todos_index = InvertedIndex(('task',))
+
+# 색인별 적재 쿼리: id 워터마크 이후를 id 순서로 LOAD_BATCH_SIZE행씩 읽습니다. (PK 범위 스캔, 한 번에 한 배치만 메모리에)
+LOAD_BATCH_SIZE = 5000
+_LOADERS = (
+    (_board_index, "SELECT id, title, content FROM board WHERE id > %s ORDER BY id LIMIT %s",
+     lambda row: ({'title': row['title'], 'content': row['content']}, {})),
+    (_todos_index, "SELECT id, user_id, task FROM todos WHERE id > %s ORDER BY id LIMIT %s",
+     lambda row: ({'task': row['task']}, {'user_id': row['user_id']})),
+)
+
+
+def _backend():
+    backend = current_app.config.get('SEARCH_BACKEND', 'fulltext')
+    if backend == 'fulltext' and not get_backend().supports_fulltext:
+        return 'memory'
+    return backend
+
+
+def _use_like(query):
+    return _backend() == 'like' or len(query.strip()) < NGRAM_SIZE
+
+
+class IndexRefresher:
+    """
+    워커 프로세스마다 하나씩 도는 색인 갱신 스레드. 요청은 색인을 기다리지 않습니다.
+    mod_wsgi가 fork한 뒤 첫 검색 때 그 프로세스의 스레드를 시작합니다. (common/view_counts.py와 같은 방식)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self.app = None
+
+    def ensure_started(self, app):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.app = app
+            threading.Thread(target=self._run, name='search-index', daemon=True).start()
+
+    def _run(self):
+        while True:
+            ttl = self.app.config.get('SEARCH_INDEX_TTL', 300)
+            try:
+                for index, sql, to_doc in _LOADERS:
+                    if index.built_at is None or time.monotonic() - index.built_at >= ttl:
+                        # 전체 재구축: 새 색인에 채운 뒤 교체 (그동안 이전 색인으로 검색)
+                        fresh = InvertedIndex(index.fields, index.weights)
+                        self.load(fresh, sql, to_doc)
+                        fresh.built_at = time.monotonic()
+                        index.swap(fresh)
+                    else:
+                        self.load(index, sql, to_doc)
+            except Exception:
+                logger.exception("검색 색인 갱신 실패 (다음 주기에 다시 시도합니다)")
+            time.sleep(self.app.config.get('SEARCH_INDEX_REFRESH', 30))
+
+    def load(self, index, sql, to_doc):
+        """index.max_id 이후의 행을 배치로 읽어 색인에 추가합니다."""
+        pool = get_pool(self.app)
+        conn = pool.acquire()
+        try:
+            with conn.cursor() as cursor:
+                while True:
+                    cursor.execute(sql, (index.max_id, LOAD_BATCH_SIZE))
+                    rows = cursor.fetchall()
+                    for row in rows:
+                        texts, meta = to_doc(row)
+                        index.add(row['id'], texts, **meta)
+                    if rows:
+                        index.max_id = rows[-1]['id']
+                    if len(rows) < LOAD_BATCH_SIZE:
+                        break
+        finally:
+            pool.release(conn)
+
+
+_refresher = IndexRefresher()
+
+
+def _index_ready(index):
+    """갱신 스레드를 (처음이면) 시작하고, 색인이 한 번이라도 만들어졌는지 반환합니다."""
+    _refresher.ensure_started(current_app._get_current_object())
+    return index.built_at is not None
+
+
+def _split_page(rows, page_size):
+    """page_size + 1건으로 조회한 결과에서 다음 페이지 존재 여부를 분리합니다."""
+    rows = list(rows)
+    return rows[:page_size], len(rows) > page_size
+
+
+def search_board(cursor, query, page=1, page_size=20, excerpt_len=100):
+    """
+    게시글을 검색해 관련도 순으로 반환합니다.
+    반환값: (posts, has_next) — posts의 각 행은 board_list 템플릿과 같은 컬럼을 가집니다.
+    """
+    offset = (page - 1) * page_size
+    select = "SELECT b.id, b.title, SUBSTR(b.content, 1, %s) AS excerpt, b.created_at, b.updated_at, u.username"
+
+    memory = not _use_like(query) and _backend() == 'memory'
+    if _use_like(query) or (memory and not _index_ready(_board_index)):
+        sql = f"{select} FROM board b JOIN users u ON b.user_id = u.id " \
+              "WHERE b.title LIKE %s OR b.content LIKE %s " \
+              "ORDER BY b.created_at DESC, b.id DESC LIMIT %s OFFSET %s"
+        cursor.execute(sql, (excerpt_len + 1, f"%{query}%", f"%{query}%", page_size + 1, offset))
+        return _split_page(cursor.fetchall(), page_size)
+
+    if memory:
+        # 제목/본문 색인에서 한 페이지 분량의 id만 골라 PK로 읽습니다. (제목 일치에 가중치)
+        hits = _board_index.search(query, offset=offset, limit=page_size)
+        if not hits:
+            return [], False
+        ids = [doc_id for doc_id, _ in hits]
+        placeholders = ', '.join(['%s'] * len(ids))
+        sql = f"{select} FROM board b JOIN users u ON b.user_id = u.id WHERE b.id IN ({placeholders})"
+        cursor.execute(sql, [excerpt_len + 1] + ids)
+        by_id = {row['id']: row for row in cursor.fetchall()}
+        return _split_page([by_id[i] for i in ids if i in by_id], page_size)
+
+    # FULLTEXT: BOOLEAN MODE 구문 검색으로 후보를 거르고, NATURAL LANGUAGE MODE 점수로 정렬합니다.
+    sql = f"{select}, MATCH(b.title, b.content) AGAINST (%s IN NATURAL LANGUAGE MODE) AS score " \
+          "FROM board b JOIN users u ON b.user_id = u.id " \
+          "WHERE MATCH(b.title, b.content) AGAINST (%s IN BOOLEAN MODE) " \
+          "ORDER BY score DESC, b.id DESC LIMIT %s OFFSET %s"
+    cursor.execute(sql, (excerpt_len + 1, query, _boolean_phrase(query), page_size + 1, offset))
+    return _split_page(cursor.fetchall(), page_size)
+
+
+def search_todos(cursor, user_id, query, status=None, page=1, page_size=50):
+    """
+    사용자의 To-Do를 검색해 관련도 순으로 반환합니다. status가 주어지면 해당 상태만.
+    반환값: (todos, has_next)
+    """
+    offset = (page - 1) * page_size
+    select = "SELECT id, task, DATE_FORMAT(due_date, '%%Y-%%m-%%d') AS due_date, status, created_at FROM todos"
+    status_sql = " AND status = %s" if status else ""
+    status_params = [status] if status else []
+
+    memory = not _use_like(query) and _backend() == 'memory'
+    if _use_like(query) or (memory and not _index_ready(_todos_index)):
+        sql = f"{select} WHERE user_id = %s{status_sql} AND task LIKE %s " \
+              "ORDER BY created_at DESC LIMIT %s OFFSET %s"
+        cursor.execute(sql, [user_id] + status_params + [f"%{query}%", page_size + 1, offset])
+        return _split_page(cursor.fetchall(), page_size)
+
+    if memory:
+        # 상태는 자주 바뀌므로 색인에 두지 않고 DB 조회 시 거릅니다.
+        hits = _todos_index.search_all(query, user_id=user_id)
+        if not hits:
+            return [], False
+        ids = [doc_id for doc_id, _ in hits]
+        placeholders = ', '.join(['%s'] * len(ids))
+        sql = f"{select} WHERE user_id = %s{status_sql} AND id IN ({placeholders})"
+        cursor.execute(sql, [user_id] + status_params + ids)
+        by_id = {row['id']: row for row in cursor.fetchall()}
+        ordered = [by_id[i] for i in ids if i in by_id]
+        return _split_page(ordered[offset:offset + page_size + 1], page_size)
+
+    sql = "SELECT id, task, DATE_FORMAT(due_date, '%%Y-%%m-%%d') AS due_date, status, created_at, " \
+          "MATCH(task) AGAINST (%s IN NATURAL LANGUAGE MODE) AS score FROM todos " \
+          f"WHERE user_id = %s{status_sql} AND MATCH(task) AGAINST (%s IN BOOLEAN MODE) " \
+          "ORDER BY score DESC, id DESC LIMIT %s OFFSET %s"
+    cursor.execute(sql, [query, user_id] + status_params + [_boolean_phrase(query), page_size + 1, offset])
+    return _split_page(cursor.fetchall(), page_size)
+
+
+# --- 쓰기 경로에서 호출하는 색인 갱신 훅 (memory 백엔드가 아닐 때는 아무 일도 하지 않음) ---
+
+def index_board_post(post_id, title, content):
+    if _backend() == 'memory' and _board_index.built_at is not None:
+        _board_index.add(post_id, {'title': title, 'content': content})
+
+
+def unindex_board_post(post_id):
+    if _backend() == 'memory':
+        _board_index.remove(post_id)
+
+
+def index_todo(todo_id, user_id, task):
+    if _backend() == 'memory' and _todos_index.built_at is not None:
+        _todos_index.add(todo_id, {'task': task}, user_id=user_id)
+
+
+def unindex_todo(todo_id):
+    if _backend() == 'memory':
+        _todos_index.remove(todo_id)
@@ -0,0 +1,497 @@
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import re
+import secrets
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+from common.private_dir import ensure_private_dir
+
+logger = logging.getLogger(__name__)
+
+# 서버 측 세션 (SESSION_BACKEND 설정)
+#   - 'cookie': Flask 기본 서명 쿠키 (세션 내용 전체가 쿠키에 담김)
+#   - 'file'  : SESSION_DIR(기본 instance/sessions, 0700)의 파일. 같은 서버의 mod_wsgi 프로세스들이 공유합니다. (기본값)
+#   - 'memory': 프로세스 내 사전. 단일 프로세스 개발 서버용
+#   - 'redis' : Redis 호환 클라이언트. SESSION_REDIS_URL='local://'이면 프로세스 내 대체 구현(LocalRedis)을 씁니다.
+# 쿠키에는 무작위 세션 id만 담기고, 요청이 올 때마다 만료 시각이 연장됩니다(sliding expiry).
+# 사용자별 세션 목록을 유지하므로 특정 사용자의 세션을 한 번에 폐기할 수 있습니다.
+# 저장하는 내용은 SECRET_KEY와 세션 id로 HMAC 서명하고, 서명이 맞지 않으면 버립니다.
+# (저장소에 직접 쓸 수 있어도 세션을 위조하거나 다른 sid의 내용을 옮겨 쓸 수 없음. 모든 워커가 같은 FLASK_SECRET_KEY를 써야 합니다.)
+
+_SID_RE = re.compile(r'^[A-Za-z0-9_-]{32,64}$')
+_serializer = TaggedJSONSerializer()
+
+
+class SessionStore(ABC):
+    """세션 저장소 공통 인터페이스. payload는 직렬화된 문자열입니다. (메서드를 모두 구현해야 인스턴스를 만들 수 있습니다)"""
+
+    @abstractmethod
+    def get(self, sid):
+        """(payload, expires_at) 또는 None"""
+
+    @abstractmethod
+    def set(self, sid, payload, ttl, user_id=None):
+        """ttl초 뒤에 만료되도록 저장합니다. user_id가 있으면 사용자별 세션 목록에도 넣습니다."""
+
+    @abstractmethod
+    def touch(self, sid, ttl, payload=None):
+        """만료 시각을 연장합니다. 만료 시각을 내용과 함께 저장하는 저장소는 payload로 다시 씁니다."""
+
+    @abstractmethod
+    def delete(self, sid):
+        pass
+
+    @abstractmethod
+    def revoke_user(self, user_id):
+        """해당 사용자의 모든 세션을 지우고 지운 개수를 반환합니다."""
+
+    @abstractmethod
+    def revoke_all(self):
+        """모든 세션을 지우고 지운 개수를 반환합니다."""
+
+
+class MemorySessionStore(SessionStore):
+    """프로세스 내 세션 저장소. mod_wsgi 프로세스끼리는 공유되지 않습니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {} # sid -> [payload, expires_at, user_id]
+        self._by_user = {} # user_id -> set(sid)
+
+    def get(self, sid):
+        with self._lock:
+            item = self._data.get(sid)
+            if item is None:
+                return None
+            if item[1] < time.time():
+                self._remove(sid)
+                return None
+            return item[0], item[1]
+
+    def set(self, sid, payload, ttl, user_id=None):
+        with self._lock:
+            self._remove(sid)
+            self._data[sid] = [payload, time.time() + ttl, user_id]
+            if user_id is not None:
+                self._by_user.setdefault(user_id, set()).add(sid)
+
+    def touch(self, sid, ttl, payload=None):
+        with self._lock:
+            item = self._data.get(sid)
+            if item is not None:
+                item[1] = time.time() + ttl
+
+    def delete(self, sid):
+        with self._lock:
+            self._remove(sid)
+
+    def _remove(self, sid):
+        item = self._data.pop(sid, None)
+        if item is not None and item[2] is not None:
+            self._by_user.get(item[2], set()).discard(sid)
+
+    def revoke_user(self, user_id):
+        with self._lock:
+            sids = self._by_user.pop(user_id, set())
+            for sid in sids:
+                self._data.pop(sid, None)
+            return len(sids)
+
+    def revoke_all(self):
+        with self._lock:
+            count = len(self._data)
+            self._data.clear()
+            self._by_user.clear()
+            return count
+
+
+class FileSessionStore(SessionStore):
+    """
+    디렉터리 기반 세션 저장소. 세션 하나가 파일 하나(<sid>.session)이고, 사용자별 폐기를 위해
+    users/<user_id>/<sid> 빈 파일로 색인을 둡니다. 쓰기는 임시 파일 + os.replace로 원자적입니다.
+    만료 시각은 파일 수정 시각(mtime)으로 관리하므로 연장(touch)은 내용을 다시 쓰지 않습니다.
+    """
+
+    def __init__(self, directory):
+        self.directory = ensure_private_dir(directory)
+        self.users_dir = os.path.join(directory, 'users')
+        os.makedirs(self.users_dir, mode=0o700, exist_ok=True)
+
+    def _path(self, sid):
+        return os.path.join(self.directory, f"{sid}.session")
+
+    def get(self, sid):
+        path = self._path(sid)
+        try:
+            expires_at = os.path.getmtime(path)
+            if expires_at < time.time():
+                self._unlink(path)
+                return None
+            with open(path, encoding='utf-8') as f:
+                return f.read(), expires_at
+        except OSError:
+            return None
+
+    def set(self, sid, payload, ttl, user_id=None):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            expires_at = time.time() + ttl
+            os.utime(tmp_path, (expires_at, expires_at))
+            os.replace(tmp_path, self._path(sid))
+        except OSError:
+            self._unlink(tmp_path)
+            raise
+        if user_id is not None:
+            user_dir = os.path.join(self.users_dir, str(user_id))
+            os.makedirs(user_dir, mode=0o700, exist_ok=True)
+            open(os.path.join(user_dir, sid), 'a').close()
+
+    def touch(self, sid, ttl, payload=None):
+        expires_at = time.time() + ttl
+        try:
+            os.utime(self._path(sid), (expires_at, expires_at))
+        except OSError:
+            pass
+
+    def delete(self, sid):
+        self._unlink(self._path(sid))
+
+    def _unlink(self, path):
+        try:
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
+
+    def revoke_user(self, user_id):
+        user_dir = os.path.join(self.users_dir, str(user_id))
+        try:
+            sids = os.listdir(user_dir)
+        except OSError:
+            return 0
+        removed = 0
+        for sid in sids:
+            removed += self._unlink(self._path(sid))
+            self._unlink(os.path.join(user_dir, sid))
+        return removed
+
+    def revoke_all(self):
+        removed = sum(self._unlink(os.path.join(self.directory, name))
+                      for name in os.listdir(self.directory) if name.endswith('.session'))
+        for user_id in os.listdir(self.users_dir):
+            user_dir = os.path.join(self.users_dir, user_id)
+            for sid in os.listdir(user_dir):
+                self._unlink(os.path.join(user_dir, sid))
+        return removed
+
+    def purge_expired(self):
+        """만료된 세션 파일과 색인을 지웁니다. (cron 등에서 'flask session purge'로 호출)"""
+        now = time.time()
+        removed = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith('.session') and os.path.getmtime(path) < now:
+                    removed += self._unlink(path)
+            except OSError:
+                pass
+        for user_id in os.listdir(self.users_dir):
+            user_dir = os.path.join(self.users_dir, user_id)
+            for sid in os.listdir(user_dir):
+                if not os.path.exists(self._path(sid)):
+                    self._unlink(os.path.join(user_dir, sid))
+        return removed
+
+
+class LocalRedis:
+    """
+    RedisSessionStore가 쓰는 명령(get/setex/expire/delete/sadd/srem/smembers/scan_iter)만 구현한
+    프로세스 내 대체 구현. Redis 서버 없이 개발/테스트할 때 SESSION_REDIS_URL='local://'로 사용합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {} # key -> (value, expires_at 또는 None)
+
+    def _alive(self, key):
+        item = self._values.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] < time.time():
+            del self._values[key]
+            return None
+        return item
+
+    def get(self, key):
+        with self._lock:
+            item = self._alive(key)
+            return item[0] if item and isinstance(item[0], (str, bytes)) else None
+
+    def setex(self, key, seconds, value):
+        with self._lock:
+            self._values[key] = (value, time.time() + seconds)
+        return True
+
+    def expire(self, key, seconds):
+        with self._lock:
+            item = self._alive(key)
+            if item is None:
+                return False
+            self._values[key] = (item[0], time.time() + seconds)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._values.pop(key, None) is not None for key in keys)
+
+    def sadd(self, key, *members):
+        with self._lock:
+            item = self._alive(key)
+            current = item[0] if item else set()
+            before = len(current)
+            current.update(members)
+            self._values[key] = (current, item[1] if item else None)
+            return len(current) - before
+
+    def srem(self, key, *members):
+        with self._lock:
+            item = self._alive(key)
+            if item is None:
+                return 0
+            before = len(item[0])
+            item[0].difference_update(members)
+            return before - len(item[0])
+
+    def smembers(self, key):
+        with self._lock:
+            item = self._alive(key)
+            return set(item[0]) if item else set()
+
+    def scan_iter(self, match='*'):
+        with self._lock:
+            keys = [key for key in self._values if fnmatch.fnmatchcase(key, match)]
+        return iter(keys)
+
+
+class RedisSessionStore(SessionStore):
+    """Redis 호환 클라이언트를 쓰는 세션 저장소. 여러 서버가 세션을 공유할 수 있습니다."""
+
+    def __init__(self, client, prefix='session:'):
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, sid):
+        return f"{self.prefix}{sid}"
+
+    def _user_key(self, user_id):
+        return f"{self.prefix}user:{user_id}"
+
+    def get(self, sid):
+        raw = self.client.get(self._key(sid))
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode('utf-8')
+        record = json.loads(raw)
+        return record['payload'], record['expires_at']
+
+    def set(self, sid, payload, ttl, user_id=None):
+        expires_at = time.time() + ttl
+        self.client.setex(self._key(sid), int(ttl),
+                          json.dumps({'payload': payload, 'expires_at': expires_at, 'user_id': user_id}))
+        if user_id is not None:
+            self.client.sadd(self._user_key(user_id), sid)
+
+    def touch(self, sid, ttl, payload=None):
+        # 레코드에 expires_at이 들어 있으므로 EXPIRE 대신 같은 왕복 한 번의 SETEX로 함께 갱신합니다.
+        if payload is None:
+            self.client.expire(self._key(sid), int(ttl))
+            return
+        self.client.setex(self._key(sid), int(ttl),
+                          json.dumps({'payload': payload, 'expires_at': time.time() + ttl}))
+
+    def delete(self, sid):
+        self.client.delete(self._key(sid))
+
+    def revoke_user(self, user_id):
+        sids = self.client.smembers(self._user_key(user_id))
+        keys = [self._key(sid.decode() if isinstance(sid, bytes) else sid) for sid in sids]
+        removed = self.client.delete(*keys) if keys else 0
+        self.client.delete(self._user_key(user_id))
+        return removed
+
+    def revoke_all(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        return self.client.delete(*keys) if keys else 0
+
+
+def create_session_store(config, instance_path):
+    """설정(SESSION_BACKEND 등)에 맞는 세션 저장소를 만듭니다. 'cookie'면 None."""
+    backend = config.get('SESSION_BACKEND', 'file')
+    if backend == 'cookie':
+        return None
+    if backend == 'memory':
+        return MemorySessionStore()
+    if backend == 'file':
+        directory = config.get('SESSION_DIR') or os.path.join(instance_path, 'sessions')
+        return FileSessionStore(directory)
+    if backend == 'redis':
+        url = config.get('SESSION_REDIS_URL', 'local://')
+        if url == 'local://':
+            client = LocalRedis()
+        else:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("SESSION_BACKEND='redis'에는 redis 패키지가 필요합니다. (pip install redis)") from None
+            client = redis.Redis.from_url(url)
+        return RedisSessionStore(client)
+    raise RuntimeError(f"알 수 없는 SESSION_BACKEND 설정입니다: {backend}")
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, expires_at=None):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.modified = False
+        self.regenerated = False
+
+    def regenerate(self):
+        """로그인 시 세션 고정 공격을 막기 위해 새 세션 id를 발급합니다. (기존 id는 저장 시 폐기)"""
+        self.regenerated = True
+        self.modified = True
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """쿠키에는 세션 id만 저장하고 내용은 SessionStore에 두는 세션 인터페이스."""
+
+    def __init__(self, store, idle_timeout, refresh_ratio=0.5):
+        self.store = store
+        self.idle_timeout = idle_timeout
+        # 남은 시간이 idle_timeout * refresh_ratio보다 적을 때만 연장해 매 요청 쓰기를 피합니다.
+        self.refresh_ratio = refresh_ratio
+
+    def _new_sid(self):
+        return secrets.token_urlsafe(32)
+
+    def _signer(self, app, sid):
+        # salt에 sid를 넣어 서명을 세션 id에 묶습니다.
+        return Signer(app.secret_key, salt=f"server-session:{sid}", digest_method=hashlib.sha256)
+
+    def _dumps(self, app, sid, session):
+        return self._signer(app, sid).sign(_serializer.dumps(dict(session))).decode('utf-8')
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid and _SID_RE.match(sid):
+            found = self.store.get(sid)
+            if found is not None:
+                payload, expires_at = found
+                try:
+                    data = _serializer.loads(self._signer(app, sid).unsign(payload).decode('utf-8'))
+                    return ServerSideSession(data, sid=sid, expires_at=expires_at)
+                except BadSignature:
+                    logger.warning("서명이 맞지 않는 세션을 버립니다. (sid %s...)", sid[:8])
+                    self.store.delete(sid)
+                except ValueError:
+                    self.store.delete(sid)
+        return ServerSideSession()
+
+    def save_session(self, app, session, response):
+        cookie_name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.sid is not None:
+                self.store.delete(session.sid)
+                response.delete_cookie(cookie_name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        if session.modified or session.sid is None:
+            if session.regenerated and session.sid is not None:
+                self.store.delete(session.sid)
+                session.sid = None
+            session.sid = session.sid or self._new_sid()
+            self.store.set(session.sid, self._dumps(app, session.sid, session), self.idle_timeout,
+                           user_id=session.get('id'))
+        elif session.expires_at is None or session.expires_at - now < self.idle_timeout * self.refresh_ratio:
+            self.store.touch(session.sid, self.idle_timeout, self._dumps(app, session.sid, session))
+        else:
+            return # 내용도 그대로이고 아직 연장할 필요도 없으면 쿠키를 다시 보내지 않습니다.
+
+        expires = datetime.now(timezone.utc) + timedelta(seconds=self.idle_timeout)
+        response.set_cookie(cookie_name, session.sid, expires=expires,
+                            httponly=self.get_cookie_httponly(app), secure=self.get_cookie_secure(app),
+                            samesite=self.get_cookie_samesite(app), domain=domain, path=path)
+        response.vary.add('Cookie')
+
+
+def init_sessions(app):
+    """SESSION_BACKEND가 'cookie'가 아니면 서버 측 세션을 설치합니다. (app.py에서 한 번 호출)"""
+    store = create_session_store(app.config, app.instance_path)
+    app.extensions['session_store'] = store
+    if store is not None:
+        app.session_interface = ServerSideSessionInterface(
+            store,
+            idle_timeout=app.config.get('SESSION_IDLE_TIMEOUT', 7200),
+            refresh_ratio=app.config.get('SESSION_REFRESH_RATIO', 0.5),
+        )
+    app.cli.add_command(session_cli)
+
+
+def revoke_user_sessions(app, user_id):
+    """사용자의 모든 세션을 폐기합니다. (비밀번호 변경, 계정 정지 등)"""
+    store = app.extensions.get('session_store')
+    return store.revoke_user(user_id) if store is not None else 0
+
+
+# --- Flask CLI: flask session <command> ---
+session_cli = AppGroup('session', help='서버 측 세션 관리 명령')
+
+
+@session_cli.command('revoke')
+@click.option('--user-id', type=int, default=None, help='이 사용자의 세션만 폐기합니다.')
+@click.option('--all', 'revoke_all', is_flag=True, help='모든 세션을 폐기합니다.')
+def revoke_command(user_id, revoke_all):
+    """세션을 폐기합니다."""
+    store = current_app.extensions.get('session_store')
+    if store is None:
+        raise click.ClickException("SESSION_BACKEND='cookie'에서는 세션을 서버에서 폐기할 수 없습니다.")
+    if revoke_all:
+        click.echo(f"세션 {store.revoke_all()}개 폐기")
+    elif user_id is not None:
+        click.echo(f"사용자 {user_id}의 세션 {store.revoke_user(user_id)}개 폐기")
+    else:
+        raise click.UsageError('--user-id 또는 --all 중 하나를 지정하세요.')
+
+
+@session_cli.command('purge')
+def purge_command():
+    """만료된 세션 파일을 정리합니다. (file 백엔드)"""
+    store = current_app.extensions.get('session_store')
+    if not isinstance(store, FileSessionStore):
+        click.echo("file 백엔드가 아니므로 정리할 파일이 없습니다. (다른 백엔드는 자체적으로 만료됩니다.)")
+        return
+    click.echo(f"만료된 세션 {store.purge_expired()}개 삭제")
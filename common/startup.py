@@ -0,0 +1,185 @@
+import importlib
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import request
+
+from common.templating import precompile_templates
+from common.utils import get_pool, get_replicas
+
+logger = logging.getLogger(__name__)
+
+# 워커 시작(콜드 스타트) 측정과 예열
+# - StartupReport: create_app의 단계별 시간, 블루프린트 모듈별 import 시간, 프로세스 시작부터 첫 요청까지의 시간을
+#   기록합니다. 첫 요청이 끝나면 한 줄 요약을 로그로 남기고 /health/startup에서 JSON으로 보여줍니다.
+# - preload_app: 트래픽을 받기 전에 블루프린트 등록, DB 연결 풀 채우기, 템플릿 컴파일을 끝냅니다.
+#   (wsgi.py/asgi.py에서 create_app(preload=True)로 사용)
+# - LazyBlueprints: LAZY_BLUEPRINTS가 켜져 있으면 블루프린트 모듈을 첫 요청 때 import/등록합니다.
+#   (예열하지 않는 CLI/개발 서버의 시작을 줄임. Flask는 첫 요청 이후 라우트를 추가할 수 없으므로 첫 요청 직전에 모두 등록)
+
+
+def process_age():
+    """프로세스가 시작된 뒤 지난 시간(초). /proc가 없으면 None."""
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupReport:
+    """한 앱 인스턴스의 시작 시간 기록. app.extensions['startup_report']에 보관됩니다."""
+
+    def __init__(self, import_time=None):
+        self.created = time.perf_counter()
+        self.process_age = process_age() # create_app 호출 시점의 프로세스 나이
+        self.import_time = import_time # app 모듈의 import 시간(초)
+        self.phases = {} # 단계 이름 -> 초 (실행 순서대로)
+        self.imports = {} # 모듈 이름 -> 초
+        self.ready = None # create_app(+preload) 완료까지 걸린 시간(초)
+        self.first_request = None
+        self._first_started = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def import_module(self, name):
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        self.imports[name] = time.perf_counter() - started
+        return module
+
+    def mark_ready(self):
+        self.ready = time.perf_counter() - self.created
+
+    def _before_request(self):
+        if self._first_started is None:
+            with self._lock:
+                if self._first_started is None:
+                    self._first_started = time.perf_counter()
+
+    def _after_request(self, response):
+        if self.first_request is None and self._first_started is not None:
+            with self._lock:
+                if self.first_request is None:
+                    now = time.perf_counter()
+                    since_create = now - self.created
+                    self.first_request = {
+                        'path': request.path,
+                        'duration_ms': _ms(now - self._first_started),
+                        'since_create_app_ms': _ms(since_create),
+                        'since_process_start_ms': _ms(self.process_age + since_create) if self.process_age is not None else None,
+                    }
+                    logger.info("시작 보고: %s", self.summary())
+        return response
+
+    def as_dict(self):
+        return {
+            'pid': os.getpid(),
+            'process_age_at_create_ms': _ms(self.process_age) if self.process_age is not None else None,
+            'app_import_ms': _ms(self.import_time) if self.import_time is not None else None,
+            'phases_ms': {name: _ms(value) for name, value in self.phases.items()},
+            'imports_ms': {name: _ms(value) for name, value in self.imports.items()},
+            'ready_ms': _ms(self.ready) if self.ready is not None else None,
+            'first_request': self.first_request,
+        }
+
+    def summary(self):
+        slowest = sorted(self.phases.items(), key=lambda item: item[1], reverse=True)[:5]
+        parts = [f"앱 생성 {_ms(self.ready or 0)}ms (" + ', '.join(f"{n} {_ms(v)}" for n, v in slowest) + ")"]
+        if self.import_time is not None:
+            parts.insert(0, f"import {_ms(self.import_time)}ms")
+        if self.first_request:
+            parts.append(f"첫 요청 {self.first_request['duration_ms']}ms")
+            if self.first_request['since_process_start_ms'] is not None:
+                parts.append(f"프로세스 시작부터 첫 응답까지 {self.first_request['since_process_start_ms']}ms")
+        return ', '.join(parts)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+def init_startup_report(app, report):
+    """첫 요청 시간을 기록하는 훅을 등록합니다. (create_app에서 호출)"""
+    app.extensions['startup_report'] = report
+    app.before_request(report._before_request)
+    app.after_request(report._after_request)
+
+
+def get_startup_report(app):
+    return app.extensions.get('startup_report')
+
+
+class LazyBlueprints:
+    """app.wsgi_app을 감싸 첫 요청 직전에 register()를 한 번 호출합니다."""
+
+    def __init__(self, app, register):
+        self.app = app
+        self.wsgi_app = app.wsgi_app
+        self._register = register
+        self._done = False
+        self._lock = threading.Lock()
+
+    def ensure_registered(self):
+        if self._done:
+            return
+        with self._lock:
+            if not self._done:
+                self._register(self.app)
+                self._done = True
+
+    def __call__(self, environ, start_response):
+        if not self._done:
+            # 첫 요청 시간에 블루프린트 등록도 포함되도록 여기서 시작 시각을 기록합니다.
+            report = get_startup_report(self.app)
+            if report is not None:
+                report._before_request()
+        self.ensure_registered()
+        return self.wsgi_app(environ, start_response)
+
+
+def ensure_blueprints(app):
+    """LAZY_BLUEPRINTS로 미뤄 둔 블루프린트를 지금 등록합니다. (요청 없이 url_for를 쓰는 벤치마크/예열용)"""
+    lazy = app.extensions.get('lazy_blueprints')
+    if lazy is not None:
+        lazy.ensure_registered()
+
+
+def preload_app(app):
+    """트래픽을 받기 전에 예열합니다. 실패해도(DB 다운 등) 경고만 남기고 계속합니다. (요청 처리 시 다시 시도됨)"""
+    report = get_startup_report(app)
+    with report.phase('preload.blueprints'):
+        ensure_blueprints(app)
+
+    connections = app.config.get('PRELOAD_DB_CONNECTIONS', 2)
+    if connections:
+        with report.phase('preload.db_pool'):
+            try:
+                get_pool(app).prefill(connections)
+            except Exception as e:
+                logger.warning("예열 중 DB 연결 실패 (첫 요청 때 다시 연결합니다): %s", e)
+            replicas = get_replicas(app)
+            for replica in (replicas.replicas if replicas is not None else ()):
+                try:
+                    replica.pool.prefill(1)
+                except Exception as e:
+                    replicas.mark_down(replica, e)
+
+    with report.phase('preload.templates'):
+        try:
+            precompile_templates(app)
+        except Exception:
+            logger.exception("예열 중 템플릿 컴파일 실패")
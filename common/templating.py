@@ -0,0 +1,114 @@
+import hashlib
+import os
+import tempfile
+import threading
+
+import click
+from flask import current_app, request, url_for
+from flask.cli import AppGroup
+from jinja2 import FileSystemBytecodeCache
+
+from common.assets import assets_cli, load_manifest
+
+# 템플릿/정적 파일 설정
+# - 컴파일된 Jinja 템플릿(바이트코드)을 TEMPLATE_CACHE_DIR에 저장해 워커가 재시작되어도 다시 컴파일하지 않습니다.
+#   캐시 키에 템플릿 원본의 체크섬이 포함되므로 배포로 템플릿이 바뀌면 자동으로 새로 컴파일됩니다.
+# - asset_url('css/app.css')는 파일 내용 해시를 ?v=로 붙인 주소를 돌려줍니다. 이 주소로 요청된 정적 파일은
+#   내용이 바뀌면 주소도 바뀌므로 STATIC_MAX_AGE 동안 immutable로 캐시하게 합니다.
+#   'flask assets build'로 빌드해 두었으면 static/dist의 해시 이름 파일 주소를 돌려줍니다. (common/assets.py)
+
+
+class _AssetVersions:
+    """정적 파일별 내용 해시. 한 번 계산하면 재사용하고, check_mtime이면(디버그/자동 리로드) 수정 시각이 바뀔 때 다시 계산합니다."""
+
+    def __init__(self, static_folder, manifest=None):
+        self.static_folder = static_folder
+        self.manifest = manifest or {} # 원본 이름 -> 빌드된 dist 경로 (common/assets.py)
+        self._versions = {} # filename -> (mtime, digest)
+        self.urls = {} # (filename, script_root) -> 버전이 붙은 주소
+        self._lock = threading.Lock()
+
+    def get(self, filename, check_mtime=False):
+        cached = self._versions.get(filename)
+        if cached is not None and not check_mtime:
+            return cached[1]
+        path = os.path.join(self.static_folder, filename)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:12]
+        with self._lock:
+            self._versions[filename] = (mtime, digest)
+        return digest
+
+
+def _build_asset_url(versions, filename, check_mtime):
+    built = None if check_mtime else versions.manifest.get(filename)
+    if built is not None:
+        return url_for('static', filename=built)
+    version = versions.get(filename, check_mtime=check_mtime)
+    if version is None:
+        return url_for('static', filename=filename)
+    return url_for('static', filename=filename, v=version)
+
+
+def asset_url(filename):
+    """버전(내용 해시)이 붙은 정적 파일 주소. 템플릿에서 {{ asset_url('css/app.css') }}로 사용합니다.
+    자동 리로드가 꺼져 있으면 만든 주소를 재사용합니다. (매 렌더링마다 url_for를 부르지 않도록)"""
+    versions = current_app.extensions['asset_versions']
+    if current_app.jinja_env.auto_reload:
+        return _build_asset_url(versions, filename, check_mtime=True)
+    key = (filename, request.script_root)
+    url = versions.urls.get(key)
+    if url is None:
+        url = versions.urls[key] = _build_asset_url(versions, filename, check_mtime=False)
+    return url
+
+
+def _static_cache_headers(response):
+    if request.endpoint != 'static' or response.status_code not in (200, 304):
+        return response
+    if request.args.get('v') or request.view_args.get('filename', '').startswith('dist/'):
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config.get('STATIC_MAX_AGE', 31536000)
+        response.cache_control.immutable = True
+        response.cache_control.no_cache = None
+    return response
+
+
+def precompile_templates(app):
+    """모든 템플릿을 미리 컴파일해 바이트코드 캐시를 채웁니다. 컴파일한 템플릿 수를 반환합니다."""
+    names = [name for name in app.jinja_env.list_templates() if name.endswith('.html')]
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+
+def init_templates(app):
+    """템플릿 바이트코드 캐시, asset_url, 정적 파일 캐시 헤더를 설정하고 'flask templates', 'flask assets' 명령을 등록합니다. (app.py에서 한 번 호출)"""
+    cache_dir = app.config.get('TEMPLATE_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'your_flask_app_jinja')
+    if cache_dir != 'off':
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    app.extensions['asset_versions'] = _AssetVersions(app.static_folder, load_manifest(app.static_folder))
+    app.add_template_global(asset_url)
+    app.after_request(_static_cache_headers)
+    app.cli.add_command(templates_cli)
+    app.cli.add_command(assets_cli)
+
+
+# --- Flask CLI: flask templates <command> ---
+templates_cli = AppGroup('templates', help='템플릿 캐시 관리 명령')
+
+
+@templates_cli.command('compile')
+def compile_command():
+    """모든 템플릿을 컴파일해 바이트코드 캐시를 채웁니다. (배포 직후 실행하면 첫 요청의 컴파일 시간이 없어집니다)"""
+    count = precompile_templates(current_app)
+    cache = current_app.jinja_env.bytecode_cache
+    where = cache.directory if cache is not None else '(바이트코드 캐시 꺼짐)'
+    click.echo(f"템플릿 {count}개 컴파일 완료: {where}")
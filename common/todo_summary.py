@@ -0,0 +1,35 @@
+from datetime import date
+
+# 사용자별 To-Do 요약 (상태별 개수, 마감 지남, 오늘 마감)
+# 상태마다 COUNT를 따로 보내거나 목록 전체를 읽어 세지 않고, GROUP BY status 한 번으로 모두 계산합니다.
+# (user_id, status, due_date) 인덱스만 읽으므로(migrations/0006_todo_due_date.sql) 할 일이 많아도 테이블을 읽지 않습니다.
+# 오늘 날짜는 CURDATE() 대신 앱에서 넘깁니다. (MySQL/SQLite 공통, 서버 시간대와 무관하게 앱의 datetime.now() 기준)
+
+# To-Do 상태 (todos/routes.py의 VALID_STATUSES, 화면 표시 순서)
+TODO_STATUSES = ('미완료', '진행중', '완료', '기간연장')
+
+SUMMARY_SQL = (
+    "SELECT status, COUNT(*) AS total, "
+    "SUM(CASE WHEN due_date < %s AND status <> '완료' THEN 1 ELSE 0 END) AS overdue, "
+    "SUM(CASE WHEN due_date = %s AND status <> '완료' THEN 1 ELSE 0 END) AS due_today "
+    "FROM todos WHERE user_id = %s GROUP BY status"
+)
+
+
+def todo_summary(cursor, user_id, statuses=TODO_STATUSES, today=None):
+    """
+    {'statuses': {상태: 개수, ...}, 'total', 'overdue', 'due_today'}를 반환합니다.
+    statuses의 상태는 0개여도 포함되고, 그 밖의 상태 값도 그대로 더해집니다.
+    overdue/due_today는 완료되지 않은 항목만 셉니다.
+    """
+    today = today or date.today()
+    cursor.execute(SUMMARY_SQL, (today, today, user_id))
+    counts = {status: 0 for status in statuses}
+    total = overdue = due_today = 0
+    for row in cursor.fetchall():
+        # MySQL의 SUM은 Decimal을 반환하므로 int로 맞춥니다.
+        counts[row['status']] = counts.get(row['status'], 0) + int(row['total'])
+        total += int(row['total'])
+        overdue += int(row['overdue'] or 0)
+        due_today += int(row['due_today'] or 0)
+    return {'statuses': counts, 'total': total, 'overdue': overdue, 'due_today': due_today}
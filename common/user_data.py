@@ -0,0 +1,343 @@
+import csv
+import gzip
+import io
+import json
+import zlib
+from datetime import date, datetime
+
+import click
+from flask.cli import AppGroup
+
+from common.migrations import _cli_connection
+from common.todo_summary import TODO_STATUSES
+from common.utils import get_backend
+
+# 사용자 데이터 내보내기/가져오기 (GET /api/v1/export, POST /api/v1/import, 'flask data export | import')
+# - 내보내기는 종류(일기, 할 일, 게시글, 댓글)별로 서버 측 커서(MySQL SSDictCursor)를 열어 fetchmany로 조금씩 읽고,
+#   CSV/JSONL로 바꿔 chunk_size 바이트씩 내보내는 제너레이터입니다. 기록이 아무리 많아도 워커 메모리는 일정합니다.
+#   (DictCursor + fetchall()은 결과 전체를 메모리에 올립니다.)
+#   서버 측 커서를 읽는 동안 그 연결로 다른 쿼리를 보낼 수 없으므로 종류별로 끝까지 읽고 다음 쿼리를 실행합니다.
+#   클라이언트가 net_write_timeout(MySQL 기본 60초)보다 오래 받지 않으면 서버가 연결을 끊습니다.
+# - compress='gzip'이면 내보내는 바이트를 바로 gzip으로 압축합니다. (.csv.gz/.jsonl.gz 파일 다운로드용.
+#   Accept-Encoding에 따른 전송 압축은 압축 미들웨어(common/compression.py)가 스트리밍 응답에도 적용합니다)
+# - 가져오기는 파일을 한 줄씩 읽어 종류별로 batch_size개씩 executemany로 INSERT하고 배치마다 커밋합니다.
+#   id는 새로 매기고, 같은 날짜의 일기가 이미 있으면 건너뜁니다. 댓글은 다른 사람의 게시글에 달린 것이므로
+#   가져오지 않습니다. (내보내기 파일에는 참고용으로 포함)
+
+FORMATS = ('csv', 'jsonl')
+
+# 종류 -> (SQL, CSV 열). SQL은 user_id 하나를 받고 id 순서로 읽습니다.
+EXPORT_QUERIES = {
+    'diaries': ("SELECT id, entry_date, title, content, created_at, updated_at FROM diaries WHERE user_id = %s ORDER BY id",
+                ('id', 'entry_date', 'title', 'content', 'created_at', 'updated_at')),
+    'todos': ("SELECT id, task, due_date, status, created_at FROM todos WHERE user_id = %s ORDER BY id",
+              ('id', 'task', 'due_date', 'status', 'created_at')),
+    'posts': ("SELECT id, title, content, comment_count, created_at, updated_at FROM board WHERE user_id = %s ORDER BY id",
+              ('id', 'title', 'content', 'comment_count', 'created_at', 'updated_at')),
+    'comments': ("SELECT id, board_id, content, created_at FROM comments WHERE user_id = %s ORDER BY id",
+                 ('id', 'board_id', 'content', 'created_at')),
+}
+KINDS = tuple(EXPORT_QUERIES)
+
+TEXT_MAX_LENGTH = 255 # title, task VARCHAR(255)
+
+
+def _plain(row):
+    """date/datetime을 ISO 8601 문자열로 바꿉니다. (api/routes.py의 _serialize와 같은 형식)"""
+    return {k: v.isoformat() if isinstance(v, (datetime, date)) else v for k, v in row.items()}
+
+
+def iter_rows(conn, kind, user_id, batch_size=500, cursor_class=None):
+    """한 종류의 행을 서버 측 커서(백엔드의 server_side_cursor)로 batch_size개씩 읽어 하나씩 돌려줍니다."""
+    sql = EXPORT_QUERIES[kind][0]
+    # SQLite 연결의 cursor()는 인자를 무시합니다. (sqlite3 커서는 원래 한 단계씩 읽습니다)
+    with conn.cursor(cursor_class) as cursor:
+        cursor.execute(sql, (user_id,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+
+def _encode_csv(conn, kind, user_id, batch_size, cursor_class):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_QUERIES[kind][1])
+    buffer.write('\ufeff') # 엑셀에서 한글이 깨지지 않도록 BOM
+    writer.writeheader()
+    for row in iter_rows(conn, kind, user_id, batch_size, cursor_class):
+        writer.writerow(_plain(row))
+        if buffer.tell() >= 8192:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _encode_jsonl(conn, kinds, user_id, batch_size, cursor_class):
+    for kind in kinds:
+        for row in iter_rows(conn, kind, user_id, batch_size, cursor_class):
+            yield json.dumps(dict(type=kind, **_plain(row)), ensure_ascii=False) + '\n'
+
+
+def export_chunks(conn, user_id, kinds, fmt='jsonl', compress=None, batch_size=500, chunk_size=65536, cursor_class=None):
+    """
+    내보내기 본문을 bytes 조각으로 돌려주는 제너레이터.
+    CSV는 종류 하나만, JSONL은 여러 종류를 한 파일에 담습니다. (행마다 "type" 필드)
+    """
+    if fmt == 'csv':
+        if len(kinds) != 1:
+            raise ValueError("CSV는 한 번에 한 종류만 내보낼 수 있습니다.")
+        pieces = _encode_csv(conn, kinds[0], user_id, batch_size, cursor_class)
+    else:
+        pieces = _encode_jsonl(conn, kinds, user_id, batch_size, cursor_class)
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress == 'gzip' else None # wbits=31: gzip 헤더
+    pending = []
+    size = 0
+    for piece in pieces:
+        data = piece.encode('utf-8')
+        if compressor is not None:
+            data = compressor.compress(data)
+        if data:
+            pending.append(data)
+            size += len(data)
+        if size >= chunk_size:
+            yield b''.join(pending)
+            pending, size = [], 0
+    if compressor is not None:
+        pending.append(compressor.flush())
+    if pending:
+        yield b''.join(pending)
+
+
+def pooled_export(pool, backend, user_id, kinds, fmt='jsonl', **options):
+    """
+    풀에서 연결을 따로 빌려 export_chunks를 실행하는 제너레이터. 다 보냈거나 클라이언트가 끊어 닫히면 반납합니다.
+    (요청 연결(get_db_connection)은 스트리밍 도중 teardown_appcontext에서 반납되므로 응답 본문에서는 쓰지 않습니다)
+    """
+    conn = pool.acquire()
+    discard = False
+    try:
+        yield from export_chunks(conn, user_id, kinds, fmt, cursor_class=backend.server_side_cursor, **options)
+    except backend.disconnect_errors:
+        discard = True
+        raise
+    finally:
+        pool.release(conn, discard=discard)
+
+
+def export_filename(kinds, fmt, compress=None):
+    name = f"export-{kinds[0] if len(kinds) == 1 else 'all'}-{date.today().isoformat()}.{fmt}"
+    return name + '.gz' if compress == 'gzip' else name
+
+
+# --- 가져오기 ---
+
+def read_records(binary, fmt, kind=None, compressed=False):
+    """
+    바이너리 파일 객체에서 (종류, 행) 쌍을 한 줄씩 읽습니다.
+    CSV는 한 종류(kind)의 파일이고, JSONL은 행의 "type"으로 종류를 정합니다.
+    """
+    if compressed:
+        binary = gzip.GzipFile(fileobj=binary)
+    text = io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        for row in csv.DictReader(text):
+            yield kind, row
+        return
+    for line in text:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield kind, None # 읽을 수 없는 줄은 잘못된 행으로 셉니다.
+            continue
+        if not isinstance(row, dict):
+            yield kind, None
+            continue
+        row_kind = row.pop('type', kind)
+        # "type"이 문자열이 아니면(목록, 객체, 숫자 등) 잘못된 행입니다.
+        yield (row_kind, row) if row_kind is None or isinstance(row_kind, str) else (kind, None)
+
+
+def _text(row, field):
+    """문자열 필드 값. 없거나 null이면 '', 문자열이 아니면(목록, 숫자, 객체 등) None을 반환합니다."""
+    value = row.get(field)
+    if value is None:
+        return ''
+    return value if isinstance(value, str) else None
+
+
+def _parse_date(value):
+    if value and not isinstance(value, str):
+        raise ValueError(f"날짜가 문자열이 아닙니다: {value!r}")
+    return date.fromisoformat(value[:10]) if value else None
+
+
+def _parse_datetime(value):
+    if value and not isinstance(value, str):
+        raise ValueError(f"시각이 문자열이 아닙니다: {value!r}")
+    return datetime.fromisoformat(value).replace(microsecond=0) if value else None
+
+
+# 행을 INSERT 파라미터로 바꿉니다. 문자열 필드에 다른 타입이 오면 None(잘못된 행)을 반환하고,
+# 날짜/시각 형식 오류는 ValueError로 올려 import_records가 잘못된 행으로 셉니다.
+# (JSON의 목록/숫자를 그대로 INSERT에 넘기면 드라이버 오류가 되어 앞 배치만 커밋된 채 중단됩니다)
+
+def _diary_params(user_id, row, now):
+    entry_date = _parse_date(row.get('entry_date'))
+    title, content = _text(row, 'title'), _text(row, 'content')
+    if entry_date is None or title is None or not content:
+        return None
+    return (user_id, entry_date, title[:TEXT_MAX_LENGTH], content,
+            _parse_datetime(row.get('created_at')) or now, _parse_datetime(row.get('updated_at')) or now)
+
+
+def _todo_params(user_id, row, now):
+    task = _text(row, 'task')
+    task = task.strip() if task is not None else None
+    if not task or len(task) > TEXT_MAX_LENGTH:
+        return None
+    status = _text(row, 'status')
+    status = status if status in TODO_STATUSES else '미완료'
+    return (user_id, task, _parse_date(row.get('due_date')), status, _parse_datetime(row.get('created_at')) or now)
+
+
+def _post_params(user_id, row, now):
+    title, content = _text(row, 'title'), _text(row, 'content')
+    title = title.strip() if title is not None else None
+    if not title or len(title) > TEXT_MAX_LENGTH or not content:
+        return None
+    return (user_id, title, content,
+            _parse_datetime(row.get('created_at')) or now, _parse_datetime(row.get('updated_at')) or now)
+
+
+# 종류 -> (INSERT SQL, 행을 파라미터로 바꾸는 함수(잘못된 행이면 None))
+# {insert_ignore}: 같은 날짜의 일기(uq_diaries_user_date)는 건너뜁니다.
+IMPORT_STATEMENTS = {
+    'diaries': ("{insert_ignore} INTO diaries (user_id, entry_date, title, content, created_at, updated_at) "
+                "VALUES (%s, %s, %s, %s, %s, %s)", _diary_params),
+    'todos': ("INSERT INTO todos (user_id, task, due_date, status, created_at) VALUES (%s, %s, %s, %s, %s)", _todo_params),
+    'posts': ("INSERT INTO board (user_id, title, content, created_at, updated_at) VALUES (%s, %s, %s, %s, %s)", _post_params),
+}
+
+
+def import_records(conn, user_id, records, batch_size=500, echo=None, diary_months=None):
+    """
+    (종류, 행) iterable을 종류별로 batch_size개씩 INSERT합니다.
+    반환값: {종류: {'inserted', 'skipped_duplicate', 'skipped_invalid'},
+            'skipped_unsupported': 가져오지 않는 종류(댓글 등)의 행 수,
+            'skipped_invalid': 읽을 수 없어 종류도 알 수 없는 줄(JSON 오류, "type"이 문자열이 아님)의 수}
+    diary_months: 일기 배치를 커밋할 때마다 그 (연, 월)을 더할 set. 배치마다 커밋하므로 중간에 실패해도
+    이미 들어간 달이 남아 있어, 호출한 쪽이 finally에서 월 요약 캐시를 비울 수 있습니다.
+    """
+    insert_ignore = get_backend().insert_ignore
+    counts = {kind: {'inserted': 0, 'skipped_duplicate': 0, 'skipped_invalid': 0} for kind in IMPORT_STATEMENTS}
+    counts['skipped_unsupported'] = 0
+    counts['skipped_invalid'] = 0
+    pending = {kind: [] for kind in IMPORT_STATEMENTS}
+    now = datetime.now().replace(microsecond=0)
+
+    def flush(kind):
+        params = pending[kind]
+        if not params:
+            return
+        sql = IMPORT_STATEMENTS[kind][0].format(insert_ignore=insert_ignore)
+        with conn.cursor() as cursor:
+            cursor.executemany(sql, params)
+            inserted = max(cursor.rowcount, 0)
+        conn.commit()
+        counts[kind]['inserted'] += inserted
+        counts[kind]['skipped_duplicate'] += len(params) - inserted
+        if kind == 'diaries' and diary_months is not None:
+            diary_months.update((p[1].year, p[1].month) for p in params)
+        pending[kind] = []
+        if echo:
+            echo(f"  {kind}: {counts[kind]['inserted']}개 추가")
+
+    for kind, row in records:
+        if row is None and kind not in IMPORT_STATEMENTS:
+            counts['skipped_invalid'] += 1
+            continue
+        if kind not in IMPORT_STATEMENTS:
+            counts['skipped_unsupported'] += 1
+            continue
+        try:
+            params = IMPORT_STATEMENTS[kind][1](user_id, row, now) if row is not None else None
+        except (TypeError, ValueError, AttributeError):
+            params = None
+        if params is None:
+            counts[kind]['skipped_invalid'] += 1
+            continue
+        pending[kind].append(params)
+        if len(pending[kind]) >= batch_size:
+            flush(kind)
+    for kind in IMPORT_STATEMENTS:
+        flush(kind)
+    return counts
+
+
+# --- Flask CLI: flask data <command> ---
+data_cli = AppGroup('data', help='사용자 데이터 내보내기/가져오기 명령')
+
+
+def _user_id(conn, username):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT id FROM users WHERE username = %s", (username,))
+        row = cursor.fetchone()
+    if row is None:
+        raise click.ClickException(f"사용자가 없습니다: {username}")
+    return row['id']
+
+
+def _guess_format(path):
+    return 'jsonl' if path.endswith(('.jsonl', '.jsonl.gz', '.ndjson', '.ndjson.gz')) else 'csv'
+
+
+@data_cli.command('export')
+@click.argument('username')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@click.option('--kind', 'kinds', multiple=True, type=click.Choice(KINDS), help='생략하면 전부 (JSONL만)')
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), default=None, help='생략하면 확장자로 판단합니다.')
+def export_command(username, path, kinds, fmt):
+    """사용자의 일기/할 일/게시글/댓글을 CSV 또는 JSONL(.gz면 gzip) 파일로 내보냅니다."""
+    fmt = fmt or _guess_format(path)
+    compress = 'gzip' if path.endswith('.gz') else None
+    with _cli_connection() as conn, open(path, 'wb') as f:
+        for chunk in export_chunks(conn, _user_id(conn, username), list(kinds or KINDS), fmt, compress=compress,
+                                   cursor_class=get_backend().server_side_cursor):
+            f.write(chunk)
+    click.echo(f"내보내기 완료: {path}")
+
+
+@data_cli.command('import')
+@click.argument('username')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--kind', type=click.Choice(tuple(IMPORT_STATEMENTS)), default=None, help='CSV 파일의 종류')
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), default=None, help='생략하면 확장자로 판단합니다.')
+@click.option('--batch-size', type=int, default=500, help='한 번에 INSERT할 행 수')
+def import_command(username, path, kind, fmt, batch_size):
+    """내보내기 파일(CSV/JSONL, .gz 가능)을 사용자 계정으로 가져옵니다."""
+    from diary.summary import invalidate_month_summary
+
+    fmt = fmt or _guess_format(path)
+    if fmt == 'csv' and kind is None:
+        raise click.ClickException("CSV 파일은 --kind로 종류를 지정해야 합니다.")
+    diary_months = set()
+    with _cli_connection() as conn, open(path, 'rb') as f:
+        user_id = _user_id(conn, username)
+        try:
+            counts = import_records(conn, user_id, read_records(f, fmt, kind, compressed=path.endswith('.gz')),
+                                    batch_size=batch_size, echo=click.echo, diary_months=diary_months)
+        finally:
+            # 중간에 실패해도 이미 커밋된 배치의 달은 비웁니다.
+            for year, month in diary_months:
+                invalidate_month_summary(user_id, date(year, month, 1))
+    click.echo(f"완료: {json.dumps(counts, ensure_ascii=False)}")
+
+
+def register_data_cli(app):
+    """app.py에서 호출하여 'flask data' 명령 그룹을 등록합니다."""
+    app.cli.add_command(data_cli)
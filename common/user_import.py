@@ -0,0 +1,127 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import click
+from flask.cli import AppGroup
+from werkzeug.security import generate_password_hash
+
+from common.migrations import _cli_connection
+from common.passwords import get_hasher
+from common.utils import get_backend
+
+# 대량 사용자 가져오기 ('flask users import users.csv')
+# 파일은 한 줄씩 읽어 batch_size개씩 처리합니다.
+#   1) 파일 안의 중복과 이미 있는 username을 걸러냅니다. (배치당 SELECT 한 번, 해시 계산 전에 제외)
+#   2) 남은 비밀번호를 여러 프로세스에서 해시합니다. (scrypt/pbkdf2는 CPU 작업이라 프로세스 수만큼 빨라집니다)
+#   3) executemany로 한 번에 INSERT하고 배치마다 커밋합니다.
+# 사이에 누가 같은 이름으로 가입해도 INSERT IGNORE(SQLite: INSERT OR IGNORE)로 건너뜁니다.
+
+USERNAME_MAX_LENGTH = 50 # users.username VARCHAR(50)
+
+
+def read_users(path, fmt=None):
+    """CSV(username,password 헤더) 또는 JSONL({"username", "password"}) 파일에서 행을 하나씩 읽습니다.
+    password 대신 password_hash(werkzeug 형식)가 있으면 해시하지 않고 그대로 저장합니다."""
+    fmt = fmt or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+    with open(path, encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _hash_one(args):
+    password, method = args
+    return generate_password_hash(password, method)
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _existing_usernames(cursor, usernames):
+    placeholders = ', '.join(['%s'] * len(usernames))
+    cursor.execute(f"SELECT username FROM users WHERE username IN ({placeholders})", usernames)
+    return {row['username'] for row in cursor.fetchall()}
+
+
+def import_users(conn, rows, method, batch_size=1000, processes=None, echo=print):
+    """
+    rows(사전 iterable)를 batch_size개씩 가져옵니다.
+    반환값: {'inserted', 'skipped_duplicate', 'skipped_invalid'}
+    """
+    backend = get_backend()
+    insert_sql = f"{backend.insert_ignore} INTO users (username, password) VALUES (%s, %s)"
+    counts = {'inserted': 0, 'skipped_duplicate': 0, 'skipped_invalid': 0}
+    seen = set()
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        for batch in _batches(rows, batch_size):
+            pending = {}
+            for row in batch:
+                username = (row.get('username') or '').strip()
+                password = (row.get('password') or '').strip()
+                password_hash = (row.get('password_hash') or '').strip()
+                if not username or len(username) > USERNAME_MAX_LENGTH or not (password or password_hash):
+                    counts['skipped_invalid'] += 1
+                    continue
+                if username in seen:
+                    counts['skipped_duplicate'] += 1
+                    continue
+                seen.add(username)
+                pending[username] = (password, password_hash)
+
+            with conn.cursor() as cursor:
+                existing = _existing_usernames(cursor, list(pending)) if pending else set()
+            counts['skipped_duplicate'] += len(existing)
+            new_users = [(name, values) for name, values in pending.items() if name not in existing]
+
+            to_hash = [(password, method) for _, (password, password_hash) in new_users if not password_hash]
+            chunksize = max(1, len(to_hash) // ((processes or os.cpu_count() or 1) * 4))
+            hashed = iter(executor.map(_hash_one, to_hash, chunksize=chunksize))
+            params = [(name, password_hash or next(hashed)) for name, (_, password_hash) in new_users]
+
+            if params:
+                with conn.cursor() as cursor:
+                    cursor.executemany(insert_sql, params)
+                    inserted = max(cursor.rowcount, 0)
+                conn.commit()
+                counts['inserted'] += inserted
+                counts['skipped_duplicate'] += len(params) - inserted
+            echo(f"  {counts['inserted']}명 추가 (건너뜀: 중복 {counts['skipped_duplicate']}, 잘못된 행 {counts['skipped_invalid']})")
+    return counts
+
+
+# --- Flask CLI: flask users <command> ---
+user_cli = AppGroup('users', help='사용자 관리 명령')
+
+
+@user_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None, help='생략하면 확장자로 판단합니다.')
+@click.option('--batch-size', type=int, default=1000, help='한 번에 해시/INSERT할 행 수')
+@click.option('--processes', type=int, default=None, help='해시 계산 프로세스 수 (기본: CPU 수)')
+def import_command(path, fmt, batch_size, processes):
+    """CSV/JSONL 파일에서 사용자를 한꺼번에 가져옵니다. 이미 있는 username은 건너뜁니다."""
+    method = get_hasher().method # 로그인 때 재해시되지 않도록 앱 설정과 같은 방식으로 해시
+    click.echo(f"가져오는 중: {path} (해시 방식 {method})")
+    with _cli_connection() as conn:
+        counts = import_users(conn, read_users(path, fmt), method,
+                              batch_size=batch_size, processes=processes, echo=click.echo)
+    click.echo(f"완료: {counts['inserted']}명 추가, 중복 {counts['skipped_duplicate']}명, "
+               f"잘못된 행 {counts['skipped_invalid']}개 건너뜀")
+
+
+def register_user_cli(app):
+    """app.py에서 호출하여 'flask users' 명령 그룹을 등록합니다."""
+    app.cli.add_command(user_cli)
@@ -1,37 +1,174 @@
-import os
-import pymysql.cursors
-from flask import flash, current_app # current_app 임포트 추가
-
-def get_db_connection():
-    """데이터베이스 연결을 설정하고 반환합니다."""
-    print("DEBUG: Attempting to get DB connection...") # 디버깅용 로그
-
-    # Flask 앱의 현재 설정(app.config)에서 DB 정보 가져오기
-    # app.config는 config.py의 Config 클래스에서 로드된 설정들을 포함합니다.
-    db_host = current_app.config.get('DB_HOST')
-    db_user = current_app.config.get('DB_USER')
-    db_password = current_app.config.get('DB_PASSWORD')
-    db_name = current_app.config.get('DB_NAME')
-
-    # 필수 DB 환경 변수가 없는 경우 RuntimeError 발생 (엄격한 체크)
-    if not all([db_host, db_user, db_password, db_name]):
-        raise RuntimeError("데이터베이스 연결 환경 변수(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME)가 모두 설정되지 않았습니다. Apache 설정(flask_auth.conf) 또는 config.py를 확인해주세요.")
-
-    DB_CONFIG_RUNTIME = {
-        'host': db_host,
-        'user': db_user,
-        'password': db_password,
-        'db': db_name,
-        'charset': 'utf8mb4',
-        'cursorclass': pymysql.cursors.DictCursor
-    }
+import logging
+import threading
+import time
+from flask import flash, current_app, g, has_request_context, request, session # current_app 임포트 추가
+from common.db_backends import create_backend
+from common.db_pool import ConnectionPool, PoolTimeoutError
+from common.instrumentation import InstrumentedCursor, record_acquire
+from common.replicas import create_replica_set
 
+logger = logging.getLogger(__name__)
+
+_pool_lock = threading.RLock() # get_pool -> get_backend 중첩 호출
+
+# 읽기 복제본으로 보내도 되는 요청 메서드와, 최근에 쓰기를 한 사용자가 주 DB에서 읽을 기한(세션 키)
+READ_ONLY_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+PRIMARY_UNTIL_KEY = '_db_primary_until'
+
+
+def _build_pool(app):
+    """app.config의 DB/풀 설정으로 ConnectionPool을 생성합니다."""
+    backend = get_backend(app)
+    return ConnectionPool(
+        backend.connect,
+        pool_size=app.config.get('DB_POOL_SIZE', 5),
+        max_overflow=app.config.get('DB_POOL_MAX_OVERFLOW', 10),
+        timeout=app.config.get('DB_POOL_TIMEOUT', 10.0),
+        recycle=app.config.get('DB_POOL_RECYCLE', 3600),
+        pre_ping=app.config.get('DB_POOL_PRE_PING', True),
+        cursor_wrapper=InstrumentedCursor,
+        ping=backend.ping,
+    )
+
+
+def get_backend(app=None):
+    """앱의 DB 백엔드(DB_BACKEND 설정: mysql | sqlite)를 반환합니다. 처음 호출 시 생성합니다."""
+    app = app or current_app._get_current_object()
+    backend = app.extensions.get('db_backend')
+    if backend is None:
+        with _pool_lock:
+            backend = app.extensions.get('db_backend')
+            if backend is None:
+                backend = create_backend(app.config)
+                app.extensions['db_backend'] = backend
+    return backend
+
+
+def get_pool(app=None):
+    """앱에 연결된 ConnectionPool을 반환합니다. 처음 호출 시 생성합니다."""
+    app = app or current_app._get_current_object()
+    pool = app.extensions.get('db_pool')
+    if pool is None:
+        with _pool_lock:
+            pool = app.extensions.get('db_pool')
+            if pool is None:
+                pool = _build_pool(app)
+                app.extensions['db_pool'] = pool
+    return pool
+
+
+def get_replicas(app=None):
+    """앱의 읽기 복제본(ReplicaSet). DB_REPLICA_HOSTS가 없으면 None. (common/replicas.py)"""
+    app = app or current_app._get_current_object()
+    replicas = app.extensions.get('db_replicas')
+    if replicas is None:
+        with _pool_lock:
+            replicas = app.extensions.get('db_replicas')
+            if replicas is None:
+                replicas = create_replica_set(app, get_backend(app)) or False
+                app.extensions['db_replicas'] = replicas
+    return replicas or None
+
+
+def reads_from_replica():
+    """이 요청의 읽기를 복제본으로 보낼지. 쓰기 요청과 최근에 쓰기를 한 사용자(read-your-writes)는 주 DB에서 읽습니다."""
+    if not has_request_context() or request.method not in READ_ONLY_METHODS:
+        return False
+    if get_replicas() is None:
+        return False
+    primary_until = session.get(PRIMARY_UNTIL_KEY)
+    return not primary_until or primary_until < time.time()
+
+
+def _release_db_connection(exc=None):
+    """요청(앱 컨텍스트)이 끝날 때 빌린 연결을 풀에 반납합니다."""
+    conn = g.pop('_db_conn', None)
+    read_conn = g.pop('_db_read_conn', None)
+    if conn is None and read_conn is None:
+        return
+    # 연결 자체가 끊어진 오류였다면 풀에 돌려보내지 않고 버립니다.
+    discard = isinstance(exc, get_backend().disconnect_errors)
+    if conn is not None:
+        get_pool().release(conn, discard=discard)
+    if read_conn is not None:
+        replica, raw = read_conn
+        get_replicas().release(replica, raw, discard=discard)
+
+
+def _remember_write(response):
+    """
+    쓰기 요청에서 주 DB를 썼으면 DB_REPLICA_STICKY_SECONDS 동안 이 사용자의 읽기를 주 DB로 보냅니다.
+    로그인한 사용자만 기록합니다. 익명 POST(로그인 실패, 회원가입 시도 등)마다 세션에 키를 쓰면
+    서버 측 세션 저장소에 익명 세션이 끝없이 쌓입니다. (로그인 POST는 이 시점에 세션에 사용자가 있으므로 기록됩니다)
+    """
+    if (request.method not in READ_ONLY_METHODS and session.get('loggedin')
+            and g.get('_db_conn') is not None and get_replicas() is not None):
+        session[PRIMARY_UNTIL_KEY] = time.time() + current_app.config.get('DB_REPLICA_STICKY_SECONDS', 5)
+    return response
+
+
+def init_db_pool(app):
+    """앱에 DB 연결 풀 teardown 훅을 등록합니다. (app.py에서 한 번 호출)"""
+    app.extensions.setdefault('db_backend', None)
+    app.extensions.setdefault('db_pool', None)
+    app.extensions.setdefault('db_replicas', None)
+    app.teardown_appcontext(_release_db_connection)
+    app.after_request(_remember_write)
+
+
+def get_pool_stats():
+    """현재 앱의 연결 풀 통계(in-use, idle, waits, 체크아웃 지연 등)를 반환합니다. 복제본이 있으면 'read_replicas'에 함께 담습니다."""
+    stats = get_pool().stats()
+    replicas = get_replicas()
+    if replicas is not None:
+        stats['read_replicas'] = replicas.stats()
+    return stats
+
+
+def _get_replica_connection():
+    """이 요청의 복제본 연결. 쓸 수 있는 복제본이 없으면 None (이 요청은 주 DB에서 읽습니다)."""
+    held = g.get('_db_read_conn')
+    if held is not None:
+        return held[1]
+    if g.get('_db_read_unavailable'):
+        return None
+    started = time.perf_counter()
     try:
-        conn = pymysql.connect(**DB_CONFIG_RUNTIME)
-        print("DEBUG: DB connection successful!") # 디버깅용 로그
+        acquired = get_replicas().acquire()
+    finally:
+        record_acquire(time.perf_counter() - started)
+    if acquired is None:
+        g._db_read_unavailable = True
+        return None
+    g._db_read_conn = acquired
+    return acquired[1]
+
+
+def get_db_connection(primary=False):
+    """
+    현재 요청에 할당된 데이터베이스 연결을 반환합니다.
+    요청마다 풀에서 한 번만 빌리고, 같은 요청 안의 후속 호출은 같은 연결을 재사용합니다.
+    반환된 연결의 close()는 무시되며 요청 종료 시 자동으로 풀에 반납됩니다.
+    읽기 복제본(DB_REPLICA_HOSTS)이 있으면 GET/HEAD 요청에는 복제본 연결을 돌려줍니다.
+    GET 요청에서 써야 하거나 방금 쓴 값을 읽어야 하면 primary=True로 주 DB 연결을 받습니다.
+    """
+    if not primary and reads_from_replica():
+        conn = _get_replica_connection()
+        if conn is not None:
+            return conn
+
+    conn = g.get('_db_conn')
+    if conn is not None:
         return conn
-    except pymysql.Error as e:
-        print(f"DEBUG: DB connection failed in get_db_connection: {e}") # 디버깅용 로그
+
+    started = time.perf_counter()
+    try:
+        conn = get_pool().acquire()
+    except (get_backend().Error, PoolTimeoutError) as e:
+        logger.error("DB connection failed in get_db_connection: %s", e)
         flash('데이터베이스 연결 오류가 발생했습니다. 잠시 후 다시 시도해주세요.', 'error')
         raise
-
+    finally:
+        record_acquire(time.perf_counter() - started)
+    g._db_conn = conn
+    return conn
@@ -0,0 +1,219 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from flask import current_app
+
+from common.cache import get_cache
+from common.utils import get_backend, get_db_connection, get_pool
+
+logger = logging.getLogger(__name__)
+
+# 게시글 조회수 (board.views, migrations/0005_board_views.sql)
+# view_post마다 UPDATE board SET views = views + 1을 실행하면 인기 글 행에 쓰기 잠금이 몰리므로,
+# 조회는 프로세스 메모리의 Counter에 더하기만 하고(요청 경로에서는 DB에 쓰지 않음) 백그라운드 스레드가
+# VIEW_FLUSH_INTERVAL초마다, 또는 쌓인 조회가 VIEW_FLUSH_THRESHOLD를 넘으면 바로 한꺼번에 반영합니다.
+#   UPDATE board SET views = views + CASE id WHEN 3 THEN 12 WHEN 7 THEN 2 END, updated_at = updated_at WHERE id IN (3, 7)
+# - id 순서로 정렬해 보내므로 여러 mod_wsgi 프로세스가 동시에 반영해도 교착 상태가 생기지 않습니다.
+# - 반영에 실패하면 값을 다시 Counter에 돌려놓고 다음 주기에 재시도합니다.
+# - 게시글 본문 조각 캐시(board:post:<id>)에는 views를 넣지 않습니다. 반영된 값은 board:views:<id>에 따로
+#   VIEW_FLUSH_INTERVAL 동안 캐시하고, 반영할 때 이 작은 항목만 지웁니다. (본문 캐시는 그대로 유지)
+# - 워커가 정상 종료(재활용)될 때 atexit에서 남은 값을 반영하므로, 비정상 종료 때만 최대 한 주기 분량을 잃습니다.
+# 프로세스마다 따로 모으므로 프로세스 간 공유 메모리는 쓰지 않습니다. (프로세스 수 x 주기마다 UPDATE 한 번)
+
+
+class ViewCounter:
+    """조회수를 메모리에 모았다가 여러 행을 한 번에 더하는 버퍼."""
+
+    def __init__(self, app, interval=10, threshold=1000, batch_size=500):
+        self.app = app
+        self.interval = interval
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self._pending = Counter() # post_id -> 아직 반영하지 않은 조회 수
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        # 통계
+        self.recorded = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.failures = 0
+        self.last_flush_ms = 0.0
+
+    def add(self, post_id, count=1):
+        """조회 한 번을 기록합니다. DB에는 쓰지 않습니다."""
+        with self._lock:
+            self._pending[post_id] += count
+            self._pending_total += count
+            self.recorded += count
+            over_threshold = self._pending_total >= self.threshold
+        self._ensure_thread()
+        if over_threshold:
+            self._wake.set()
+
+    def pending(self, post_id):
+        """이 프로세스에서 아직 반영하지 않은 조회 수. (화면에 DB 값과 더해서 보여줄 때)"""
+        return self._pending.get(post_id, 0)
+
+    def _ensure_thread(self):
+        # mod_wsgi가 프로세스를 fork한 뒤 첫 조회 때 그 프로세스의 스레드를 시작합니다.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='view-counter', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """쌓인 조회 수를 DB에 반영합니다. 반영한 조회 수를 반환합니다."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                pending, self._pending = self._pending, Counter()
+                self._pending_total = 0
+            started = time.perf_counter()
+            try:
+                self._write(sorted(pending.items()))
+            except Exception as e:
+                with self._lock:
+                    self._pending.update(pending)
+                    self._pending_total += sum(pending.values())
+                    self.failures += 1
+                logger.warning("조회수 반영 실패 (다음 주기에 다시 시도합니다): %s", e)
+                return 0
+            self._invalidate(pending)
+            flushed = sum(pending.values())
+            with self._lock:
+                self.flushed += flushed
+                self.flushes += 1
+                self.last_flush_ms = round((time.perf_counter() - started) * 1000, 3)
+            return flushed
+
+    def _write(self, items):
+        # 요청 밖(백그라운드 스레드, atexit)에서 실행되므로 요청 연결 대신 풀에서 직접 빌립니다.
+        backend = get_backend(self.app)
+        pool = get_pool(self.app)
+        conn = pool.acquire()
+        discard = False
+        try:
+            with conn.cursor() as cursor:
+                for start in range(0, len(items), self.batch_size):
+                    batch = items[start:start + self.batch_size]
+                    cases = ' '.join(['WHEN %s THEN %s'] * len(batch))
+                    placeholders = ', '.join(['%s'] * len(batch))
+                    # updated_at = updated_at: MySQL의 ON UPDATE CURRENT_TIMESTAMP로 수정 시각이 바뀌지 않게 합니다.
+                    sql = f"UPDATE board SET views = views + CASE id {cases} END, updated_at = updated_at " \
+                          f"WHERE id IN ({placeholders})"
+                    params = [value for item in batch for value in item] + [post_id for post_id, _ in batch]
+                    cursor.execute(sql, params)
+            conn.commit()
+        except backend.disconnect_errors:
+            discard = True
+            raise
+        finally:
+            pool.release(conn, discard=discard)
+
+    def _invalidate(self, post_ids):
+        # 요청 밖에서도 호출되므로 get_cache() 대신 앱의 캐시를 직접 씁니다.
+        cache = self.app.extensions.get('cache')
+        if cache is None:
+            return
+        try:
+            cache.delete(*(views_cache_key(post_id) for post_id in post_ids))
+        except Exception as e:
+            logger.warning("조회수 반영 후 조회수 캐시 삭제 실패: %s", e)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending_posts': len(self._pending),
+                'pending_views': self._pending_total,
+                'recorded': self.recorded,
+                'flushed': self.flushed,
+                'flushes': self.flushes,
+                'failures': self.failures,
+                'last_flush_ms': self.last_flush_ms,
+            }
+
+
+def init_view_counter(app):
+    """VIEW_COUNTER가 켜져 있으면 조회수 버퍼를 만들고 종료 시 반영하도록 등록합니다. (app.py에서 한 번 호출)"""
+    if not app.config.get('VIEW_COUNTER', True):
+        app.extensions['view_counter'] = None
+        return None
+    counter = ViewCounter(
+        app,
+        interval=app.config.get('VIEW_FLUSH_INTERVAL', 10),
+        threshold=app.config.get('VIEW_FLUSH_THRESHOLD', 1000),
+        batch_size=app.config.get('VIEW_FLUSH_BATCH', 500),
+    )
+    app.extensions['view_counter'] = counter
+    atexit.register(counter.flush)
+    return counter
+
+
+def get_view_counter(app=None):
+    """현재 앱의 ViewCounter. VIEW_COUNTER가 꺼져 있으면 None."""
+    app = app or current_app._get_current_object()
+    return app.extensions.get('view_counter')
+
+
+def record_view(post_id):
+    """view_post에서 호출합니다."""
+    counter = get_view_counter()
+    if counter is not None:
+        counter.add(post_id)
+
+
+# 반영된 조회수만 읽는 쿼리 (PK 조회). 결과는 views_cache_key에 views_cache_ttl() 동안 캐시합니다.
+STORED_VIEWS_SQL = "SELECT views FROM board WHERE id = %s"
+
+
+def views_cache_key(post_id):
+    return f"board:views:{post_id}"
+
+
+def views_cache_ttl():
+    # 캐시 ttl 0은 만료 없음이므로 최소 1초
+    return max(1, current_app.config.get('VIEW_FLUSH_INTERVAL', 10))
+
+
+def current_views(post_id, stored_views):
+    """DB에 반영된 views(캐시된 값)에 이 프로세스의 미반영 조회 수를 더합니다."""
+    counter = get_view_counter()
+    return (stored_views or 0) + (counter.pending(post_id) if counter is not None else 0)
+
+
+def popular_posts(limit=None):
+    """
+    조회수 상위 게시글 [{id, title, views, created_at, username}]. (idx_board_views 사용)
+    반영된 조회수로 계산하며 결과는 POPULAR_POSTS_TTL 동안 캐시합니다.
+    """
+    limit = limit or current_app.config.get('POPULAR_POSTS_LIMIT', 10)
+
+    def load():
+        conn = get_db_connection()
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT b.id, b.title, b.views, b.created_at, u.username "
+                           "FROM board b JOIN users u ON b.user_id = u.id "
+                           "ORDER BY b.views DESC, b.id DESC LIMIT %s", (limit,))
+            return cursor.fetchall()
+
+    return get_cache().get_or_set(f"board:popular:{limit}", load,
+                                  ttl=current_app.config.get('POPULAR_POSTS_TTL', 60))
@@ -1,14 +1,19 @@
 import os
-from dotenv import load_dotenv, find_dotenv
+import logging
 import binascii
 
-# .env 파일에서 환경 변수 로드
-dotenv_path = find_dotenv('/var/www/html/your_flask_app/.env')
+logger = logging.getLogger(__name__)
+
+# .env 파일에서 환경 변수 로드 (모듈을 처음 import할 때 한 번)
+# 경로가 정해져 있으므로 find_dotenv로 디렉터리를 탐색하지 않고, 파일이 있을 때만 python-dotenv를 불러옵니다.
+# Apache 설정(SetEnv)으로 환경 변수를 넘기는 배포에서는 .env가 없어도 정상입니다.
+dotenv_path = os.getenv('DOTENV_PATH', '/var/www/html/your_flask_app/.env')
 if os.path.exists(dotenv_path):
+    from dotenv import load_dotenv
     load_dotenv(dotenv_path)
-    print("DEBUG: .env variables loaded from explicit path in config.py.")
+    logger.debug(".env variables loaded from explicit path in config.py.")
 else:
-    print(f"WARNING: .env file not found at {dotenv_path}. Environment variables might not be loaded.")
+    logger.info(".env file not found at %s. Environment variables might not be loaded.", dotenv_path)
 
 class Config:
     """Flask 애플리케이션의 기본 설정 클래스."""
@@ -17,7 +22,8 @@ class Config:
     SECRET_KEY = os.getenv('FLASK_SECRET_KEY')
     if not SECRET_KEY:
         SECRET_KEY = binascii.hexlify(os.urandom(24)).decode('utf-8')
-        print(f"WARNING: FLASK_SECRET_KEY not found. Using temporary key: {SECRET_KEY}")
+        # 임시 키 값은 로그에 남기지 않습니다.
+        logger.warning("FLASK_SECRET_KEY not found. Using a temporary random key.")
 
     # 2. 데이터베이스 연결 정보 로드 (기존 로직 유지)
     DB_USER = os.getenv('DB_USER', 'flask_user')
@@ -26,6 +32,138 @@ class Config:
     DB_NAME = os.getenv('DB_NAME', 'flask_auth_db')
     DB_PORT = os.getenv('DB_PORT', '3306') # 포트도 환경 변수에서 가져오도록 추가
 
+    # DB 백엔드 (common/db_backends.py)
+    # 'mysql' (기본) 또는 'sqlite' (원격 MySQL 없이 단일 노드 배포, 로컬 개발, CI/벤치마크)
+    DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+    SQLITE_PATH = os.getenv('SQLITE_PATH', '') # 비워두면 프로젝트의 instance/app.db
+    SQLITE_BUSY_TIMEOUT = float(os.getenv('SQLITE_BUSY_TIMEOUT', '5')) # 쓰기 잠금 대기(초)
+    SQLITE_STATEMENT_CACHE = int(os.getenv('SQLITE_STATEMENT_CACHE', '256')) # 연결별 준비된 문장 캐시 크기
+    SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', '20000')) # 연결별 페이지 캐시
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(128 * 1024 * 1024)))
+
+    # 2-1. DB 연결 풀 설정 (common/db_pool.py)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5')) # 유지할 유휴 연결 수
+    DB_POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', '10')) # pool_size를 넘어 임시로 열 수 있는 연결 수
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10')) # 연결을 얻기 위해 기다리는 최대 시간(초)
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '3600')) # 이 시간(초)보다 오래된 연결은 닫고 새로 엽니다
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes') # 체크아웃 시 ping으로 상태 확인
+    DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '10'))
+    DB_ASYNC_WORKERS = int(os.getenv('DB_ASYNC_WORKERS', '8')) # async def 뷰의 쿼리를 실행할 스레드 수 (common/async_db.py)
+
+    # 2-2. 게시판 목록 페이지네이션
+    BOARD_PAGE_SIZE = int(os.getenv('BOARD_PAGE_SIZE', '20')) # 한 페이지에 보여줄 게시글 수
+    BOARD_MAX_PAGE_SIZE = int(os.getenv('BOARD_MAX_PAGE_SIZE', '100')) # ?size= 로 요청 가능한 최대값
+    BOARD_EXCERPT_LENGTH = int(os.getenv('BOARD_EXCERPT_LENGTH', '100')) # 목록에 표시할 본문 미리보기 길이
+    COMMENT_PAGE_SIZE = int(os.getenv('COMMENT_PAGE_SIZE', '50')) # view_post 댓글 한 페이지 크기
+
+    # 2-3. 검색 설정 (common/search.py)
+    # 'fulltext' (MySQL ngram FULLTEXT), 'memory' (프로세스 내 역색인, MariaDB 등), 'like' (기존 방식)
+    SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'fulltext')
+    SEARCH_INDEX_TTL = int(os.getenv('SEARCH_INDEX_TTL', '300')) # memory 백엔드 색인 전체 재구축 주기(초, 백그라운드)
+    SEARCH_INDEX_REFRESH = int(os.getenv('SEARCH_INDEX_REFRESH', '30')) # memory 백엔드 새 행 반영 주기(초, 백그라운드)
+    TODO_SEARCH_PAGE_SIZE = int(os.getenv('TODO_SEARCH_PAGE_SIZE', '50'))
+    TODO_BULK_MAX = int(os.getenv('TODO_BULK_MAX', '500')) # /todos/bulk 한 번에 처리할 최대 항목 수
+    TODO_PAGE_SIZE = int(os.getenv('TODO_PAGE_SIZE', '50')) # /todos 목록 한 페이지 크기 (검색하지 않을 때)
+
+    # 2-4. JSON API (/api/v1)
+    API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', '20'))
+    API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '100'))
+    # 세션 사용자별 응답이므로 기본은 private. 클라이언트는 매번 ETag로 재검증합니다.
+    API_CACHE_CONTROL = os.getenv('API_CACHE_CONTROL', 'private, no-cache')
+
+    # 2-5. 캐시 (common/cache.py)
+    # 'memory' (프로세스별 LRU), 'file' (CACHE_DIR 공유, mod_wsgi 프로세스 간 무효화 반영), 'null' (끄기)
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_DIR = os.getenv('CACHE_DIR', '') # 비워두면 instance/cache. 이 프로세스 사용자 소유의 0700 디렉터리여야 합니다.
+    CACHE_FILE_MAX_ENTRIES = int(os.getenv('CACHE_FILE_MAX_ENTRIES', '10000')) # file 백엔드 최대 항목 수
+    CACHE_PURGE_INTERVAL = int(os.getenv('CACHE_PURGE_INTERVAL', '60')) # file 백엔드 만료 항목 정리 주기(초)
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', '300'))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '2048')) # memory 백엔드 LRU 크기
+    POST_CACHE_TTL = int(os.getenv('POST_CACHE_TTL', '300')) # view_post 게시글/댓글 조각
+    DIARY_SUMMARY_TTL = int(os.getenv('DIARY_SUMMARY_TTL', '600')) # 일기 월 요약
+
+    # 2-6. 로깅/계측 (common/log.py, common/instrumentation.py)
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_BUFFER_CAPACITY = int(os.getenv('LOG_BUFFER_CAPACITY', '200')) # 이 개수만큼 모아서 한 번에 기록
+    REQUEST_LOG = os.getenv('REQUEST_LOG', 'false').lower() in ('1', 'true', 'yes') # 요청별 JSON 로그
+
+    # 2-7. 쿼리 프로파일러 (common/profiler.py, 'flask db slow-queries'로 조회)
+    QUERY_PROFILER = os.getenv('QUERY_PROFILER', 'false').lower() in ('1', 'true', 'yes')
+    QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', '5')) # 한 요청에서 같은 지문이 이만큼 반복되면 N+1 경고
+    QUERY_TIME_BUDGET_MS = int(os.getenv('QUERY_TIME_BUDGET_MS', '200')) # 요청당 SQL 시간 예산
+    QUERY_REPORT_DIR = os.getenv('QUERY_REPORT_DIR', '') # 비워두면 시스템 임시 디렉터리 아래에 생성
+    QUERY_REPORT_WINDOW = int(os.getenv('QUERY_REPORT_WINDOW', '3600')) # 롤링 집계 기간(초)
+    QUERY_REPORT_INTERVAL = int(os.getenv('QUERY_REPORT_INTERVAL', '30')) # 리포트 파일 갱신 주기(초)
+
+    # 2-8. 세션/사용자 캐시 (common/sessions.py, common/auth.py)
+    # 'file' (SESSION_DIR 공유, 기본), 'memory' (프로세스별), 'redis' (SESSION_REDIS_URL), 'cookie' (기존 서명 쿠키)
+    SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'file')
+    SESSION_DIR = os.getenv('SESSION_DIR', '') # 비워두면 instance/sessions. 이 프로세스 사용자 소유의 0700 디렉터리여야 합니다.
+    SESSION_REDIS_URL = os.getenv('SESSION_REDIS_URL', 'local://')
+    SESSION_IDLE_TIMEOUT = int(os.getenv('SESSION_IDLE_TIMEOUT', '7200')) # 마지막 요청 후 이 시간(초)이 지나면 만료
+    SESSION_REFRESH_RATIO = float(os.getenv('SESSION_REFRESH_RATIO', '0.5')) # 남은 시간이 이 비율 아래일 때만 만료 시각 갱신
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '60'))
+    USER_CACHE_MAX_ENTRIES = int(os.getenv('USER_CACHE_MAX_ENTRIES', '10000'))
+
+    # 2-9. 비밀번호 해시/로그인 제한 (common/passwords.py, common/ratelimit.py)
+    # werkzeug 형식. 'scrypt:n:r:p' 또는 'pbkdf2:sha256:iterations'. 바꾸면 기존 사용자는 다음 로그인 때 다시 해시됩니다.
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2')) # 동시에 해시를 계산하는 스레드 수 (프로세스당)
+    PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', '32')) # 이보다 많이 밀리면 즉시 거절
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', '10')) # 요청이 결과를 기다리는 최대 시간(초)
+    LOGIN_THROTTLE = os.getenv('LOGIN_THROTTLE', 'true').lower() in ('1', 'true', 'yes')
+    LOGIN_LIMIT_PER_USER = int(os.getenv('LOGIN_LIMIT_PER_USER', '5')) # 사용자 이름별 LOGIN_LIMIT_WINDOW초 동안 허용 횟수
+    LOGIN_LIMIT_PER_IP = int(os.getenv('LOGIN_LIMIT_PER_IP', '30')) # IP별 허용 횟수 (로그인 + 가입)
+    LOGIN_LIMIT_WINDOW = int(os.getenv('LOGIN_LIMIT_WINDOW', '60'))
+    LOGIN_LIMIT_MAX_KEYS = int(os.getenv('LOGIN_LIMIT_MAX_KEYS', '100000'))
+
+    # 2-10. 템플릿/정적 파일 (common/templating.py)
+    TEMPLATE_CACHE_DIR = os.getenv('TEMPLATE_CACHE_DIR', '') # 컴파일된 템플릿 저장 위치. 비워두면 임시 디렉터리, 'off'면 끄기
+    STATIC_MAX_AGE = int(os.getenv('STATIC_MAX_AGE', '31536000')) # 버전(?v=)이 붙은 정적 파일의 캐시 기간(초)
+
+    # 2-11. 응답 압축 (common/compression.py)
+    # Apache(mod_deflate) 등 앞단에서 이미 압축한다면 COMPRESSION=false로 끕니다.
+    COMPRESSION = os.getenv('COMPRESSION', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '500')) # 이보다 작은 응답(바이트)은 압축하지 않음
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', '6')) # gzip 수준 (1~9)
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '4')) # 동적 응답의 brotli 품질 (0~11, brotli 설치 시)
+    # 압축할 Content-Type (쉼표로 구분). 비워두면 common/compression.py의 DEFAULT_TYPES
+    COMPRESSION_TYPES = [t.strip() for t in os.getenv('COMPRESSION_TYPES', '').split(',') if t.strip()]
+
+    # 2-12. 읽기 복제본 (common/replicas.py, MySQL 백엔드만)
+    # 'host[:port]'를 쉼표로 구분. 계정/DB 이름은 DB_USER/DB_PASSWORD/DB_NAME을 그대로 씁니다. 비워두면 모두 주 DB에서 읽습니다.
+    DB_REPLICA_HOSTS = os.getenv('DB_REPLICA_HOSTS', '')
+    DB_REPLICA_STICKY_SECONDS = float(os.getenv('DB_REPLICA_STICKY_SECONDS', '5')) # 쓰기 후 이 시간(초) 동안 그 사용자는 주 DB에서 읽기
+    DB_REPLICA_MAX_LAG = int(os.getenv('DB_REPLICA_MAX_LAG', '0')) # 복제 지연이 이보다 큰(초) 복제본 제외. 0이면 확인 안 함
+    DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_LAG_CHECK_INTERVAL', '5')) # 복제본별 지연 확인 주기(초)
+    DB_REPLICA_RETRY = float(os.getenv('DB_REPLICA_RETRY', '30')) # 실패한 복제본을 다시 시도하기까지(초)
+    DB_REPLICA_CONNECT_TIMEOUT = int(os.getenv('DB_REPLICA_CONNECT_TIMEOUT', '2'))
+    DB_REPLICA_POOL_TIMEOUT = float(os.getenv('DB_REPLICA_POOL_TIMEOUT', '1')) # 복제본 풀이 바쁠 때 기다리는 시간(초)
+
+    # 2-13. 워커 시작/예열 (common/startup.py)
+    PRELOAD_DB_CONNECTIONS = int(os.getenv('PRELOAD_DB_CONNECTIONS', '2')) # 예열 때 미리 열어 둘 DB 연결 수 (0이면 열지 않음)
+    # 블루프린트 모듈을 첫 요청 직전에 import/등록 (예열하지 않는 CLI/개발 서버용. wsgi.py는 예열 단계에서 등록)
+    LAZY_BLUEPRINTS = os.getenv('LAZY_BLUEPRINTS', 'false').lower() in ('1', 'true', 'yes')
+
+    # 2-14. 데이터 내보내기/가져오기 (common/user_data.py)
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '500')) # 서버 측 커서에서 한 번에 읽을 행 수
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '65536')) # 응답으로 한 번에 보낼 바이트 수
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '500')) # executemany 한 번에 INSERT할 행 수 (배치마다 커밋)
+
+    # 2-15. 게시글 조회수 (common/view_counts.py)
+    VIEW_COUNTER = os.getenv('VIEW_COUNTER', 'true').lower() in ('1', 'true', 'yes')
+    VIEW_FLUSH_INTERVAL = float(os.getenv('VIEW_FLUSH_INTERVAL', '10')) # 메모리에 모은 조회수를 DB에 반영하는 주기(초)
+    VIEW_FLUSH_THRESHOLD = int(os.getenv('VIEW_FLUSH_THRESHOLD', '1000')) # 쌓인 조회가 이만큼이면 주기를 기다리지 않고 반영
+    VIEW_FLUSH_BATCH = int(os.getenv('VIEW_FLUSH_BATCH', '500')) # UPDATE 한 문장에 담을 게시글 수
+    POPULAR_POSTS_LIMIT = int(os.getenv('POPULAR_POSTS_LIMIT', '10')) # 인기 글 목록 길이
+    POPULAR_POSTS_TTL = int(os.getenv('POPULAR_POSTS_TTL', '60')) # 인기 글 목록 캐시 시간(초)
+
+    # 2-16. 모니터링 엔드포인트 (/metrics, /health/*)와 Server-Timing 헤더 (common/instrumentation.py)
+    # 꺼져 있으면 라우트를 등록하지 않습니다. 켜져 있으면 MONITORING_TOKEN이 있을 때는
+    # 'Authorization: Bearer <토큰>' 요청만, 없을 때는 같은 서버(127.0.0.1, ::1)에서 온 요청만 허용합니다.
+    MONITORING = os.getenv('MONITORING', 'true').lower() in ('1', 'true', 'yes')
+    MONITORING_TOKEN = os.getenv('MONITORING_TOKEN', '')
+
     # 3. SQLAlchemy 설정 추가 (가장 중요한 부분)
     # 위에서 로드한 DB 정보들을 조합하여 SQLAlchemy 연결 URI를 생성합니다.
     SQLALCHEMY_DATABASE_URI = (
@@ -38,3 +176,66 @@ class Config:
     # (선택사항) 실행되는 SQL 쿼리를 터미널에 출력하고 싶을 때 True로 설정
     # 개발 시에는 True로 두면 디버깅에 매우 유용합니다.
     SQLALCHEMY_ECHO = False
+
+
+# --- 설정 검증 (create_app에서 앱을 만들 때 한 번 호출) ---
+_CHOICES = {
+    'DB_BACKEND': ('mysql', 'sqlite'),
+    'SEARCH_BACKEND': ('fulltext', 'memory', 'like'),
+    'CACHE_BACKEND': ('memory', 'file', 'null'),
+    'SESSION_BACKEND': ('file', 'memory', 'redis', 'cookie'),
+}
+
+# (이름, 최솟값, 최댓값)
+_RANGES = (
+    ('DB_POOL_SIZE', 1, None),
+    ('DB_POOL_MAX_OVERFLOW', 0, None),
+    ('DB_POOL_TIMEOUT', 0, None),
+    ('DB_ASYNC_WORKERS', 1, None),
+    ('PASSWORD_HASH_WORKERS', 1, None),
+    ('PASSWORD_HASH_QUEUE', 1, None),
+    ('COMPRESSION_LEVEL', 1, 9),
+    ('COMPRESSION_BROTLI_QUALITY', 0, 11),
+    ('PRELOAD_DB_CONNECTIONS', 0, None),
+    ('EXPORT_BATCH_SIZE', 1, None),
+    ('EXPORT_CHUNK_SIZE', 1, None),
+    ('IMPORT_BATCH_SIZE', 1, None),
+    ('VIEW_FLUSH_INTERVAL', 0.1, None),
+    ('VIEW_FLUSH_THRESHOLD', 1, None),
+    ('VIEW_FLUSH_BATCH', 1, None),
+    ('POPULAR_POSTS_LIMIT', 1, 100),
+    ('TODO_PAGE_SIZE', 1, 1000),
+    ('CACHE_FILE_MAX_ENTRIES', 1, None),
+    ('CACHE_PURGE_INTERVAL', 1, None),
+    ('SEARCH_INDEX_REFRESH', 1, None),
+)
+
+
+def validate_config(config):
+    """
+    요청을 받기 전에 설정 오류를 한꺼번에 찾아 RuntimeError로 알립니다.
+    (이전에는 DB 접속 정보 누락 같은 오류가 첫 요청에서야 드러났습니다.)
+    """
+    problems = []
+    for name, choices in _CHOICES.items():
+        if config.get(name) not in choices:
+            problems.append(f"{name}={config.get(name)!r} (가능한 값: {', '.join(choices)})")
+    for name, low, high in _RANGES:
+        value = config.get(name)
+        if value is None:
+            continue
+        if (low is not None and value < low) or (high is not None and value > high):
+            problems.append(f"{name}={value} (범위: {low} ~ {high if high is not None else ''})")
+    if config.get('DB_BACKEND') == 'mysql':
+        missing = [name for name in ('DB_HOST', 'DB_USER', 'DB_PASSWORD', 'DB_NAME') if not config.get(name)]
+        if missing:
+            problems.append(f"MySQL 접속 정보 누락: {', '.join(missing)}")
+    method = config.get('PASSWORD_HASH_METHOD', '')
+    if not method.startswith(('scrypt', 'pbkdf2')):
+        problems.append(f"PASSWORD_HASH_METHOD={method!r} ('scrypt:n:r:p' 또는 'pbkdf2:sha256:iterations')")
+    for item in config.get('DB_REPLICA_HOSTS', '').split(','):
+        port = item.strip().partition(':')[2]
+        if port and not port.isdigit():
+            problems.append(f"DB_REPLICA_HOSTS의 포트가 숫자가 아닙니다: {item.strip()!r}")
+    if problems:
+        raise RuntimeError("설정 오류:\n  " + "\n  ".join(problems))
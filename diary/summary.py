@@ -0,0 +1,38 @@
+from flask import current_app
+
+from common.cache import get_cache
+from common.utils import get_db_connection
+from common.calendar_service import month_range
+
+
+def _summary_key(user_id, year, month):
+    return f"diary:summary:{user_id}:{year}:{month}"
+
+
+def load_month_summary(user_id, year, month):
+    """
+    사용자의 월별 일기 요약을 반환합니다. {'entry_count', 'entry_dates', 'days'}
+    (user_id, entry_date) 인덱스만으로 처리되도록 컬럼을 함수로 감싸지 않고 날짜 범위로 조회합니다.
+    결과는 공용 캐시(common/cache.py)에 저장되며, 일기가 작성/수정되면 해당 월만 무효화됩니다.
+    캐시 적중 시에는 DB 연결을 빌리지 않습니다.
+    """
+    def load():
+        start, end = month_range(year, month)
+        conn = get_db_connection()
+        with conn.cursor() as cursor:
+            sql = "SELECT entry_date FROM diaries WHERE user_id = %s AND entry_date >= %s AND entry_date < %s ORDER BY entry_date"
+            cursor.execute(sql, (user_id, start, end))
+            entry_dates = [row['entry_date'] for row in cursor.fetchall()]
+        return {
+            'entry_count': len(entry_dates),
+            'entry_dates': entry_dates,
+            'days': frozenset(d.day for d in entry_dates),
+        }
+
+    return get_cache().get_or_set(_summary_key(user_id, year, month), load,
+                                  ttl=current_app.config.get('DIARY_SUMMARY_TTL', 600))
+
+
+def invalidate_month_summary(user_id, entry_date):
+    """일기 작성/수정 후 해당 월 요약 캐시를 비웁니다."""
+    get_cache().delete(_summary_key(user_id, entry_date.year, entry_date.month))
@@ -0,0 +1,8 @@
+-- 게시판/To-Do 검색용 FULLTEXT 인덱스 (common/search.py의 'fulltext' 백엔드)
+-- 한국어 본문이므로 공백 기준이 아닌 ngram 파서를 사용합니다. (MySQL 5.7.6+ / 8.0)
+-- ngram_token_size는 서버 기본값 2를 전제로 합니다. (common.search.NGRAM_SIZE와 일치)
+-- MariaDB는 ngram 파서를 지원하지 않으므로 SEARCH_BACKEND='memory'를 사용하세요.
+
+ALTER TABLE board ADD FULLTEXT INDEX ft_board_title_content (title, content) WITH PARSER ngram;
+
+ALTER TABLE todos ADD FULLTEXT INDEX ft_todos_task (task) WITH PARSER ngram;
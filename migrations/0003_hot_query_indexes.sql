@@ -0,0 +1,20 @@
+-- 블루프린트의 주요 조회 쿼리가 사용하는 복합 인덱스.
+-- 이미 같은 이름의 인덱스가 있으면(ER_DUP_KEYNAME) 마이그레이션 러너가 건너뜁니다.
+
+-- auth.login / auth.register: WHERE username = ?
+-- 기존 DB에 중복 아이디/같은 날짜의 일기가 있으면 UNIQUE 인덱스를 만들 수 없으므로, 러너가 적용 전에
+-- 중복을 보고하고 멈춥니다. (common/migrations.py의 PREFLIGHT_CHECKS, 'flask db preflight')
+ALTER TABLE users ADD UNIQUE INDEX uq_users_username (username);
+
+-- board.board_list: ORDER BY created_at DESC, id DESC + 키셋 커서
+CREATE INDEX idx_board_created ON board (created_at, id);
+
+-- board.view_post: WHERE board_id = ? ORDER BY created_at
+CREATE INDEX idx_comments_board_created ON comments (board_id, created_at, id);
+
+-- diary.diary_calendar / diary.diary_entry: WHERE user_id = ? AND entry_date ...
+ALTER TABLE diaries ADD UNIQUE INDEX uq_diaries_user_date (user_id, entry_date);
+
+-- todos.todos_list: WHERE user_id = ? [AND status = ?] ORDER BY created_at DESC
+CREATE INDEX idx_todos_user_status_created ON todos (user_id, status, created_at);
+CREATE INDEX idx_todos_user_created ON todos (user_id, created_at);
@@ -0,0 +1,8 @@
+-- 게시글별 댓글 수를 board 행에 저장합니다. (조회 시 COUNT(*) 하지 않도록)
+-- board.add_comment가 댓글 INSERT와 같은 트랜잭션에서 증가시킵니다.
+
+ALTER TABLE board ADD COLUMN comment_count INT NOT NULL DEFAULT 0;
+
+-- 기존 댓글 수로 채웁니다. (comments(board_id, ...) 인덱스 사용)
+-- updated_at = updated_at: ON UPDATE CURRENT_TIMESTAMP로 수정 시각이 바뀌지 않게 합니다.
+UPDATE board b SET comment_count = (SELECT COUNT(*) FROM comments c WHERE c.board_id = b.id), updated_at = updated_at;
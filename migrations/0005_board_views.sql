@@ -0,0 +1,7 @@
+-- 게시글 조회수. view_post는 조회마다 UPDATE하지 않고 프로세스 메모리에 모았다가
+-- common/view_counts.py가 주기적으로 여러 행을 한 번에 더합니다.
+
+ALTER TABLE board ADD COLUMN views INT NOT NULL DEFAULT 0;
+
+-- board.popular_posts: ORDER BY views DESC, id DESC LIMIT n
+CREATE INDEX idx_board_views ON board (views, id);
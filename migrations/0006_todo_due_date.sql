@@ -0,0 +1,4 @@
+-- todos 요약 (common/todo_summary.py)
+-- todos.summary: WHERE user_id = ? GROUP BY status, due_date 조건까지 인덱스만 읽습니다.
+-- todos.todos_list (status, due): WHERE user_id = ? AND status = ? 범위도 이 인덱스를 탑니다.
+CREATE INDEX idx_todos_user_status_due ON todos (user_id, status, due_date);
@@ -0,0 +1,61 @@
+-- SQLite용 기본 테이블 정의 (DB_BACKEND='sqlite'). 버전 번호는 migrations/*.sql(MySQL)과 맞춥니다.
+-- 시각 기본값은 MySQL CURRENT_TIMESTAMP(서버 로컬 시각)와 같도록 localtime으로 저장합니다.
+-- MySQL의 ON UPDATE CURRENT_TIMESTAMP 대신 title/content가 SET 절에 있을 때만 updated_at을 갱신하는 트리거를 둡니다.
+
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username VARCHAR(50) NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS board (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    content TEXT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+    updated_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+    CONSTRAINT fk_board_user FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    board_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+    CONSTRAINT fk_comments_board FOREIGN KEY (board_id) REFERENCES board (id) ON DELETE CASCADE,
+    CONSTRAINT fk_comments_user FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS diaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    entry_date DATE NOT NULL,
+    title VARCHAR(255) NOT NULL DEFAULT '',
+    content TEXT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+    updated_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+    CONSTRAINT fk_diaries_user FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS todos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    task VARCHAR(255) NOT NULL,
+    due_date DATE NULL,
+    status VARCHAR(20) NOT NULL DEFAULT '미완료',
+    created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+    CONSTRAINT fk_todos_user FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_board_updated_at AFTER UPDATE OF title, content ON board
+BEGIN
+    UPDATE board SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_diaries_updated_at AFTER UPDATE OF title, content ON diaries
+BEGIN
+    UPDATE diaries SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+END;
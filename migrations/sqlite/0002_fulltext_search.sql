@@ -0,0 +1,3 @@
+-- SQLite에는 MySQL FULLTEXT(ngram) 인덱스가 없습니다.
+-- DB_BACKEND='sqlite'에서 SEARCH_BACKEND='fulltext'는 프로세스 내 역색인('memory')으로 대체됩니다. (common/search.py)
+-- 버전 번호를 MySQL 마이그레이션과 맞추기 위한 빈 마이그레이션입니다.
@@ -0,0 +1,7 @@
+-- 게시글별 댓글 수를 board 행에 저장합니다. (migrations/0004_board_comment_count.sql 참고)
+-- 이미 컬럼이 있으면(duplicate column name) 마이그레이션 러너가 건너뜁니다.
+
+ALTER TABLE board ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0;
+
+-- updated_at 트리거는 title/content 변경에만 반응하므로 수정 시각은 바뀌지 않습니다.
+UPDATE board SET comment_count = (SELECT COUNT(*) FROM comments c WHERE c.board_id = board.id);
@@ -0,0 +1,7 @@
+-- 게시글 조회수. (migrations/0005_board_views.sql 참고)
+-- 이미 컬럼이 있으면(duplicate column name) 마이그레이션 러너가 건너뜁니다.
+
+ALTER TABLE board ADD COLUMN views INTEGER NOT NULL DEFAULT 0;
+
+-- board.popular_posts: ORDER BY views DESC, id DESC LIMIT n
+CREATE INDEX IF NOT EXISTS idx_board_views ON board (views, id);
@@ -0,0 +1,2 @@
+-- todos 요약 (migrations/0006_todo_due_date.sql 참고)
+CREATE INDEX IF NOT EXISTS idx_todos_user_status_due ON todos (user_id, status, due_date);
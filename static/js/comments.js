@@ -0,0 +1,10 @@
+// '댓글 더 보기': 다음 페이지 조각을 받아 링크 자리에 끼워 넣습니다.
+document.addEventListener('click', function (event) {
+    var link = event.target.closest('a.load-more-comments');
+    if (!link) return;
+    event.preventDefault();
+    fetch(link.href, { credentials: 'same-origin' })
+        .then(function (response) { return response.ok ? response.text() : Promise.reject(response.status); })
+        .then(function (html) { link.outerHTML = html; })
+        .catch(function () { window.location = link.href; });
+});
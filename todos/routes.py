@@ -1,47 +1,96 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+import logging
+from flask import Blueprint, render_template, request, redirect, url_for, g, flash, current_app
+from common.auth import login_required
 from common.utils import get_db_connection # common/utils.py에서 가져옴
+from common.calendar_service import month_view, is_valid_month
+from common.search import search_todos, index_todo, unindex_todo
+from common.todo_summary import TODO_STATUSES, todo_summary
+from common.pagination import (keyset_clause, nulls_last_keyset_clause, finalize_page,
+                               decode_cursor, decode_date_cursor, encode_date_cursor)
 import pymysql.cursors
-from datetime import datetime, timedelta
-import calendar
+from datetime import datetime
 
 # 'todos_bp'라는 이름의 블루프린트 인스턴스 생성
+logger = logging.getLogger(__name__)
+
 todos_bp = Blueprint('todos', __name__) # url_prefix는 app.py에서 등록 시 지정
 
+VALID_STATUSES = list(TODO_STATUSES) # 모든 유효 상태 포함 (common/todo_summary.py)
+
+# 마감일 재조정 시 새 상태를 계산하는 SQL 식 (UPDATE의 SET 절에서 기존 status를 참조)
+RESCHEDULED_STATUS_SQL = "CASE status WHEN '완료' THEN '미완료' WHEN '기간연장' THEN '기간연장' ELSE '진행중' END"
+
+# 목록 정렬 (?sort=). 최근 추가순은 (created_at, id) 내림차순, 마감일순은 (due_date, id) 오름차순이고
+# 마감일 없는 항목은 맨 뒤에 둡니다. 두 정렬 모두 OFFSET 없이 키셋 커서로 한 페이지만 읽습니다. (common/pagination.py)
+# SELECT의 due_date 별칭(DATE_FORMAT 문자열)이 아니라 컬럼으로 비교/정렬하도록 테이블 이름을 붙입니다.
+SORT_ORDERS = ('created', 'due')
+
 # --- To-Do List 관련 라우트 ---
 
 @todos_bp.route('/') # 실제 경로는 /todos
+@login_required('To-Do List를 보려면 로그인해야 합니다.')
 def todos_list():
     """To-Do 목록을 표시하고 필터링 옵션을 제공합니다."""
-    if 'loggedin' not in session:
-        flash('To-Do List를 보려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index')) # auth 블루프린트의 index로 리디렉션
-
-    user_id = session['id']
+    user_id = g.user['id']
     status_filter = request.args.get('status', 'all').strip()
     search_query = request.args.get('query', '').strip()
+    sort = request.args.get('sort', 'created')
+    if sort not in SORT_ORDERS:
+        sort = 'created'
+
+    # 검색 결과는 관련도 순이므로 페이지 번호로 나눕니다.
+    page = max(1, request.args.get('page', 1, type=int))
+    has_next_page = False
+    # 키셋 커서 (board_list와 같은 형식): ?before=<커서> 는 다음 페이지, ?after=<커서> 는 이전 페이지
+    direction = 'prev' if request.args.get('after') else 'next'
+    raw_cursor = request.args.get('after') or request.args.get('before')
+    prev_cursor = next_cursor = None
 
     conn = None
     todos = []
+    summary = None
     try:
         conn = get_db_connection()
         with conn.cursor() as cursor:
-            sql = "SELECT id, task, DATE_FORMAT(due_date, '%%Y-%%m-%%d') AS due_date, status, created_at FROM todos WHERE user_id = %s"
-            params = [user_id]
-
-            if status_filter != 'all':
-                sql += " AND status = %s"
-                params.append(status_filter)
-
+            # 상태별 개수/마감 지남/오늘 마감: GROUP BY 한 번 (common/todo_summary.py)
+            summary = todo_summary(cursor, user_id, VALID_STATUSES)
             if search_query:
-                sql += " AND task LIKE %s"
-                params.append(f"%{search_query}%")
-
-            sql += " ORDER BY created_at DESC" # 또는 due_date ASC
-
-            cursor.execute(sql, params)
-            todos = cursor.fetchall()
+                todos, has_next_page = search_todos(cursor, user_id, search_query,
+                                                    status=None if status_filter == 'all' else status_filter,
+                                                    page=page,
+                                                    page_size=current_app.config.get('TODO_SEARCH_PAGE_SIZE', 50))
+            else:
+                page_size = current_app.config.get('TODO_PAGE_SIZE', 50)
+                sql = "SELECT id, task, DATE_FORMAT(due_date, '%%Y-%%m-%%d') AS due_date, status, created_at FROM todos WHERE user_id = %s"
+                params = [user_id]
+
+                if status_filter != 'all':
+                    sql += " AND status = %s"
+                    params.append(status_filter)
+
+                if sort == 'due':
+                    page_cursor = decode_date_cursor(raw_cursor)
+                    keyset_sql, keyset_params, order_sql = nulls_last_keyset_clause(
+                        'todos.due_date', 'todos.id', page_cursor, direction)
+                    finalize_kwargs = {'ts_key': 'due_date', 'encode': encode_date_cursor}
+                else:
+                    page_cursor = decode_cursor(raw_cursor)
+                    keyset_sql, keyset_params, order_sql = keyset_clause(
+                        'todos.created_at', 'todos.id', page_cursor, direction)
+                    finalize_kwargs = {}
+                if keyset_sql:
+                    sql += " AND " + keyset_sql
+                    params += keyset_params
+
+                # 한 행 더 읽어 다음 페이지가 있는지 확인합니다.
+                sql += f" {order_sql} LIMIT %s"
+                params.append(page_size + 1)
+
+                cursor.execute(sql, params)
+                todos, prev_cursor, next_cursor = finalize_page(cursor.fetchall(), page_size, page_cursor,
+                                                                direction, **finalize_kwargs)
     except Exception as e:
-        print(f"DEBUG: To-Do 목록 불러오기 오류: {e}")
+        logger.exception("To-Do 목록 불러오기 오류")
         flash('To-Do 목록을 불러오는 데 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
@@ -49,20 +98,23 @@ def todos_list():
 
     return render_template('todos_list.html',
                            todos=todos,
-                           username=session['username'],
+                           username=g.user['username'],
                            status_filter=status_filter,
                            search_query=search_query,
-                           all_statuses=['미완료', '진행중', '완료', '기간연장'])
+                           sort=sort,
+                           summary=summary,
+                           page=page,
+                           has_next_page=has_next_page,
+                           prev_cursor=prev_cursor,
+                           next_cursor=next_cursor,
+                           all_statuses=VALID_STATUSES)
 
 
 @todos_bp.route('/add', methods=['POST']) # 실제 경로는 /todos/add
+@login_required('To-Do 항목을 추가하려면 로그인해야 합니다.')
 def add_todo():
     """새 To-Do 항목을 추가합니다."""
-    if 'loggedin' not in session:
-        flash('To-Do 항목을 추가하려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index'))
-
-    user_id = session['id']
+    user_id = g.user['id']
     task = request.form['task'].strip()
     due_date_str = request.form.get('due_date', '').strip()
     status = request.form.get('status', '미완료').strip() # 기본 상태 '미완료'
@@ -85,10 +137,12 @@ def add_todo():
         with conn.cursor() as cursor:
             sql = "INSERT INTO todos (user_id, task, due_date, status) VALUES (%s, %s, %s, %s)"
             cursor.execute(sql, (user_id, task, due_date, status))
+            todo_id = cursor.lastrowid
         conn.commit()
+        index_todo(todo_id, user_id, task)
         flash('To-Do 항목이 성공적으로 추가되었습니다!', 'success')
     except Exception as e:
-        print(f"DEBUG: To-Do 항목 추가 오류: {e}")
+        logger.exception("To-Do 항목 추가 오류")
         flash('To-Do 항목 추가에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
@@ -96,16 +150,11 @@ def add_todo():
     return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
 
 @todos_bp.route('/update_status/<int:todo_id>/<string:new_status>', methods=['POST']) # 실제 경로는 /todos/update_status/<id>/<status>
+@login_required('To-Do 항목 상태를 변경하려면 로그인해야 합니다.')
 def update_todo_status(todo_id, new_status):
     """To-Do 항목의 상태를 업데이트합니다."""
-    if 'loggedin' not in session:
-        flash('To-Do 항목 상태를 변경하려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index'))
-
-    user_id = session['id']
-    valid_statuses = ['미완료', '진행중', '완료', '기간연장'] # 모든 유효 상태 포함
-
-    if new_status not in valid_statuses:
+    user_id = g.user['id']
+    if new_status not in VALID_STATUSES:
         flash('유효하지 않은 To-Do 상태입니다.', 'error')
         return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
 
@@ -113,18 +162,16 @@ def update_todo_status(todo_id, new_status):
     try:
         conn = get_db_connection()
         with conn.cursor() as cursor:
-            sql_check = "SELECT id FROM todos WHERE id = %s AND user_id = %s"
-            cursor.execute(sql_check, (todo_id, user_id))
-            if not cursor.fetchone():
-                flash('To-Do 항목을 찾을 수 없거나 권한이 없습니다.', 'error')
-                return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
-
+            # 소유권 확인과 수정을 한 문장으로 처리합니다. (영향받은 행이 0이면 없음/권한 없음)
             sql = "UPDATE todos SET status = %s WHERE id = %s AND user_id = %s"
             cursor.execute(sql, (new_status, todo_id, user_id))
+            if cursor.rowcount == 0:
+                flash('To-Do 항목을 찾을 수 없거나 권한이 없습니다.', 'error')
+                return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
         conn.commit()
         flash('To-Do 항목 상태가 성공적으로 업데이트되었습니다!', 'success')
     except Exception as e:
-        print(f"DEBUG: To-Do 상태 업데이트 오류: {e}")
+        logger.exception("To-Do 상태 업데이트 오류")
         flash('To-Do 항목 상태 업데이트에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
@@ -132,30 +179,25 @@ def update_todo_status(todo_id, new_status):
     return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
 
 @todos_bp.route('/delete/<int:todo_id>', methods=['POST']) # 실제 경로는 /todos/delete/<id>
+@login_required('To-Do 항목을 삭제하려면 로그인해야 합니다.')
 def delete_todo(todo_id):
     """To-Do 항목을 삭제합니다."""
-    if 'loggedin' not in session:
-        flash('To-Do 항목을 삭제하려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index'))
-
-    user_id = session['id']
+    user_id = g.user['id']
 
     conn = None
     try:
         conn = get_db_connection()
         with conn.cursor() as cursor:
-            sql_check = "SELECT id FROM todos WHERE id = %s AND user_id = %s"
-            cursor.execute(sql_check, (todo_id, user_id))
-            if not cursor.fetchone():
-                flash('To-Do 항목을 찾을 수 없거나 권한이 없습니다.', 'error')
-                return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
-
             sql = "DELETE FROM todos WHERE id = %s AND user_id = %s"
             cursor.execute(sql, (todo_id, user_id))
+            if cursor.rowcount == 0:
+                flash('To-Do 항목을 찾을 수 없거나 권한이 없습니다.', 'error')
+                return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
         conn.commit()
+        unindex_todo(todo_id)
         flash('To-Do 항목이 성공적으로 삭제되었습니다!', 'success')
     except Exception as e:
-        print(f"DEBUG: To-Do 항목 삭제 오류: {e}")
+        logger.exception("To-Do 항목 삭제 오류")
         flash('To-Do 항목 삭제에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
@@ -166,15 +208,12 @@ def delete_todo(todo_id):
 
 @todos_bp.route('/reschedule/<int:todo_id>') # 실제 경로는 /todos/reschedule/<id>
 @todos_bp.route('/reschedule/<int:todo_id>/<int:year>/<int:month>') # 실제 경로는 /todos/reschedule/<id>/<year>/<month>
+@login_required('To-Do 항목 마감일을 재조정하려면 로그인해야 합니다.')
 def reschedule_todo_calendar(todo_id, year=None, month=None):
     """
     특정 To-Do 항목의 마감일을 재조정하기 위한 달력을 표시합니다.
     """
-    if 'loggedin' not in session:
-        flash('To-Do 항목 마감일을 재조정하려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index'))
-
-    user_id = session['id']
+    user_id = g.user['id']
     todo_item = None
     conn = None
     try:
@@ -188,7 +227,7 @@ def reschedule_todo_calendar(todo_id, year=None, month=None):
                 if conn: conn.close()
                 return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
     except Exception as e:
-        print(f"DEBUG: Error fetching todo item for reschedule: {e}")
+        logger.exception("Error fetching todo item for reschedule")
         flash('To-Do 항목 정보를 불러오는 데 실패했습니다.', 'error')
         if conn: conn.close()
         return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
@@ -201,41 +240,31 @@ def reschedule_todo_calendar(todo_id, year=None, month=None):
     if month is None:
         month = today.month
 
-    if not (1 <= month <= 12 and 1900 <= year <= 2100):
+    if not is_valid_month(year, month):
         flash('유효하지 않은 연도 또는 월입니다.', 'error')
         return redirect(url_for('todos.reschedule_todo_calendar', todo_id=todo_id)) # url_for에 블루프린트 이름 명시
 
-    prev_month_date = (datetime(year, month, 1) - timedelta(days=1)).replace(day=1)
-    next_month_date = (datetime(year, month, 1) + timedelta(days=31)).replace(day=1)
-
-    prev_year, prev_month = prev_month_date.year, prev_month_date.month
-    next_year, next_month = next_month_date.year, next_month_date.month
-
-    cal = calendar.Calendar(firstweekday=6) # 일요일부터 시작
-    month_days = cal.monthdayscalendar(year, month)
+    view = month_view(year, month) # 달력 격자와 이전/다음 달 정보 (캐시됨)
 
     return render_template('todos_reschedule.html',
                            todo_item=todo_item,
                            year=year,
                            month=month,
-                           month_name=datetime(year, month, 1).strftime('%B'),
-                           month_days=month_days,
-                           prev_year=prev_year,
-                           prev_month=prev_month,
-                           next_year=next_year,
-                           next_month=next_month,
+                           month_name=view.month_name,
+                           month_days=view.weeks,
+                           prev_year=view.prev_year,
+                           prev_month=view.prev_month,
+                           next_year=view.next_year,
+                           next_month=view.next_month,
                            current_day=today.day if today.year == year and today.month == month else None,
                            today=today, # today 변수도 템플릿으로 전달
-                           username=session['username'])
+                           username=g.user['username'])
 
 @todos_bp.route('/set_due_date/<int:todo_id>', methods=['POST']) # 실제 경로는 /todos/set_due_date/<id>
+@login_required('To-Do 항목 마감일을 설정하려면 로그인해야 합니다.')
 def set_new_due_date(todo_id):
     """선택된 날짜로 To-Do 항목의 마감일을 설정합니다."""
-    if 'loggedin' not in session:
-        flash('To-Do 항목 마감일을 설정하려면 로그인해야 합니다.', 'error')
-        return redirect(url_for('auth.index'))
-
-    user_id = session['id']
+    user_id = g.user['id']
     new_due_date_str = request.form.get('new_due_date').strip()
 
     if not new_due_date_str:
@@ -253,30 +282,86 @@ def set_new_due_date(todo_id):
     try:
         conn = get_db_connection()
         with conn.cursor() as cursor:
-            sql_check = "SELECT id, status FROM todos WHERE id = %s AND user_id = %s"
-            cursor.execute(sql_check, (todo_id, user_id))
-            item_data = cursor.fetchone()
-            if not item_data:
+            # 재조정 후 상태는 SQL에서 계산합니다. (완료 -> 미완료, 기간연장 유지, 그 외 -> 진행중)
+            sql_update = f"UPDATE todos SET due_date = %s, status = {RESCHEDULED_STATUS_SQL} WHERE id = %s AND user_id = %s"
+            cursor.execute(sql_update, (new_due_date, todo_id, user_id))
+            if cursor.rowcount == 0:
                 flash('To-Do 항목을 찾을 수 없거나 권한이 없습니다.', 'error')
                 return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
-
-            new_status_after_reschedule = item_data['status']
-            if item_data['status'] == '완료':
-                new_status_after_reschedule = '미완료'
-            elif item_data['status'] == '기간연장':
-                new_status_after_reschedule = '기간연장'
-            else:
-                new_status_after_reschedule = '진행중'
-
-            sql_update = "UPDATE todos SET due_date = %s, status = %s WHERE id = %s AND user_id = %s"
-            cursor.execute(sql_update, (new_due_date, new_status_after_reschedule, todo_id, user_id))
         conn.commit()
         flash(f'할 일의 마감일이 {new_due_date_str}으로 성공적으로 재조정되었습니다!', 'success')
     except Exception as e:
-        print(f"DEBUG: To-Do 마감일 설정 오류: {e}")
+        logger.exception("To-Do 마감일 설정 오류")
         flash('마감일 재조정에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
     finally:
         if conn:
             conn.close()
     return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
 
+@todos_bp.route('/bulk', methods=['POST']) # 실제 경로는 /todos/bulk
+@login_required('To-Do 항목을 변경하려면 로그인해야 합니다.')
+def bulk_update_todos():
+    """
+    선택한 여러 To-Do 항목의 상태 변경 / 마감일 변경 / 삭제를 한 트랜잭션, 한 문장으로 처리합니다.
+    폼 필드: todo_ids (여러 개), action ('status' | 'due_date' | 'delete'), new_status, new_due_date
+    """
+    user_id = g.user['id']
+    action = request.form.get('action', '').strip()
+    try:
+        todo_ids = sorted({int(v) for v in request.form.getlist('todo_ids')})
+    except ValueError:
+        flash('유효하지 않은 To-Do 항목이 포함되어 있습니다.', 'error')
+        return redirect(url_for('todos.todos_list'))
+
+    if not todo_ids:
+        flash('변경할 To-Do 항목을 선택해주세요.', 'error')
+        return redirect(url_for('todos.todos_list'))
+    if len(todo_ids) > current_app.config.get('TODO_BULK_MAX', 500):
+        flash('한 번에 변경할 수 있는 항목 수를 초과했습니다.', 'error')
+        return redirect(url_for('todos.todos_list'))
+
+    placeholders = ', '.join(['%s'] * len(todo_ids))
+    if action == 'status':
+        new_status = request.form.get('new_status', '').strip()
+        if new_status not in VALID_STATUSES:
+            flash('유효하지 않은 To-Do 상태입니다.', 'error')
+            return redirect(url_for('todos.todos_list'))
+        sql = f"UPDATE todos SET status = %s WHERE user_id = %s AND id IN ({placeholders})"
+        params = [new_status, user_id] + todo_ids
+    elif action == 'due_date':
+        try:
+            new_due_date = datetime.strptime(request.form.get('new_due_date', '').strip(), '%Y-%m-%d').date()
+        except ValueError:
+            flash('유효하지 않은 날짜 형식입니다.', 'error')
+            return redirect(url_for('todos.todos_list'))
+        sql = f"UPDATE todos SET due_date = %s, status = {RESCHEDULED_STATUS_SQL} WHERE user_id = %s AND id IN ({placeholders})"
+        params = [new_due_date, user_id] + todo_ids
+    elif action == 'delete':
+        sql = f"DELETE FROM todos WHERE user_id = %s AND id IN ({placeholders})"
+        params = [user_id] + todo_ids
+    else:
+        flash('알 수 없는 일괄 작업입니다.', 'error')
+        return redirect(url_for('todos.todos_list'))
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        with conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            affected = cursor.rowcount
+        conn.commit()
+        if action == 'delete':
+            for todo_id in todo_ids:
+                unindex_todo(todo_id)
+        skipped = len(todo_ids) - affected
+        if skipped:
+            flash(f'{affected}개 항목을 처리했습니다. ({skipped}개는 찾을 수 없거나 권한이 없습니다.)', 'success')
+        else:
+            flash(f'{affected}개 항목을 처리했습니다.', 'success')
+    except Exception as e:
+        logger.exception("To-Do 일괄 처리 오류")
+        flash('일괄 처리에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
+    finally:
+        if conn:
+            conn.close()
+    return redirect(url_for('todos.todos_list')) # url_for에 블루프린트 이름 명시
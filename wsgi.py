@@ -12,6 +12,11 @@ if project_home not in sys.path:
 # python-home 및 python-path를 통해 가상 환경을 지정합니다.
 # 따라서 여기서 별도로 가상 환경을 활성화할 필요가 없습니다.
 
-# Flask 애플리케이션 인스턴스 임포트
+# Flask 애플리케이션 인스턴스 생성
 # 'application'은 mod_wsgi가 기대하는 기본 이름입니다.
-from app import app as application
+# preload=True: 설정 검증, 블루프린트 등록, DB 연결 풀 채우기, 템플릿 컴파일을 이 스크립트를 불러올 때 끝냅니다.
+# WSGIImportScript(또는 WSGIDaemonProcess의 process-group/application-group 지정)로 워커 시작 시 미리 불러오면
+# 첫 요청이 이 비용을 치르지 않습니다. 시작 시간은 /health/startup에서 확인할 수 있습니다.
+from app import create_app
+
+application = create_app(preload=True)